@@ -80,6 +80,7 @@ Compatible with Odoo 18 Community Edition.
         'hr_holidays',
         'hr_org_chart',  # Uses Odoo's built-in org chart
         'snifx_timeoff_officer_department',  # Snifx officer management
+        'snifx_timeoff_core',  # Shared services (user resolution)
     ],
     'data': [
         'security/ir.model.access.csv',
@@ -87,12 +88,16 @@ Compatible with Odoo 18 Community Edition.
         'security/approval_level_security.xml',
         'security/hr_leave_security.xml',
         'security/officer_leave_access.xml',
+        'security/approval_delegation_security.xml',
         'data/mail_activity_type.xml',
         'data/email_template.xml',
+        'data/ir_cron.xml',
+        'data/ir_config_parameter.xml',
         'views/hr_leave_type_views.xml',
         'views/hr_leave_views.xml',
         'views/hr_employee_views.xml',
         'views/approval_level_views.xml',
+        'views/approval_delegation_views.xml',
         'views/hr_department_views.xml',
         'views/menu_views.xml',
     ],
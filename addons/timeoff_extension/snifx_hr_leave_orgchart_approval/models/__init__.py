@@ -3,5 +3,10 @@
 from . import hr_leave_type
 from . import hr_leave
 from . import approval_level
+from . import approval_delegation
+from . import approval_inbox
 from . import hr_employee
+from . import hr_employee_hierarchy
 from . import hr_department
+from . import res_users
+from . import res_groups
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, fields, api, _
+from odoo.exceptions import ValidationError
+from odoo.tools import create_index
+from odoo.addons.snifx_timeoff_core.tools import get_tracer
+import logging
+
+_logger = logging.getLogger(__name__)
+_chain_tracer = get_tracer('chain')
+
+# Delegations are followed transitively (A -> B -> C) up to this depth
+MAX_DELEGATION_HOPS = 5
+
+
+class LeaveApprovalDelegation(models.Model):
+    """
+    Out-of-office delegation of leave approvals
+
+    While a delegation window is open, approval levels of the user are
+    assigned to the delegate: at chain generation, and for pending levels
+    by the rerouting scheduled action (reverted once the window closes).
+    """
+    _name = 'leave.approval.delegation'
+    _description = 'Leave Approval Delegation'
+    _order = 'date_from desc, id desc'
+
+    user_id = fields.Many2one(
+        'res.users',
+        string='Approver',
+        required=True,
+        default=lambda self: self.env.user,
+        ondelete='cascade',
+        help="User whose approvals are delegated"
+    )
+    delegate_id = fields.Many2one(
+        'res.users',
+        string='Delegate To',
+        required=True,
+        ondelete='cascade',
+        help="User approving instead of the approver during the window"
+    )
+    date_from = fields.Datetime(
+        string='From',
+        required=True,
+        default=fields.Datetime.now
+    )
+    date_to = fields.Datetime(
+        string='To',
+        required=True
+    )
+    reason = fields.Char(
+        string='Reason'
+    )
+    active = fields.Boolean(
+        default=True
+    )
+    level_ids = fields.One2many(
+        'leave.approval.level',
+        'delegation_id',
+        string='Rerouted Levels'
+    )
+
+    def init(self):
+        # "Delegate of user U at time T" for many users in one index scan
+        create_index(
+            self._cr, 'leave_approval_delegation_window_index',
+            self._table, ['user_id', 'date_from', 'date_to'],
+            where='active'
+        )
+
+    @api.constrains('date_from', 'date_to')
+    def _check_dates(self):
+        for record in self:
+            if record.date_to <= record.date_from:
+                raise ValidationError(_('The delegation end must be after its start.'))
+
+    @api.constrains('user_id', 'delegate_id')
+    def _check_delegate(self):
+        for record in self:
+            if record.user_id == record.delegate_id:
+                raise ValidationError(_('An approver cannot delegate to themselves.'))
+
+    @api.depends('user_id', 'delegate_id')
+    def _compute_display_name(self):
+        for record in self:
+            record.display_name = f"{record.user_id.name} → {record.delegate_id.name}"
+
+    @api.model
+    def _get_delegations(self, user_ids, at=None):
+        """
+        Resolve the effective approver of many users at a given time
+
+        Delegations are followed transitively (cycles and long chains are
+        cut after MAX_DELEGATION_HOPS), with one indexed query per hop; the
+        rows of a hop are indexed by delegator, so each user is resolved
+        with a dict lookup.
+
+        :param user_ids: iterable of res.users ids
+        :param at: naive UTC datetime, now by default
+        :return: dict {user_id: (delegate_user_id, delegation_id)} for the
+            delegated users only; delegation_id is the first delegation
+        """
+        at = at or fields.Datetime.now()
+        self.flush_model(['user_id', 'delegate_id', 'date_from', 'date_to', 'active'])
+
+        result = {}
+        to_resolve = {user_id for user_id in user_ids if user_id}
+        # Original user of each user being resolved
+        origins = {user_id: user_id for user_id in to_resolve}
+        for __ in range(MAX_DELEGATION_HOPS):
+            if not to_resolve:
+                break
+            self.env.cr.execute("""
+                SELECT DISTINCT ON (user_id) user_id, delegate_id, id
+                  FROM leave_approval_delegation
+                 WHERE active
+                   AND user_id = ANY(%s)
+                   AND date_from <= %s
+                   AND date_to > %s
+              ORDER BY user_id, date_from DESC, id DESC
+            """, [list(to_resolve), at, at])
+            # Delegation of each delegator of this hop
+            delegation_by_user = {
+                user_id: (delegate_id, delegation_id)
+                for user_id, delegate_id, delegation_id in self.env.cr.fetchall()
+            }
+            next_origins = {}
+            for origin, current in origins.items():
+                if current not in delegation_by_user:
+                    continue
+                delegate_id, delegation_id = delegation_by_user[current]
+                if delegate_id == origin:
+                    continue
+                first_delegation_id = result.get(origin, (None, delegation_id))[1]
+                result[origin] = (delegate_id, first_delegation_id)
+                next_origins[origin] = delegate_id
+            origins = next_origins
+            to_resolve = set(next_origins.values())
+        return result
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        delegations = super(LeaveApprovalDelegation, self).create(vals_list)
+        self.env['leave.approval.level']._reroute_delegated_levels()
+        return delegations
+
+    def write(self, vals):
+        result = super(LeaveApprovalDelegation, self).write(vals)
+        if {'user_id', 'delegate_id', 'date_from', 'date_to', 'active'}.intersection(vals):
+            self.env['leave.approval.level']._reroute_delegated_levels()
+        return result
+
+    def unlink(self):
+        # Give the levels back to their original approver first
+        levels = self.level_ids.filtered(lambda l: l.state == 'pending')
+        levels._revert_delegation()
+        return super(LeaveApprovalDelegation, self).unlink()
+
+    @api.model
+    def _cron_reroute_levels(self):
+        """Apply delegations whose window opened and revert closed ones"""
+        self.env['leave.approval.level']._reroute_delegated_levels()
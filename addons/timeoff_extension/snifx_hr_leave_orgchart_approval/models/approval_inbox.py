@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+
+import logging
+from odoo import models, fields, api
+from odoo.tools import create_index
+
+_logger = logging.getLogger(__name__)
+
+
+class LeaveApprovalInbox(models.Model):
+    """
+    Approver inbox: the approval levels waiting for each user right now
+
+    One row per pending level at the current level of its leave. Rows are
+    maintained by leave.approval.level in the transaction changing the
+    levels, so "Waiting For Me" is an indexed lookup on approver_user_id
+    whatever the number of historical approvals.
+    """
+    _name = 'leave.approval.inbox'
+    _description = 'Leave Approval Inbox'
+    _log_access = False
+    _order = 'since, id'
+
+    approver_user_id = fields.Many2one(
+        'res.users',
+        string='Approver',
+        required=True,
+        ondelete='cascade'
+    )
+    leave_id = fields.Many2one(
+        'hr.leave',
+        string='Leave Request',
+        required=True,
+        ondelete='cascade',
+        index=True
+    )
+    level_id = fields.Many2one(
+        'leave.approval.level',
+        string='Approval Level',
+        required=True,
+        ondelete='cascade'
+    )
+    level = fields.Integer(
+        string='Level'
+    )
+    since = fields.Datetime(
+        string='Waiting Since',
+        help="When the level reached this approver"
+    )
+
+    _sql_constraints = [
+        ('level_uniq', 'unique(level_id)',
+         'An approval level can only be once in the inbox.'),
+    ]
+
+    def init(self):
+        create_index(
+            self._cr, 'leave_approval_inbox_approver_index',
+            self._table, ['approver_user_id', 'leave_id']
+        )
+        # Catch up with levels changed while the module was not loaded
+        self._sync_leaves()
+
+    @api.model
+    def _sync_leaves(self, leave_ids=None):
+        """
+        Bring the inbox rows of these leaves in line with their levels
+
+        Rows still valid keep their 'since' date.
+
+        :param leave_ids: ids of hr.leave, None for all leaves
+        """
+        if leave_ids is not None and not leave_ids:
+            return
+        self.env['leave.approval.level'].flush_model(['leave_id', 'level', 'state', 'approver_id', 'is_current_level'])
+        where = "AND a.leave_id = ANY(%(leave_ids)s)" if leave_ids is not None else ""
+        params = {'leave_ids': list(leave_ids) if leave_ids is not None else None}
+        self.env.cr.execute(f"""
+            DELETE FROM leave_approval_inbox i
+             WHERE {"i.leave_id = ANY(%(leave_ids)s)" if leave_ids is not None else "TRUE"}
+               AND NOT EXISTS (
+                   SELECT 1
+                     FROM leave_approval_level a
+                    WHERE a.id = i.level_id
+                      AND a.state = 'pending'
+                      AND a.is_current_level
+                      AND a.approver_id = i.approver_user_id
+               )
+        """, params)
+        self.env.cr.execute(f"""
+            INSERT INTO leave_approval_inbox (approver_user_id, leave_id, level_id, level, since)
+            SELECT a.approver_id, a.leave_id, a.id, a.level, NOW() AT TIME ZONE 'UTC'
+              FROM leave_approval_level a
+             WHERE a.state = 'pending'
+               AND a.is_current_level
+               AND a.approver_id IS NOT NULL
+               {where}
+            ON CONFLICT (level_id) DO NOTHING
+        """, params)
+        self.invalidate_model()
+        self.env['hr.leave'].invalidate_model(['approval_inbox_ids'])
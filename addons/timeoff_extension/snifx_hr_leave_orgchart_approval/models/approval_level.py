@@ -2,10 +2,21 @@
 
 from odoo import models, fields, api, _
 from odoo.exceptions import UserError, ValidationError
+from odoo.tools import create_index, split_every, str2bool
+from odoo.addons.snifx_timeoff_core.tools import get_tracer
 from datetime import datetime, timedelta
 import logging
 
 _logger = logging.getLogger(__name__)
+# Hot path trace points (lazy, see snifx_timeoff_core/tools/tracing.py)
+_approval_tracer = get_tracer('approval')
+
+# Send one overdue digest per approver instead of one mail per level
+OVERDUE_DIGEST_PARAM = 'snifx_hr_leave_orgchart_approval.overdue_reminder_digest'
+# Number of queued mails created per batch
+MAIL_BATCH_SIZE = 100
+# Level fields deciding which levels are in the approver inbox
+INBOX_FIELDS = {'leave_id', 'level', 'state', 'approver_id'}
 
 
 class LeaveApprovalLevel(models.Model):
@@ -62,6 +73,7 @@ class LeaveApprovalLevel(models.Model):
         'res.users',
         string='Approver',
         required=True,
+        index=True,
         help="User who needs to approve at this level"
     )
     approver_employee_id = fields.Many2one(
@@ -102,6 +114,13 @@ class LeaveApprovalLevel(models.Model):
         string='Original Approver',
         help="Original approver if this was delegated"
     )
+    delegation_id = fields.Many2one(
+        'leave.approval.delegation',
+        string='Out-of-Office Delegation',
+        ondelete='set null',
+        index='btree_not_null',
+        help="Delegation that rerouted this level (reverted when its window closes)"
+    )
     
     # Computed
     display_name = fields.Char(
@@ -124,7 +143,8 @@ class LeaveApprovalLevel(models.Model):
     is_overdue = fields.Boolean(
         string='Overdue',
         compute='_compute_is_overdue',
-        store=True
+        store=True,
+        help="Set when the deadline passes, by the overdue reminder scheduled action"
     )
     
     # Activity tracking
@@ -135,6 +155,30 @@ class LeaveApprovalLevel(models.Model):
         domain=[('res_model', '=', 'leave.approval.level')]
     )
 
+    def init(self):
+        # Timer queue of the overdue cron: pending levels not flagged yet, by deadline
+        create_index(
+            self._cr, 'leave_approval_level_overdue_queue_index',
+            self._table, ['deadline'],
+            where="state = 'pending' AND is_overdue IS NOT TRUE"
+        )
+        # Bring stored current levels in line with the set-based definition
+        self.env['hr.leave']._recompute_current_approval_levels()
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        levels = super(LeaveApprovalLevel, self).create(vals_list)
+        self.env['leave.approval.inbox']._sync_leaves(levels.leave_id.ids)
+        return levels
+
+    def write(self, vals):
+        # Levels may move to another leave: sync the old and the new one
+        leave_ids = set(self.leave_id.ids)
+        result = super(LeaveApprovalLevel, self).write(vals)
+        if INBOX_FIELDS.intersection(vals):
+            self.env['leave.approval.inbox']._sync_leaves(leave_ids | set(self.leave_id.ids))
+        return result
+
     @api.depends('level', 'approver_id', 'leave_id')
     def _compute_display_name(self):
         for record in self:
@@ -143,131 +187,187 @@ class LeaveApprovalLevel(models.Model):
             else:
                 record.display_name = f"Level {record.level}"
 
-    @api.depends('approver_id')
+    @api.depends('approver_id', 'leave_id.employee_company_id')
     def _compute_approver_employee(self):
-        for record in self:
-            if record.approver_id:
-                record.approver_employee_id = self.env['hr.employee'].search([
-                    ('user_id', '=', record.approver_id.id)
-                ], limit=1)
-            else:
-                record.approver_employee_id = False
+        # Resolve the approvers of each company of the leaves at once (one
+        # query per chunk of users), preferring employees of that company
+        Resolver = self.env['snifx.user.resolver'].sudo()
+        for company, records in self.grouped(lambda r: r.leave_id.employee_company_id).items():
+            resolver = Resolver.with_company(company) if company else Resolver
+            employees = resolver.get_user_employees(records.approver_id.ids)
+            for record in records:
+                employee = employees.get(record.approver_id.id)
+                record.approver_employee_id = employee.id if employee else False
 
-    @api.depends('leave_id.approval_level_ids.state', 'level')
+    @api.depends('state', 'level', 'leave_id.current_approval_level')
     def _compute_is_current_level(self):
+        # The leave stores its current level (lowest level not approved or
+        # skipped), so siblings are not scanned for every level
         for record in self:
-            if record.state == 'pending':
-                # Check if all previous levels are approved
-                previous_levels = record.leave_id.approval_level_ids.filtered(
-                    lambda l: l.level < record.level
-                )
-                all_previous_approved = all(
-                    l.state in ['approved', 'skipped'] for l in previous_levels
-                )
-                record.is_current_level = all_previous_approved
-            else:
-                record.is_current_level = False
+            record.is_current_level = (
+                record.state == 'pending'
+                and record.level == record.leave_id.current_approval_level
+            )
 
-    @api.depends('create_date', 'leave_id.holiday_status_id')
+    @api.depends(
+        'create_date',
+        'level',
+        'leave_id.holiday_status_id.approval_sla_hours',
+        'leave_id.holiday_status_id.sla_business_hours',
+        'approver_employee_id.resource_calendar_id',
+        'leave_id.company_id.resource_calendar_id',
+    )
     def _compute_deadline(self):
+        """
+        Deadline = creation + SLA hours per level
+        
+        In business hours mode, deadlines of the whole recordset are computed
+        in one pass by the business hours engine (cached working intervals of
+        the approver's schedule, company schedule as fallback).
+        """
+        requests = []
         for record in self:
-            if record.create_date and record.leave_id.holiday_status_id:
-                # Default: 24 hours per level, or configured SLA
-                hours = record.leave_id.holiday_status_id.approval_sla_hours or 24
-                record.deadline = record.create_date + timedelta(hours=hours * record.level)
-            else:
+            leave_type = record.leave_id.holiday_status_id
+            if not (record.create_date and leave_type):
                 record.deadline = False
+                continue
+            # Default: 24 hours per level, or configured SLA
+            hours = (leave_type.approval_sla_hours or 24) * record.level
+            if leave_type.sla_business_hours:
+                calendar = (
+                    record.approver_employee_id.sudo().resource_calendar_id
+                    or record.leave_id.company_id.resource_calendar_id
+                )
+                requests.append((record, calendar, hours))
+            else:
+                record.deadline = record.create_date + timedelta(hours=hours)
+        
+        if requests:
+            deadlines = self.env['snifx.business.hours'].add_hours_batch(
+                (calendar, record.create_date, hours) for record, calendar, hours in requests
+            )
+            for (record, __, __), deadline in zip(requests, deadlines):
+                record.deadline = deadline
+
+    @api.model
+    def _recompute_pending_deadlines(self, company=None):
+        """
+        Recompute the deadline of every pending level in one batched pass
+        (e.g. after changing schedules or public holidays)
+        """
+        domain = [('state', '=', 'pending')]
+        if company:
+            domain.append(('leave_id.company_id', '=', company.id))
+        levels = self.search(domain)
+        self.env.add_to_compute(self._fields['deadline'], levels)
+        levels.flush_recordset(['deadline', 'is_overdue'])
+        _logger.info(f"Deadlines recomputed for {len(levels)} pending level(s)")
+        return True
 
     @api.depends('deadline', 'state')
     def _compute_is_overdue(self):
-        now = fields.Datetime.now()
+        """
+        Put the level back in the timer queue of the overdue cron
+        
+        A moved deadline or a processed level is not overdue (anymore); only
+        _flag_overdue_levels flags levels, so each one gets its reminder.
+        """
         for record in self:
-            if record.state == 'pending' and record.deadline:
-                record.is_overdue = now > record.deadline
-            else:
-                record.is_overdue = False
+            record.is_overdue = False
 
-    def action_approve(self):
-        """Approve the leave at this level (supports parallel approval)"""
-        self.ensure_one()
-        
-        _logger.info(f"=== action_approve called for Level {self.level} (ID: {self.id}) ===")
-        _logger.info(f"  Leave ID: {self.leave_id.id}")
-        _logger.info(f"  Approver: {self.approver_id.name}")
-        _logger.info(f"  Current user: {self.env.user.name}")
-        _logger.info(f"  Level state before: {self.state}")
-        _logger.info(f"  is_current_level: {self.is_current_level}")
+    def _check_can_process(self, unauthorized_message):
+        """
+        Check that every level can be approved/rejected by the current user
         
-        if self.state != 'pending':
+        Checks run on the whole recordset before anything is written, so a
+        batch is processed entirely or not at all.
+        """
+        if self.filtered(lambda l: l.state != 'pending'):
             raise UserError(_('This approval has already been processed.'))
         
-        if not self.is_current_level:
+        if self.filtered(lambda l: not l.is_current_level):
             raise UserError(_('Previous levels must be approved first.'))
         
         # Check if current user is the approver
-        if self.env.user != self.approver_id and not self.env.user.has_group('hr_holidays.group_hr_holidays_manager'):
-            raise UserError(_('You are not authorized to approve this request.'))
+        if (self.filtered(lambda l: l.approver_id != self.env.user)
+                and not self.env.user.has_group('hr_holidays.group_hr_holidays_manager')):
+            raise UserError(unauthorized_message)
+
+    def action_approve(self):
+        """
+        Approve the leaves at these levels (supports parallel approval)
         
-        # Approve this record - use sudo to write (approver may not have direct write access)
-        _logger.info(f"  ✅ Approving Level {self.level}...")
+        Works on recordsets: same-level siblings are approved together,
+        completion is evaluated once per affected leave and next level
+        notifications are sent at the end.
+        """
+        if not self:
+            return True
+        
+        _approval_tracer.debug("=== action_approve called for %s level(s) by %s ===",
+                               len(self), lambda: self.env.user.name)
+        
+        self._check_can_process(_('You are not authorized to approve this request.'))
+        
+        # Approve these records - use sudo to write (approver may not have direct write access)
+        now = fields.Datetime.now()
         self.sudo().write({
             'state': 'approved',
-            'action_date': fields.Datetime.now(),
+            'action_date': now,
         })
-        _logger.info(f"  Level {self.level} state after write: approved")
         
         # PARALLEL APPROVAL: If there are other approvers at same level, approve them too
-        same_level_pending = self.env['leave.approval.level'].search([
-            ('leave_id', '=', self.leave_id.id),
-            ('level', '=', self.level),
-            ('id', '!=', self.id),
-            ('state', '=', 'pending')
-        ])
-        
-        if same_level_pending:
-            _logger.info(f"  Parallel approval: Auto-approving {len(same_level_pending)} other approvers at level {self.level}")
-            same_level_pending.write({
+        approved_keys = {(level.leave_id.id, level.level): level for level in self}
+        same_level_pending = self.search([
+            ('leave_id', 'in', self.leave_id.ids),
+            ('level', 'in', list({level.level for level in self})),
+            ('id', 'not in', self.ids),
+            ('state', '=', 'pending'),
+        ]).filtered(lambda l: (l.leave_id.id, l.level) in approved_keys)
+        
+        # One write per approver (the comment names who approved)
+        siblings_by_approver = {}
+        for sibling in same_level_pending:
+            approver = approved_keys[(sibling.leave_id.id, sibling.level)].approver_id
+            siblings_by_approver.setdefault(approver, self.browse())
+            siblings_by_approver[approver] |= sibling
+        for approver, siblings in siblings_by_approver.items():
+            _approval_tracer.debug("  Parallel approval: Auto-approving %s other approvers", len(siblings))
+            siblings.write({
                 'state': 'approved',
-                'action_date': fields.Datetime.now(),
-                'comments': f'Auto-approved (parallel approval by {self.approver_id.name})'
+                'action_date': now,
+                'comments': f'Auto-approved (parallel approval by {approver.name})'
             })
         
         # Post message - use sudo to avoid permission issues
-        try:
-            self.leave_id.sudo().message_post(
-                body=_('Approved by %s (Level %s)') % (self.approver_id.name, self.level),
-                subtype_xmlid='mail.mt_comment'
-            )
-        except Exception as e:
-            _logger.warning(f"Could not post approval message: {e}")
+        for level in self:
+            try:
+                level.leave_id.sudo().message_post(
+                    body=_('Approved by %s (Level %s)') % (level.approver_id.name, level.level),
+                    subtype_xmlid='mail.mt_comment'
+                )
+            except Exception as e:
+                _logger.warning(f"Could not post approval message: {e}")
         
-        # Check if this was the final level - use sudo
-        _logger.info(f"  Calling _check_approval_completion()...")
-        self.leave_id.sudo()._check_approval_completion()
+        # Check which leaves are now fully approved - use sudo
+        leaves = self.leave_id.sudo()
+        leaves._check_approval_completion()
         
         # CRITICAL: Recompute user_has_pending_approval field to update filter
-        _logger.info(f"  Recomputing user_has_pending_approval field...")
-        self.leave_id.sudo()._compute_user_has_pending_approval()
+        leaves._compute_user_approval_status()
         
         # Notify next level
         self._notify_next_level()
         
-        _logger.info(f"=== action_approve completed for Level {self.level} ===")
+        _approval_tracer.info("✅ %s approval level(s) approved", len(self))
         return True
 
     def action_reject(self):
-        """Reject the leave at this level"""
-        self.ensure_one()
-        
-        if self.state != 'pending':
-            raise UserError(_('This approval has already been processed.'))
-        
-        if not self.is_current_level:
-            raise UserError(_('Previous levels must be approved first.'))
+        """Reject the leaves at these levels (supports recordsets)"""
+        if not self:
+            return True
         
-        # Check if current user is the approver
-        if self.env.user != self.approver_id and not self.env.user.has_group('hr_holidays.group_hr_holidays_manager'):
-            raise UserError(_('You are not authorized to reject this request.'))
+        self._check_can_process(_('You are not authorized to reject this request.'))
         
         # Use sudo to write (approver may not have direct write access)
         self.sudo().write({
@@ -275,28 +375,103 @@ class LeaveApprovalLevel(models.Model):
             'action_date': fields.Datetime.now(),
         })
         
-        # Reject the entire leave request - use sudo as it may update other approval levels
-        self.leave_id.sudo().action_refuse()
+        # Reject the entire leave requests - use sudo as it may update other approval levels
+        leaves = self.leave_id.sudo()
+        leaves.action_refuse()
         
         # CRITICAL: Recompute user_has_pending_approval field to update filter
-        _logger.info(f"  Recomputing user_has_pending_approval field after rejection...")
-        self.leave_id.sudo()._compute_user_has_pending_approval()
+        leaves._compute_user_approval_status()
         
         # Post message - use sudo to avoid permission issues
-        try:
-            self.leave_id.sudo().message_post(
-                body=_('Rejected by %s (Level %s): %s') % (
-                    self.approver_id.name,
-                    self.level,
-                    self.comments or 'No comment'
-                ),
-                subtype_xmlid='mail.mt_comment'
-            )
-        except Exception as e:
-            _logger.warning(f"Could not post rejection message: {e}")
+        for level in self:
+            try:
+                level.leave_id.sudo().message_post(
+                    body=_('Rejected by %s (Level %s): %s') % (
+                        level.approver_id.name,
+                        level.level,
+                        level.comments or 'No comment'
+                    ),
+                    subtype_xmlid='mail.mt_comment'
+                )
+            except Exception as e:
+                _logger.warning(f"Could not post rejection message: {e}")
         
         return True
 
+    @api.model
+    def _reroute_delegated_levels(self):
+        """
+        Apply the open delegation windows to the pending levels
+        
+        Levels of an approver with an open delegation are assigned to the
+        delegate; levels rerouted by a delegation that no longer applies go
+        back to their original approver. Newly assigned current levels are
+        notified.
+        """
+        Delegation = self.env['leave.approval.delegation']
+        Delegation.flush_model()
+        now = fields.Datetime.now()
+        self.env.cr.execute("""
+            SELECT DISTINCT user_id
+              FROM leave_approval_delegation
+             WHERE active AND date_from <= %s AND date_to > %s
+        """, [now, now])
+        delegating_user_ids = [row[0] for row in self.env.cr.fetchall()]
+        
+        levels = self.sudo().search([
+            ('state', '=', 'pending'),
+            '|', ('delegation_id', '!=', False), ('approver_id', 'in', delegating_user_ids),
+        ])
+        if not levels:
+            return
+        
+        def original_approver(level):
+            return level.original_approver_id if level.delegation_id else level.approver_id
+        
+        delegations = Delegation._get_delegations(
+            {original_approver(level).id for level in levels}, at=now
+        )
+        
+        # Group levels by target assignment, one write per target
+        targets = {}
+        for level in levels:
+            original = original_approver(level)
+            delegate_id, delegation_id = delegations.get(original.id, (False, False))
+            if not delegate_id or delegate_id == level.employee_id.user_id.id:
+                delegate_id, delegation_id = original.id, False
+            if (delegate_id, delegation_id) == (level.approver_id.id, level.delegation_id.id):
+                continue
+            key = (delegate_id, delegation_id, original.id)
+            targets[key] = targets.get(key, self.browse()) | level
+        
+        rerouted = self.browse()
+        for (approver_id, delegation_id, original_id), target_levels in targets.items():
+            target_levels.write({
+                'approver_id': approver_id,
+                'delegation_id': delegation_id,
+                'original_approver_id': original_id if delegation_id else False,
+                'delegated_to_id': approver_id if delegation_id else False,
+            })
+            rerouted |= target_levels
+        
+        if rerouted:
+            _logger.info(f"🔀 {len(rerouted)} pending approval level(s) rerouted by delegations")
+            for level in rerouted.filtered('is_current_level'):
+                level._send_notification()
+
+    def _revert_delegation(self):
+        """Give delegated levels back to their original approver"""
+        # One write per (delegator, original approver)
+        levels = self.sudo().filtered('delegation_id')
+        groups = levels.grouped(lambda l: (l.delegation_id.user_id, l.original_approver_id))
+        for (__, original_approver), group_levels in groups.items():
+            group_levels.write({
+                'approver_id': original_approver.id,
+                'delegation_id': False,
+                'original_approver_id': False,
+                'delegated_to_id': False,
+            })
+
     def action_delegate(self, delegate_to_id):
         """Delegate approval to another user"""
         self.ensure_one()
@@ -365,15 +540,13 @@ class LeaveApprovalLevel(models.Model):
         self.ensure_one()
         
         template = self.env.ref(
-            'hr_leave_orgchart_approval.email_template_approval_notification',
+            'snifx_hr_leave_orgchart_approval.email_template_approval_notification',
             raise_if_not_found=False
         )
         
+        # Queued in the outbox: sent after commit, the approver never waits for SMTP
         if template:
-            try:
-                template.send_mail(self.id, force_send=True)
-            except Exception as e:
-                _logger.warning(f"Failed to send email notification: {e}")
+            self.env['snifx.mail.outbox'].enqueue(template, self.ids)
         
         # Create activity - with error handling
         try:
@@ -400,33 +573,172 @@ class LeaveApprovalLevel(models.Model):
             _logger.warning(f"Failed to create activity: {e}")
 
     def _notify_next_level(self):
-        """Notify the next level approver"""
-        next_level = self.env['leave.approval.level'].search([
-            ('leave_id', '=', self.leave_id.id),
-            ('level', '=', self.level + 1),
+        """Notify the next level approvers of these levels (one search for all)"""
+        if not self:
+            return
+        next_keys = {(level.leave_id.id, level.level + 1) for level in self}
+        candidates = self.search([
+            ('leave_id', 'in', self.leave_id.ids),
+            ('level', 'in', list({level for __, level in next_keys})),
             ('state', '=', 'pending')
-        ], limit=1)
+        ])
+        
+        # First pending record of each next level (same as the single-record path)
+        next_levels = {}
+        for candidate in candidates:
+            key = (candidate.leave_id.id, candidate.level)
+            if key in next_keys:
+                next_levels.setdefault(key, candidate)
         
-        if next_level:
+        next_levels = self.browse([level.id for level in next_levels.values()])
+        skipped = next_levels._skip_absent_approvers()
+        for next_level in next_levels - skipped:
             next_level._send_notification()
+        
+        if skipped:
+            # The chain moves on: complete the leaves or activate the next levels
+            skipped.leave_id.sudo()._check_approval_completion()
+            skipped._notify_next_level()
 
-    @api.model
-    def _cron_reminder_overdue(self):
-        """Send reminders for overdue approvals"""
-        overdue_approvals = self.search([
+    def _skip_absent_approvers(self):
+        """
+        Skip the levels being activated whose approver is on time off
+
+        Only for leave types with auto_approve_if_manager_absent; the absence
+        of all approvers is checked with a single query. Levels with another
+        approver still pending at the same level are kept.
+
+        :return: skipped levels
+        """
+        levels = self.filtered(
+            lambda l: l.state == 'pending' and l.leave_id.holiday_status_id.auto_approve_if_manager_absent
+        )
+        if not levels:
+            return self.browse()
+        
+        absent_user_ids = self.env['hr.leave']._get_absent_user_ids(levels.approver_id.ids)
+        levels = levels.filtered(lambda l: l.approver_id.id in absent_user_ids)
+        if not levels:
+            return self.browse()
+        
+        # Parallel approvers: the level waits for the present ones
+        present = self.search([
+            ('leave_id', 'in', levels.leave_id.ids),
+            ('id', 'not in', levels.ids),
             ('state', '=', 'pending'),
-            ('is_current_level', '=', True),
-            ('is_overdue', '=', True)
+            ('approver_id', 'not in', list(absent_user_ids)),
         ])
+        present_keys = {(level.leave_id.id, level.level) for level in present}
+        levels = levels.filtered(lambda l: (l.leave_id.id, l.level) not in present_keys)
+        if not levels:
+            return self.browse()
         
-        for approval in overdue_approvals:
-            # Send reminder email
-            template = self.env.ref(
-                'hr_leave_orgchart_approval.email_template_overdue_reminder',
-                raise_if_not_found=False
+        levels.sudo().write({
+            'state': 'skipped',
+            'action_date': fields.Datetime.now(),
+            'comments': 'Auto-skipped: approver on time off',
+        })
+        for level in levels:
+            _approval_tracer.info("⏭️ Level %s of leave %s skipped: approver %s is absent",
+                                  level.level, level.leave_id.id, level.approver_id.id)
+            try:
+                level.leave_id.sudo().message_post(
+                    body=_('Level %s skipped: %s is on time off') % (level.level, level.approver_id.name),
+                    subtype_xmlid='mail.mt_note'
+                )
+            except Exception as e:
+                _logger.warning(f"Could not post skip message: {e}")
+        return levels
+
+    @api.model
+    def _flag_overdue_levels(self):
+        """
+        Flag current pending levels whose deadline has passed, in one bulk UPDATE
+        
+        Only rows still in the timer queue (pending, not flagged yet) are
+        read, through the partial index on deadline, so each run handles the
+        levels that became due since the previous one. Levels waiting for a
+        previous level stay in the queue: they are flagged (and reminded) by
+        the first run after they become current.
+        
+        :return: newly overdue leave.approval.level records
+        """
+        self.flush_model(['state', 'deadline', 'is_overdue', 'is_current_level'])
+        self.env.cr.execute("""
+            UPDATE leave_approval_level
+               SET is_overdue = TRUE
+             WHERE state = 'pending'
+               AND is_overdue IS NOT TRUE
+               AND deadline <= (now() AT TIME ZONE 'UTC')
+               AND is_current_level
+         RETURNING id
+        """)
+        overdue_ids = [row[0] for row in self.env.cr.fetchall()]
+        self.invalidate_model(['is_overdue'])
+        if overdue_ids:
+            _logger.info(f"⏰ {len(overdue_ids)} approval level(s) became overdue")
+        return self.browse(overdue_ids)
+
+    @api.model
+    def _cron_reminder_overdue(self):
+        """Flag newly overdue approvals and send them a reminder"""
+        overdue_approvals = self._flag_overdue_levels()
+        if not overdue_approvals:
+            return
+        
+        digest = str2bool(
+            self.env['ir.config_parameter'].sudo().get_param(OVERDUE_DIGEST_PARAM, 'True')
+        )
+        if digest:
+            overdue_approvals._send_overdue_digests()
+            return
+        
+        # Send reminder email (one outbox row per level)
+        template = self.env.ref(
+            'snifx_hr_leave_orgchart_approval.email_template_overdue_reminder',
+            raise_if_not_found=False
+        )
+        if template:
+            self.env['snifx.mail.outbox'].enqueue(template, overdue_approvals.ids)
+
+    def _send_overdue_digests(self):
+        """
+        Queue one overdue reminder per approver listing all their levels
+        
+        Bodies are rendered with QWeb and the mails are created in batches
+        in the mail queue (sent by the mail scheduler), so the cron does not
+        wait for the SMTP server.
+        """
+        levels_by_approver = {}
+        for level in self.sudo():
+            levels_by_approver.setdefault(level.approver_id, self.sudo().browse())
+            levels_by_approver[level.approver_id] |= level
+        
+        email_from = self.env.company.email_formatted or self.env.user.email_formatted
+        mail_values = []
+        for approver, levels in levels_by_approver.items():
+            if not approver.email:
+                _logger.warning(f"Approver {approver.name} has no email, overdue digest skipped")
+                continue
+            body = self.env['ir.qweb']._render(
+                'snifx_hr_leave_orgchart_approval.overdue_reminder_digest',
+                {'approver': approver, 'levels': levels.sorted('deadline')},
             )
-            if template:
-                template.send_mail(approval.id, force_send=True)
+            mail_values.append({
+                'subject': _('REMINDER: %s overdue leave approval(s)') % len(levels),
+                'email_from': email_from,
+                'email_to': approver.email_formatted,
+                'body_html': body,
+                'auto_delete': True,
+            })
+        
+        Mail = self.env['mail.mail'].sudo()
+        for batch in split_every(MAIL_BATCH_SIZE, mail_values, list):
+            Mail.create(batch)
+        
+        if mail_values:
+            _logger.info(f"⏰ {len(mail_values)} overdue digest(s) queued for {len(self)} level(s)")
+            self.env.ref('mail.ir_cron_mail_scheduler_action')._trigger()
 
     def open_record(self):
         """
@@ -483,4 +795,8 @@ class LeaveApprovalLevel(models.Model):
             _logger.info(f"Cleaning {len(messages)} messages before deleting approval levels")
             messages.unlink()
         
-        return super(LeaveApprovalLevel, self).unlink()
+        # The next level of these leaves may become current
+        leave_ids = self.leave_id.ids
+        result = super(LeaveApprovalLevel, self).unlink()
+        self.env['leave.approval.inbox']._sync_leaves(leave_ids)
+        return result
@@ -2,6 +2,10 @@
 
 from odoo import models, fields, api
 
+# Fields that change cached approval chain templates (see hr.leave)
+APPROVAL_CHAIN_FIELDS = {'use_orgchart_approval', 'notification_officer_ids', 'manager_id'}
+
+
 class HrDepartment(models.Model):
     _inherit = 'hr.department'
     
@@ -30,6 +34,18 @@ class HrDepartment(models.Model):
         store=False
     )
     
+    def write(self, vals):
+        result = super(HrDepartment, self).write(vals)
+        if APPROVAL_CHAIN_FIELDS.intersection(vals):
+            self.env['hr.leave']._invalidate_approval_chain_templates()
+        return result
+    
+    def unlink(self):
+        result = super(HrDepartment, self).unlink()
+        # Employees of the departments are left without department
+        self.env['hr.leave']._invalidate_approval_chain_templates()
+        return result
+    
     @api.depends('notification_officer_ids')
     def _compute_notification_count(self):
         """Count selected notification officers"""
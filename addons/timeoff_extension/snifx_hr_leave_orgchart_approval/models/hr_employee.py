@@ -2,6 +2,21 @@
 
 from odoo import models, fields, api, _
 
+from odoo.addons.snifx_timeoff_core.tools import VersionedCache
+
+# Fields that change the top management roster (content or ordering),
+# only relevant on root employees (no manager)
+TOP_MANAGEMENT_FIELDS = {'parent_id', 'user_id', 'active', 'company_id', 'name'}
+
+# Fields of any employee that change cached approval chain templates (see hr.leave)
+APPROVAL_CHAIN_FIELDS = {
+    'parent_id', 'user_id', 'active', 'company_id',
+    'force_single_approval_level', 'department_id',
+}
+
+# Top management roster per company
+TOP_MANAGEMENT_CACHE = VersionedCache('snifx_hr_leave_orgchart_approval.top_management', 256)
+
 
 class HrEmployee(models.Model):
     _inherit = 'hr.employee'
@@ -26,8 +41,126 @@ class HrEmployee(models.Model):
              'overriding the smart detection system. Useful for employees who do not need senior management approval.'
     )
     
-    # Note: Delegation fields removed to avoid access errors
-    # Can be re-added later with proper security if needed
+    # Smart detection: Manager (has subordinates) vs Staff (no subordinates)
+    # Stored and indexed so it is read instead of counted on every submission
+    direct_subordinate_count = fields.Integer(
+        string='Direct Subordinates',
+        compute='_compute_direct_subordinate_count',
+        store=True,
+        index=True,
+        help='Number of active employees of the same company reporting directly to this employee. '
+             'Used by the smart detection of the approval chain (0 = Staff, otherwise Manager).'
+    )
+    
+    # Note: Delegation is handled by leave.approval.delegation
+    # (out-of-office windows), see get_effective_approver
+
+    @api.depends('child_ids', 'child_ids.active', 'child_ids.company_id', 'company_id')
+    def _compute_direct_subordinate_count(self):
+        """Count active direct subordinates of the same company in one grouped query"""
+        employee_ids = self._origin.ids
+        counts = {}
+        if employee_ids:
+            counts = {
+                (parent.id, company.id): count
+                for parent, company, count in self.env['hr.employee']._read_group(
+                    [('parent_id', 'in', employee_ids)],
+                    ['parent_id', 'company_id'],
+                    ['__count'],
+                )
+            }
+        for employee in self:
+            employee.direct_subordinate_count = counts.get(
+                (employee._origin.id, employee.company_id.id), 0
+            )
+
+    @api.model
+    def _get_top_management_roster(self, company_id):
+        """
+        Get the top management roster of a company
+        
+        Users of the root employees of the org chart (no manager), ordered
+        by employee name then id. Cached per company and invalidated when a
+        root employee changes, so it is never searched while submitting
+        leaves.
+        
+        :param company_id: res.company id (False for employees without company)
+        :return: tuple of res.users ids
+        """
+        company_id = company_id or False
+        return TOP_MANAGEMENT_CACHE.get(
+            self.env, company_id, lambda: self._read_top_management_roster(company_id)
+        )
+
+    @api.model
+    def _read_top_management_roster(self, company_id):
+        self.flush_model(list(TOP_MANAGEMENT_FIELDS))
+        self.env.cr.execute("""
+            SELECT user_id
+              FROM hr_employee
+             WHERE parent_id IS NULL
+               AND user_id IS NOT NULL
+               AND active
+               AND company_id IS NOT DISTINCT FROM %s
+          ORDER BY name, id
+        """, [company_id or None])
+        return tuple(dict.fromkeys(user_id for user_id, in self.env.cr.fetchall()))
+
+    def _invalidate_approval_chains(self):
+        """Invalidate the cached approval chain templates (see hr.leave)"""
+        self.env['hr.leave']._invalidate_approval_chain_templates()
+
+    def _invalidate_top_management_roster(self):
+        """Invalidate the cached rosters, and the chain templates built from them"""
+        TOP_MANAGEMENT_CACHE.invalidate(self.env)
+        self._invalidate_approval_chains()
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Override create to register new employees in the hierarchy closure table"""
+        employees = super(HrEmployee, self).create(vals_list)
+        self.env['hr.employee.hierarchy'].sudo()._add_employees(employees)
+        if employees.filtered(lambda e: not e.parent_id and e.user_id):
+            self._invalidate_top_management_roster()
+        elif employees.filtered(lambda e: e.parent_id or e.user_id):
+            # A new subordinate can turn its manager from Staff into Manager
+            self._invalidate_approval_chains()
+        return employees
+
+    def write(self, vals):
+        """Override write to keep the hierarchy closure table in sync"""
+        # The roster only depends on root employees, before or after the write
+        roster_changed = TOP_MANAGEMENT_FIELDS.intersection(vals) and any(
+            not employee.parent_id for employee in self
+        )
+        result = super(HrEmployee, self).write(vals)
+        
+        Hierarchy = self.env['hr.employee.hierarchy'].sudo()
+        if 'parent_id' in vals:
+            Hierarchy._move_subtrees(self)
+            roster_changed = roster_changed or not vals['parent_id']
+        if 'user_id' in vals:
+            Hierarchy._update_ancestor_users(self)
+        if roster_changed:
+            self._invalidate_top_management_roster()
+        elif APPROVAL_CHAIN_FIELDS.intersection(vals):
+            self._invalidate_approval_chains()
+        
+        return result
+
+    def unlink(self):
+        """Override unlink to detach orphaned subordinates in the closure table"""
+        children = self.with_context(active_test=False).child_ids - self
+        # Unlinked roots leave the roster, orphaned children join it
+        roster_changed = bool(children) or any(not employee.parent_id for employee in self)
+        result = super(HrEmployee, self).unlink()
+        # parent_id of the children is reset by the database (ondelete set null)
+        self.env['hr.employee.hierarchy'].sudo()._move_subtrees(children.exists())
+        if roster_changed:
+            self._invalidate_top_management_roster()
+        else:
+            self._invalidate_approval_chains()
+        return result
     
     def get_effective_approver(self):
         """
@@ -35,4 +168,7 @@ class HrEmployee(models.Model):
         Returns user_id
         """
         self.ensure_one()
+        delegations = self.env['leave.approval.delegation'].sudo()._get_delegations(self.user_id.ids)
+        if self.user_id.id in delegations:
+            return self.env['res.users'].browse(delegations[self.user_id.id][0])
         return self.user_id
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+
+import logging
+from odoo import models, fields, api
+from odoo.tools import create_index
+
+_logger = logging.getLogger(__name__)
+
+
+class HrEmployeeHierarchy(models.Model):
+    """
+    Closure table of the employee manager hierarchy (hr.employee.parent_id)
+
+    One row per (employee, ancestor) pair, the employee itself included at
+    depth 0. Rows are maintained incrementally by hr.employee when parent_id
+    or user_id change, so ancestry questions (approval chains, subordinate
+    checks) are answered with a single indexed query instead of walking
+    parent_id one hop at a time.
+    """
+    _name = 'hr.employee.hierarchy'
+    _description = 'Employee Manager Hierarchy'
+    _log_access = False
+    _order = 'employee_id, depth'
+
+    employee_id = fields.Many2one(
+        'hr.employee',
+        string='Employee',
+        required=True,
+        ondelete='cascade'
+    )
+    ancestor_id = fields.Many2one(
+        'hr.employee',
+        string='Ancestor',
+        required=True,
+        ondelete='cascade'
+    )
+    depth = fields.Integer(
+        string='Depth',
+        required=True,
+        help="0 = the employee itself, 1 = direct manager, 2 = manager's manager, etc."
+    )
+    ancestor_user_id = fields.Many2one(
+        'res.users',
+        string='Ancestor User',
+        ondelete='set null',
+        help="Copy of ancestor_id.user_id so approvers are read without extra joins"
+    )
+
+    _sql_constraints = [
+        ('employee_ancestor_uniq', 'unique(employee_id, ancestor_id)',
+         'An employee can only be linked once to each ancestor.'),
+    ]
+
+    def init(self):
+        create_index(
+            self._cr, 'hr_employee_hierarchy_ancestor_depth_index',
+            self._table, ['ancestor_id', 'depth']
+        )
+        self._cr.execute("SELECT 1 FROM hr_employee_hierarchy LIMIT 1")
+        if not self._cr.fetchone():
+            self._rebuild_hierarchy()
+
+    @api.model
+    def _rebuild_hierarchy(self):
+        """Recompute the whole closure table from hr_employee.parent_id"""
+        self.env['hr.employee'].flush_model(['parent_id', 'user_id'])
+        self._cr.execute("DELETE FROM hr_employee_hierarchy")
+        self._cr.execute("""
+            WITH RECURSIVE tree(employee_id, ancestor_id, depth) AS (
+                SELECT id, id, 0 FROM hr_employee
+                UNION ALL
+                SELECT tree.employee_id, emp.parent_id, tree.depth + 1
+                  FROM tree
+                  JOIN hr_employee emp ON emp.id = tree.ancestor_id
+                 WHERE emp.parent_id IS NOT NULL
+            )
+            INSERT INTO hr_employee_hierarchy (employee_id, ancestor_id, depth, ancestor_user_id)
+            SELECT tree.employee_id, tree.ancestor_id, tree.depth, anc.user_id
+              FROM tree
+              JOIN hr_employee anc ON anc.id = tree.ancestor_id
+        """)
+        _logger.info(f"Employee hierarchy rebuilt: {self._cr.rowcount} rows")
+        self.invalidate_model()
+
+    @api.model
+    def _add_employees(self, employees):
+        """Insert closure rows for newly created employees"""
+        if not employees:
+            return
+        employees.flush_recordset(['parent_id', 'user_id'])
+        self._cr.execute("""
+            INSERT INTO hr_employee_hierarchy (employee_id, ancestor_id, depth, ancestor_user_id)
+            SELECT id, id, 0, user_id FROM hr_employee WHERE id = ANY(%s)
+        """, [employees.ids])
+        # Self rows exist for the whole batch, so attaching each subtree
+        # works whatever the order of parents and children in the batch
+        self._move_subtrees(employees)
+
+    @api.model
+    def _move_subtrees(self, employees):
+        """Re-attach the subtree of every employee under its current parent_id"""
+        if not employees:
+            return
+        employees.flush_recordset(['parent_id'])
+        self._cr.execute(
+            "SELECT id, parent_id FROM hr_employee WHERE id = ANY(%s)",
+            [employees.ids]
+        )
+        for employee_id, parent_id in self._cr.fetchall():
+            # Detach the subtree from all its former ancestors
+            self._cr.execute("""
+                DELETE FROM hr_employee_hierarchy
+                 WHERE employee_id IN (
+                           SELECT employee_id FROM hr_employee_hierarchy
+                            WHERE ancestor_id = %(employee)s)
+                   AND ancestor_id IN (
+                           SELECT ancestor_id FROM hr_employee_hierarchy
+                            WHERE employee_id = %(employee)s AND ancestor_id != %(employee)s)
+            """, {'employee': employee_id})
+            if parent_id:
+                # Link every node of the subtree to the new parent's ancestry
+                self._cr.execute("""
+                    INSERT INTO hr_employee_hierarchy (employee_id, ancestor_id, depth, ancestor_user_id)
+                    SELECT sub.employee_id, sup.ancestor_id, sup.depth + sub.depth + 1, sup.ancestor_user_id
+                      FROM hr_employee_hierarchy sup, hr_employee_hierarchy sub
+                     WHERE sup.employee_id = %(parent)s
+                       AND sub.ancestor_id = %(employee)s
+                """, {'employee': employee_id, 'parent': parent_id})
+        self.invalidate_model()
+
+    @api.model
+    def _update_ancestor_users(self, employees):
+        """Propagate a user_id change to the rows where employees are ancestors"""
+        if not employees:
+            return
+        employees.flush_recordset(['user_id'])
+        self._cr.execute("""
+            UPDATE hr_employee_hierarchy h
+               SET ancestor_user_id = emp.user_id
+              FROM hr_employee emp
+             WHERE emp.id = h.ancestor_id
+               AND h.ancestor_id = ANY(%s)
+        """, [employees.ids])
+        self.invalidate_model(['ancestor_user_id'])
+
+    @api.model
+    def _get_ancestors(self, employee_ids):
+        """
+        Get the managers above each employee in one query
+
+        Returns dict {employee_id: [(ancestor_id, ancestor_user_id), ...]}
+        ordered from the direct manager upwards.
+        """
+        result = {employee_id: [] for employee_id in employee_ids}
+        if not result:
+            return result
+        self._cr.execute("""
+            SELECT employee_id, ancestor_id, ancestor_user_id
+              FROM hr_employee_hierarchy
+             WHERE employee_id = ANY(%s) AND depth > 0
+          ORDER BY employee_id, depth
+        """, [list(result)])
+        for employee_id, ancestor_id, ancestor_user_id in self._cr.fetchall():
+            result[employee_id].append((ancestor_id, ancestor_user_id))
+        return result
+
+    @api.model
+    def _get_subordinate_pairs(self, ancestor_ids, employee_ids):
+        """
+        Return the set of (ancestor_id, employee_id) pairs where the employee
+        is a direct or indirect subordinate of the ancestor
+        """
+        if not ancestor_ids or not employee_ids:
+            return set()
+        self._cr.execute("""
+            SELECT ancestor_id, employee_id
+              FROM hr_employee_hierarchy
+             WHERE ancestor_id = ANY(%s) AND employee_id = ANY(%s) AND depth > 0
+        """, [list(ancestor_ids), list(employee_ids)])
+        return set(self._cr.fetchall())
+
+    @api.model
+    def _get_subordinate_user_ids(self, employee_id):
+        """
+        Return the users of all direct and indirect subordinates of an employee
+
+        Read once per chain so each candidate approver is then checked with a
+        set lookup.
+        """
+        self._cr.execute("""
+            SELECT emp.user_id
+              FROM hr_employee_hierarchy h
+              JOIN hr_employee emp ON emp.id = h.employee_id
+             WHERE h.ancestor_id = %s AND h.depth > 0 AND emp.user_id IS NOT NULL
+        """, [employee_id])
+        return frozenset(row[0] for row in self._cr.fetchall())
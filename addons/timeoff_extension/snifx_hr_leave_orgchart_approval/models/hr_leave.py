@@ -2,9 +2,32 @@
 
 import logging
 from odoo import models, fields, api, _
+from odoo.tools import create_index
 from odoo.exceptions import UserError, ValidationError
+from odoo.addons.snifx_timeoff_core.tools import get_tracer, VersionedCache
 
 _logger = logging.getLogger(__name__)
+# Hot path trace points (lazy, see snifx_timeoff_core/tools/tracing.py)
+_chain_tracer = get_tracer('chain')
+_approval_tracer = get_tracer('approval')
+_officer_tracer = get_tracer('officer')
+
+# Current approval level of each leave: lowest level not approved/skipped,
+# or last level + 1 once all are done (%s = optional WHERE clause)
+CURRENT_LEVEL_QUERY = """
+    SELECT leave_id,
+           COALESCE(MIN(level) FILTER (WHERE state NOT IN ('approved', 'skipped')),
+                    MAX(level) + 1) AS current_level
+      FROM leave_approval_level
+      %s
+  GROUP BY leave_id
+"""
+
+# Key of the per-transaction HR manager pending counts in cr.cache
+HR_MANAGER_COUNTS_KEY = 'snifx_hr_manager_pending_counts'
+
+# Approval chain templates per (employee, leave type, company, approval mode)
+APPROVAL_CHAIN_CACHE = VersionedCache('snifx_hr_leave_orgchart_approval.approval_chain', 4096)
 
 
 class HrLeave(models.Model):
@@ -38,7 +61,7 @@ class HrLeave(models.Model):
     )
     approval_progress = fields.Float(
         string='Approval Progress',
-        compute='_compute_approval_progress',
+        compute='_compute_approval_status',
         help="Percentage of approvals completed"
     )
     
@@ -49,77 +72,193 @@ class HrLeave(models.Model):
     )
     pending_approver_ids = fields.Many2many(
         'res.users',
-        compute='_compute_pending_approver_ids',
+        compute='_compute_approval_status',
         string='Pending Approvers'
     )
+    approval_inbox_ids = fields.One2many(
+        'leave.approval.inbox',
+        'leave_id',
+        string='Approver Inbox'
+    )
     user_has_pending_approval = fields.Boolean(
         string='User Has Pending Approval',
-        compute='_compute_user_has_pending_approval',
+        compute='_compute_user_approval_status',
         search='_search_user_has_pending_approval',
         help='True if current user has a pending approval level for this leave (computed per user, not stored)'
     )
     current_user_already_approved = fields.Boolean(
         string='Current User Already Approved',
-        compute='_compute_current_user_already_approved',
+        compute='_compute_user_approval_status',
         help='True if current user has already approved this leave (used to hide approve buttons)'
     )
 
-    @api.depends('approval_level_ids.state', 'approval_level_ids.approver_id')
-    def _compute_current_user_already_approved(self):
+    def init(self):
+        super(HrLeave, self).init()
+        # Absence lookup of approvers (see _get_absent_user_ids)
+        create_index(
+            self._cr, 'hr_leave_validated_interval_index',
+            self._table, ['employee_id', 'date_from', 'date_to'],
+            where="state = 'validate'"
+        )
+
+    @api.model
+    def _get_absent_user_ids(self, user_ids, at=None):
         """
-        Check if current user has already approved this leave.
-        Used to hide Approve/Refuse buttons in list view for records already approved by user.
+        Users currently on an approved time off
+
+        One indexed interval lookup for all users, cheap enough to be
+        called when levels are created or activated.
+
+        :param user_ids: iterable of res.users ids
+        :param at: naive UTC datetime, now by default
+        :return: set of the absent user ids
         """
-        current_user_id = self.env.uid
-        for leave in self:
-            # Check if any approval level has:
-            # - approver_id = current user
-            # - state = 'approved'
-            leave.current_user_already_approved = any(
-                level.approver_id.id == current_user_id and level.state == 'approved'
-                for level in leave.approval_level_ids
-            )
+        user_ids = [user_id for user_id in user_ids if user_id]
+        if not user_ids:
+            return set()
+        at = at or fields.Datetime.now()
+        self.flush_model(['employee_id', 'date_from', 'date_to', 'state'])
+        self.env['hr.employee'].flush_model(['user_id'])
+        self.env.cr.execute("""
+            SELECT DISTINCT e.user_id
+              FROM hr_leave l
+              JOIN hr_employee e ON e.id = l.employee_id
+             WHERE e.user_id = ANY(%s)
+               AND l.state = 'validate'
+               AND l.date_from <= %s
+               AND l.date_to > %s
+        """, [user_ids, at, at])
+        return {row[0] for row in self.env.cr.fetchall()}
 
-    @api.depends('approval_level_ids.state')
+    @api.depends('approval_level_ids.state', 'approval_level_ids.level')
     def _compute_current_approval_level(self):
-        for leave in self:
-            approved_levels = leave.approval_level_ids.filtered(
-                lambda l: l.state in ['approved', 'skipped']
+        """
+        Current level = lowest level not yet approved or skipped
+        (last level + 1 once every level is done)
+        
+        Stored leaves are computed with one query; the approval levels derive
+        is_current_level from this value.
+        """
+        current_levels = {}
+        stored_leaves = self.filtered('id')
+        if stored_leaves:
+            self.env['leave.approval.level'].flush_model(['leave_id', 'level', 'state'])
+            self.env.cr.execute(
+                CURRENT_LEVEL_QUERY % "WHERE leave_id = ANY(%s)", [stored_leaves.ids]
             )
-            leave.current_approval_level = len(approved_levels) + 1
+            current_levels = dict(self.env.cr.fetchall())
+        
+        for leave in self:
+            if leave.id:
+                leave.current_approval_level = current_levels.get(leave.id, 1)
+            else:
+                levels = leave.approval_level_ids
+                open_levels = levels.filtered(
+                    lambda l: l.state not in ['approved', 'skipped']
+                ).mapped('level')
+                leave.current_approval_level = (
+                    min(open_levels) if open_levels else max(levels.mapped('level'), default=0) + 1
+                )
+
+    @api.model
+    def _recompute_current_approval_levels(self, leave_ids=None):
+        """
+        Bulk recompute of current_approval_level and is_current_level in SQL
+        
+        Used when installing/upgrading the module (see leave.approval.level
+        init) and for data migrations. Only rows whose value changes are
+        written.
+        
+        :param leave_ids: optional list of hr.leave ids, all leaves by default
+        """
+        where = "WHERE leave_id = ANY(%(leave_ids)s)" if leave_ids is not None else ""
+        self.env['leave.approval.level'].flush_model()
+        self.flush_model(['current_approval_level'])
+        self.env.cr.execute(f"""
+            WITH current AS ({CURRENT_LEVEL_QUERY % where})
+            UPDATE hr_leave l
+               SET current_approval_level = current.current_level
+              FROM current
+             WHERE l.id = current.leave_id
+               AND l.current_approval_level IS DISTINCT FROM current.current_level
+        """, {'leave_ids': leave_ids})
+        _logger.info(f"Current approval level updated on {self.env.cr.rowcount} leave(s)")
+        self.env.cr.execute(f"""
+            UPDATE leave_approval_level a
+               SET is_current_level = (a.state = 'pending' AND a.level = l.current_approval_level)
+              FROM hr_leave l
+             WHERE l.id = a.leave_id
+               {"AND a.leave_id = ANY(%(leave_ids)s)" if leave_ids is not None else ""}
+               AND a.is_current_level IS DISTINCT FROM (a.state = 'pending' AND a.level = l.current_approval_level)
+        """, {'leave_ids': leave_ids})
+        _logger.info(f"Current level flag updated on {self.env.cr.rowcount} approval level(s)")
+        self.invalidate_model(['current_approval_level'])
+        self.env['leave.approval.level'].invalidate_model(['is_current_level'])
+        # Full rebuilds are done by leave.approval.inbox.init (created later)
+        if leave_ids is not None:
+            self.env['leave.approval.inbox']._sync_leaves(leave_ids)
 
     @api.depends('approval_level_ids')
     def _compute_total_approval_levels(self):
         for leave in self:
             leave.total_approval_levels = len(leave.approval_level_ids)
 
-    @api.depends('current_approval_level', 'total_approval_levels')
-    def _compute_approval_progress(self):
+    @api.depends(
+        'approval_level_ids.state',
+        'approval_level_ids.approver_id',
+        'approval_level_ids.is_current_level',
+    )
+    def _compute_approval_status(self):
+        """
+        Progress and current approvers of the leaves
+        
+        List views show these columns for many leaves: the levels of the
+        whole recordset are aggregated in one query instead of loading
+        every level record.
+        """
+        stored = self.filtered(lambda l: isinstance(l.id, int))
+        stats = {}
+        if stored:
+            self.env['leave.approval.level'].flush_model(['leave_id', 'state', 'approver_id', 'is_current_level'])
+            self.env.cr.execute("""
+                SELECT leave_id,
+                       COUNT(*),
+                       COUNT(*) FILTER (WHERE state IN ('approved', 'skipped')),
+                       ARRAY_AGG(DISTINCT approver_id)
+                           FILTER (WHERE state = 'pending' AND is_current_level AND approver_id IS NOT NULL)
+                  FROM leave_approval_level
+                 WHERE leave_id = ANY(%s)
+              GROUP BY leave_id
+            """, [stored.ids])
+            stats = {row[0]: row[1:] for row in self.env.cr.fetchall()}
+        
+        Users = self.env['res.users']
         for leave in self:
-            if leave.total_approval_levels > 0:
-                approved = leave.current_approval_level - 1
-                leave.approval_progress = (approved / leave.total_approval_levels) * 100
+            if leave in stored:
+                total, done, approver_ids = stats.get(leave.id, (0, 0, None))
             else:
-                leave.approval_progress = 0.0
-
-    @api.depends('approval_level_ids.state', 'approval_level_ids.is_current_level')
-    def _compute_pending_approver_ids(self):
-        for leave in self:
-            pending_levels = leave.approval_level_ids.filtered(
-                lambda l: l.state == 'pending' and l.is_current_level
-            )
-            leave.pending_approver_ids = pending_levels.mapped('approver_id')
-
+                # Leave being edited (onchange): levels are in memory
+                levels = leave.approval_level_ids
+                total = len(levels)
+                done = len(levels.filtered(lambda l: l.state in ['approved', 'skipped']))
+                approver_ids = levels.filtered(
+                    lambda l: l.state == 'pending' and l.is_current_level
+                ).approver_id.ids
+            leave.approval_progress = (done / total) * 100 if total else 0.0
+            leave.pending_approver_ids = Users.browse(approver_ids or [])
 
-    def _compute_user_has_pending_approval(self):
+    @api.depends('approval_level_ids.state', 'approval_level_ids.approver_id', 'approval_level_ids.is_current_level')
+    @api.depends_context('uid')
+    def _compute_user_approval_status(self):
         """
-        Compute if current user has a pending approval level for this leave.
-        Used to filter "My Time Off Approvals" view.
+        Compute if current user has a pending approval level for this leave
+        (used to filter "My Time Off Approvals" view) and if they already
+        approved it (used to hide Approve/Refuse buttons in list view).
         
-        IMPORTANT: This field is user-specific and NOT STORED because:
+        IMPORTANT: These fields are user-specific and NOT STORED because:
         - The value is different for each user viewing the same record
-        - Uses self.env.user which changes based on who is logged in
-        - Cannot use @api.depends since value depends on current user, not just record data
+        - Uses self.env.uid which changes based on who is logged in
+        - Values are cached per user (depends_context on uid)
         
         Example:
         - Same leave request (id=464)
@@ -127,51 +266,68 @@ class HrLeave(models.Model):
         - For user 57 (L2 approver): user_has_pending_approval = False
         - This is IMPOSSIBLE with a stored field!
         
-        The _search method below handles filtering in menu domains.
+        Both are read for the whole recordset with one aggregated query on
+        the levels of the current user. The _search method below handles
+        filtering in menu domains.
         """
-        current_user = self.env.user
+        current_user_id = self.env.uid
+        stored = self.filtered(lambda l: isinstance(l.id, int))
+        stats = {}
+        if stored:
+            self.env['leave.approval.level'].flush_model(['leave_id', 'state', 'approver_id', 'is_current_level'])
+            self.env.cr.execute("""
+                SELECT leave_id,
+                       BOOL_OR(state = 'pending' AND is_current_level),
+                       BOOL_OR(state = 'approved')
+                  FROM leave_approval_level
+                 WHERE leave_id = ANY(%s) AND approver_id = %s
+              GROUP BY leave_id
+            """, [stored.ids, current_user_id])
+            stats = {row[0]: row[1:] for row in self.env.cr.fetchall()}
+        
         for leave in self:
-            # Check if current user has a pending approval level
-            user_pending_level = leave.approval_level_ids.filtered(
-                lambda l: l.approver_id == current_user 
-                       and l.state == 'pending' 
-                       and l.is_current_level
-            )
-            leave.user_has_pending_approval = bool(user_pending_level)
+            if leave in stored:
+                has_pending, already_approved = stats.get(leave.id, (False, False))
+            else:
+                levels = leave.approval_level_ids.filtered(lambda l: l.approver_id.id == current_user_id)
+                has_pending = any(l.state == 'pending' and l.is_current_level for l in levels)
+                already_approved = any(l.state == 'approved' for l in levels)
+            leave.user_has_pending_approval = has_pending
+            leave.current_user_already_approved = already_approved
     
     def _search_user_has_pending_approval(self, operator, value):
         """
         Search method for user_has_pending_approval field.
         Allows filtering leaves where current user has pending approval.
-        """
-        current_user = self.env.user
-        
-        # Get all approval levels where current user is approver and state is pending
-        pending_levels = self.env['leave.approval.level'].search([
-            ('approver_id', '=', current_user.id),
-            ('state', '=', 'pending'),
-            ('is_current_level', '=', True)
-        ])
         
-        # Get leave IDs from these levels
-        leave_ids = pending_levels.mapped('leave_id').ids
+        Joins the approver inbox (indexed on the approver) as a subquery,
+        instead of materializing the ids of the pending leaves. The inbox has
+        no record rules, so the leaves are restricted to the allowed
+        companies, as the search on the approval levels was.
+        """
+        domain = [
+            '&',
+            ('approval_inbox_ids.approver_user_id', '=', self.env.user.id),
+            ('employee_company_id', 'in', self.env.companies.ids),
+        ]
         
         # Handle operator
         if (operator == '=' and value) or (operator == '!=' and not value):
-            return [('id', 'in', leave_ids)]
+            return domain
         else:
-            return [('id', 'not in', leave_ids)]
+            return ['!'] + domain
 
-    @api.model
-    def create(self, vals):
-        """Override create to generate approval chain"""
-        leave = super(HrLeave, self).create(vals)
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Override create to generate approval chains for the whole batch"""
+        leaves = super(HrLeave, self).create(vals_list)
         
         # Generate approval levels if using org chart approval
-        if leave.use_orgchart_approval and leave.state == 'confirm':
-            leave._generate_approval_chain()
+        leaves.filtered(
+            lambda l: l.use_orgchart_approval and l.state == 'confirm'
+        )._generate_approval_chain()
         
-        return leave
+        return leaves
 
     def write(self, vals):
         """Override write to handle state changes"""
@@ -179,65 +335,79 @@ class HrLeave(models.Model):
         
         # If state changes to confirm, generate approval chain
         if vals.get('state') == 'confirm':
-            for leave in self:
-                if leave.use_orgchart_approval and not leave.approval_level_ids:
-                    leave._generate_approval_chain()
+            self.filtered(
+                lambda l: l.use_orgchart_approval and not l.approval_level_ids
+            )._generate_approval_chain()
         
         return result
 
     def _generate_approval_chain(self):
-        """Generate approval levels based on organization chart"""
-        self.ensure_one()
+        """
+        Generate approval levels based on organization chart
+        
+        Works on the whole recordset: chains are resolved for every leave
+        first, approver employees are looked up with a single search and
+        all approval levels are inserted with one create() call.
+        """
+        if not self:
+            return
         
-        if self.approval_level_ids:
+        if self.filtered('approval_level_ids'):
             raise UserError(_('Approval chain already generated for this leave request.'))
         
-        # Get the approval chain from organization chart
-        approval_chain = self._get_approval_chain_from_orgchart()
+        # Get the approval chains from organization chart
+        approval_chains = self._get_approval_chains()
         
-        if not approval_chain:
+        if not all(approval_chains[leave.id] for leave in self):
             raise UserError(_(
                 'No approval chain could be determined from organization chart. '
                 'Please ensure the employee has a manager assigned.'
             ))
         
-        # Create approval level records
+        # Resolve approver employees for every chain at once
+        approver_user_ids = {
+            approver.id
+            for chain in approval_chains.values()
+            for approver in chain
+            if not isinstance(approver, tuple)
+        }
+        employee_by_user = self.env['snifx.user.resolver'].get_user_employees(approver_user_ids)
+        # Out-of-office delegations of the approvers, resolved in one go
+        delegations = self.env['leave.approval.delegation'].sudo()._get_delegations(approver_user_ids)
+        # Approvers on time off right now (types skipping absent approvers only)
+        absent_user_ids = set()
+        if any(leave.holiday_status_id.auto_approve_if_manager_absent for leave in self):
+            absent_user_ids = self._get_absent_user_ids(
+                approver_user_ids | {delegate_id for delegate_id, __ in delegations.values()}
+            )
+        
+        # Build approval level values
         # Officers (marked as tuples) are extracted but NOT added to chain
-        ApprovalLevel = self.env['leave.approval.level']
-        current_level = 0
-        officer_ids = []
-        
-        for approver in approval_chain:
-            # Check if this is the officers marker tuple
-            if isinstance(approver, tuple) and approver[0] == 'officers':
-                # Extract officer IDs for later notification
-                officer_ids = approver[1]
-                _logger.info(f"Officers will receive FYI notification: {officer_ids}")
-                continue  # Skip - don't add to approval levels
+        vals_list = []
+        auto_approved = {leave.id: [] for leave in self}
+        auto_skipped = {leave.id: [] for leave in self}
+        now = fields.Datetime.now()
+        
+        for leave in self:
+            current_level = 0
+            # Levels are activated now until the first one needing an action:
+            # only those are skipped when their approver is absent, later
+            # levels are checked when they are activated
+            activating = leave.holiday_status_id.auto_approve_if_manager_absent
             
-            # Check if this is an officer (old format - shouldn't happen now)
-            if isinstance(approver, tuple):
-                user, role = approver
-                # All officers share the same level
-                if officer_level is None:
-                    current_level += 1
-                    officer_level = current_level
-                ApprovalLevel.create({
-                    'leave_id': self.id,
-                    'level': officer_level,
-                    'approver_id': user.id,
-                    'state': 'pending',
-                })
-            else:
+            for approver in approval_chains[leave.id]:
+                # Check if this is the officers marker tuple
+                if isinstance(approver, tuple):
+                    _chain_tracer.debug("Officers will receive FYI notification: %s", approver[1])
+                    continue  # Skip - don't add to approval levels
+                
                 # Regular approver - increment level
                 current_level += 1
                 
                 # Check if this is self-approval with auto-approve enabled
-                approver_employee = self.env['hr.employee'].search([
-                    ('user_id', '=', approver.id)
-                ], limit=1)
+                approver_employee = employee_by_user.get(approver.id)
                 
-                is_self_approval = (approver_employee and approver_employee.id == self.employee_id.id)
+                is_self_approval = (approver_employee and approver_employee.id == leave.employee_id.id)
                 # Use sudo() to bypass security check (field has groups restriction)
                 has_auto_approve = (approver_employee and approver_employee.sudo().auto_approve_as_top_management)
                 
@@ -245,48 +415,97 @@ class HrLeave(models.Model):
                 # 1. This is self-approval (employee submitting their own leave)
                 # 2. AND employee has auto-approve enabled
                 if is_self_approval and has_auto_approve:
-                    # Auto-approve for employees with auto-approve enabled
-                    _logger.info(f"✅ Auto-approving Level {current_level}: {approver.name} (Auto-approve enabled)")
-                    approval_level = ApprovalLevel.create({
-                        'leave_id': self.id,
+                    _chain_tracer.info("✅ Auto-approving Level %s of leave %s: %s (Auto-approve enabled)",
+                                       current_level, leave.id, lambda: approver.name)
+                    auto_approved[leave.id].append((current_level, approver))
+                    vals_list.append({
+                        'leave_id': leave.id,
                         'level': current_level,
                         'approver_id': approver.id,
                         'state': 'approved',  # Auto-approved!
-                        'action_date': fields.Datetime.now(),
+                        'action_date': now,
                         'comments': 'Auto-approved: Self-approval with auto-approve setting enabled',
                     })
-                    
-                    # Post message in chatter
-                    self.message_post(
-                        body=_('Level %s auto-approved: %s (Auto-approve setting enabled)') % (current_level, approver.name),
-                        subtype_xmlid='mail.mt_note'
-                    )
                 else:
                     # Normal approval (requires manual action)
-                    ApprovalLevel.create({
-                        'leave_id': self.id,
+                    vals = {
+                        'leave_id': leave.id,
                         'level': current_level,
                         'approver_id': approver.id,
                         'state': 'pending',
-                    })
+                    }
+                    # Approver out of office: assign to the delegate
+                    # (never to the requester)
+                    delegate_id, delegation_id = delegations.get(approver.id, (False, False))
+                    if delegate_id and delegate_id != leave.employee_id.user_id.id:
+                        vals.update({
+                            'approver_id': delegate_id,
+                            'original_approver_id': approver.id,
+                            'delegated_to_id': delegate_id,
+                            'delegation_id': delegation_id,
+                        })
+                    # Approver on time off: skip the level (type setting)
+                    if activating and vals['approver_id'] in absent_user_ids:
+                        _chain_tracer.info("⏭️ Skipping Level %s of leave %s: approver %s is absent",
+                                           current_level, leave.id, vals['approver_id'])
+                        auto_skipped[leave.id].append((current_level, approver))
+                        vals.update({
+                            'state': 'skipped',
+                            'action_date': now,
+                            'comments': 'Auto-skipped: approver on time off',
+                        })
+                    else:
+                        activating = False
+                    vals_list.append(vals)
+        
+        levels = self.env['leave.approval.level'].create(vals_list)
+        
+        pending_by_leave = {}
+        for level in levels:
+            if level.state == 'pending':
+                pending_by_leave.setdefault(level.leave_id.id, level)
+        
+        for leave in self:
+            leave._post_approval_chain_generated(
+                approval_chains[leave.id],
+                auto_approved[leave.id],
+                pending_by_leave.get(leave.id),
+                auto_skipped=auto_skipped[leave.id],
+            )
+
+    def _post_approval_chain_generated(self, approval_chain, auto_approved, first_pending_level,
+                                       auto_skipped=()):
+        """Notify and log once the approval levels of this leave are created"""
+        self.ensure_one()
+        
+        # Post message in chatter for every auto-approved level
+        for level, approver in auto_approved:
+            self.message_post(
+                body=_('Level %s auto-approved: %s (Auto-approve setting enabled)') % (level, approver.name),
+                subtype_xmlid='mail.mt_note'
+            )
+        for level, approver in auto_skipped:
+            self.message_post(
+                body=_('Level %s skipped: %s is on time off') % (level, approver.name),
+                subtype_xmlid='mail.mt_note'
+            )
         
         # Send notification to first PENDING level (skip auto-approved levels)
-        first_pending_level = self.approval_level_ids.filtered(lambda l: l.state == 'pending').sorted('level')
         if first_pending_level:
-            first_pending_level[0]._send_notification()
-            _logger.info(f"📧 Notification sent to Level {first_pending_level[0].level}: {first_pending_level[0].approver_id.name}")
+            first_pending_level._send_notification()
+            _chain_tracer.debug("📧 Notification sent to Level %s: %s",
+                                first_pending_level.level, lambda: first_pending_level.approver_id.name)
         else:
-            _logger.info("ℹ️ No pending levels - all levels auto-approved")
+            _chain_tracer.debug("ℹ️ No pending levels - all levels auto-approved")
         
         # Post message with auto-approval info
-        total_levels = len([a for a in approval_chain if not (isinstance(a, tuple) and a[0] == 'officers')])
-        auto_approved_count = self.approval_level_ids.filtered(lambda l: l.state == 'approved').mapped('level')
+        total_levels = len([a for a in approval_chain if not isinstance(a, tuple)])
         
-        if auto_approved_count:
+        if auto_approved:
             self.message_post(
                 body=_('Approval chain generated: %s levels (%s auto-approved for top management)') % (
                     total_levels, 
-                    len(auto_approved_count)
+                    len(auto_approved)
                 ),
                 subtype_xmlid='mail.mt_comment'
             )
@@ -297,8 +516,8 @@ class HrLeave(models.Model):
             )
         
         # CRITICAL: If all levels are auto-approved, approve the leave immediately
-        if not first_pending_level and auto_approved_count:
-            _logger.info("✅ All approval levels auto-approved - approving leave automatically")
+        if not first_pending_level and (auto_approved or auto_skipped):
+            _chain_tracer.debug("✅ All approval levels auto-approved - approving leave automatically")
             # All levels approved, mark leave as approved
             self.write({
                 'state': 'validate',  # Approved state
@@ -307,12 +526,179 @@ class HrLeave(models.Model):
                 body=_('Time off request automatically approved (all approval levels auto-approved)'),
                 subtype_xmlid='mail.mt_comment'
             )
-            _logger.info(f"✅ Leave {self.id} auto-approved successfully")
+            _chain_tracer.info("✅ Leave %s auto-approved successfully", self.id)
+
+    def _get_approval_chains(self):
+        """
+        Get the approval chain of every leave in the recordset
+        
+        Chains are resolved from cached templates (see
+        _get_approval_chain_template), with the cache token read once for the
+        batch. The manager ancestry needed by the templates not cached yet is
+        read from the hierarchy closure table with a single query.
+        
+        Returns dict {leave_id: list of approvers} (see _get_approval_chain_from_orgchart)
+        """
+        ancestors = self.env['hr.employee.hierarchy'].sudo()._get_ancestors(
+            set(self.employee_id.ids)
+        )
+        token = APPROVAL_CHAIN_CACHE.token(self.env)
+        approval_chains = {
+            leave.id: leave._get_approval_chain_from_orgchart(
+                ancestors=ancestors.get(leave.employee_id.id, []),
+                token=token,
+            )
+            for leave in self
+        }
+        _chain_tracer.info("Approval chains resolved for %s leave(s)", len(self))
+        return approval_chains
 
-    def _get_approval_chain_from_orgchart(self):
+    def _get_approval_chain_from_orgchart(self, ancestors=None, token=None):
         """
         Get list of approvers from organization chart
         
+        See _build_approval_chain for the rules. The HR Manager is picked
+        with the leave type selection strategy (see _get_hr_manager).
+        
+        :param ancestors: optional preloaded [(manager_id, manager_user_id), ...]
+            of the employee, from the direct manager upwards
+            (see hr.employee.hierarchy._get_ancestors)
+        :param token: optional token of the template cache, read once per batch
+        
+        Returns list of res.users in order of approval
+        """
+        self.ensure_one()
+        
+        employee = self.employee_id.sudo()
+        template = self._get_approval_chain_template(
+            employee.id,
+            self.holiday_status_id.id,
+            self.company_id.id,
+            self._get_department_approval_mode(employee),
+            ancestors=ancestors,
+            token=token,
+        )
+        return self._resolve_approval_chain(template, self._get_hr_manager)
+
+    @api.model
+    def _get_department_approval_mode(self, employee):
+        """Return 'simple' or 'orgchart' depending on the employee's department"""
+        department = employee.department_id
+        return 'simple' if department and not department.use_orgchart_approval else 'orgchart'
+
+    @api.model
+    def _get_approval_chain_template(self, employee_id, leave_type_id, company_id, approval_mode,
+                                     ancestors=None, token=None, subordinate_user_ids=None):
+        """
+        Get the cached approval chain template of an employee for a leave type
+        
+        Employees under the same manager mostly share the same approvers, so
+        templates are memoized instead of rebuilt for every leave. They are
+        kept in a worker-local LRU (APPROVAL_CHAIN_CACHE), invalidated in
+        every worker when an input changes: employee hierarchy, users and
+        smart detection override, department approval mode, officers and
+        head, leave type approval flags, top management roster.
+        
+        :param ancestors: optional preloaded ancestry of the employee, only
+            used when the template is not cached yet (not part of the key)
+        :param token: optional token of the cache, read once per batch
+        :param subordinate_user_ids: optional preloaded subordinate users of
+            the employee (see _get_subordinate_approver_user_ids), only used
+            when the template is not cached yet (not part of the key)
+        :return: tuple of entries, see _build_approval_chain
+        """
+        def build():
+            employee_ancestors = ancestors
+            if employee_ancestors is None:
+                employee_ancestors = self.env['hr.employee.hierarchy'].sudo()._get_ancestors(
+                    [employee_id]
+                )[employee_id]
+            return tuple(self._build_approval_chain(
+                self.env['hr.employee'].sudo().browse(employee_id),
+                self.env['hr.leave.type'].sudo().browse(leave_type_id),
+                employee_ancestors,
+                self.env['res.company'].browse(company_id),
+                subordinate_user_ids=subordinate_user_ids,
+            ))
+        
+        key = (employee_id, leave_type_id, company_id or False, approval_mode)
+        return APPROVAL_CHAIN_CACHE.get(self.env, key, build, token=token)
+
+    @api.model
+    def _get_subordinate_approver_user_ids(self, employees):
+        """
+        Users below each employee who could be skipped as subordinates
+        
+        Only the candidates checked by _build_approval_chain are looked up
+        (department heads of the employees and HR managers), for all the
+        employees with one closure table query.
+        
+        :param employees: hr.employee records
+        :return: dict {employee_id: frozenset of res.users ids}
+        """
+        candidate_user_ids = (
+            set(employees.sudo().department_id.manager_id.user_id.ids) | self._get_hr_manager_user_ids()
+        )
+        candidates = self.env['hr.employee'].sudo().with_context(active_test=False).search([
+            ('user_id', 'in', list(candidate_user_ids)),
+        ]) if candidate_user_ids else self.env['hr.employee']
+        user_by_employee = {candidate.id: candidate.user_id.id for candidate in candidates}
+        result = {employee_id: set() for employee_id in employees.ids}
+        pairs = self.env['hr.employee.hierarchy'].sudo()._get_subordinate_pairs(
+            employees.ids, list(user_by_employee)
+        )
+        for ancestor_id, employee_id in pairs:
+            result[ancestor_id].add(user_by_employee[employee_id])
+        return {employee_id: frozenset(user_ids) for employee_id, user_ids in result.items()}
+
+    @api.model
+    def _invalidate_approval_chain_templates(self):
+        """Invalidate the cached approval chain templates in every worker"""
+        APPROVAL_CHAIN_CACHE.invalidate(self.env)
+
+    @api.model
+    def _resolve_approval_chain(self, template, get_hr_manager):
+        """
+        Turn an approval chain template into approvers
+        
+        :param template: entries of _build_approval_chain
+        :param get_hr_manager: callable taking the ids of the users that cannot
+            be the HR Manager, returning the HR Manager user or False
+        
+        Returns list of res.users in order of approval, with an
+        ('officers', [user ids]) marker for FYI officers. A user appears once,
+        at its first position: the HR Manager keeps its place and a later
+        entry for the same user (e.g. top management) is dropped.
+        """
+        Users = self.env['res.users']
+        seen_ids = set()
+        approvers = []
+        for kind, value in template:
+            if kind == 'user':
+                if value not in seen_ids:
+                    seen_ids.add(value)
+                    approvers.append(Users.browse(value))
+            elif kind == 'hr_manager':
+                # value = users skipped as subordinates of the employee
+                excluded_ids = seen_ids.union(value or ())
+                hr_manager = get_hr_manager(excluded_ids)
+                if hr_manager and hr_manager.id not in excluded_ids:
+                    seen_ids.add(hr_manager.id)
+                    approvers.append(hr_manager)
+            elif kind == 'officers':
+                approvers.append(('officers', list(value)))  # Tuple marker
+        return approvers
+
+    @api.model
+    def _build_approval_chain(self, employee, leave_type, ancestors, company, subordinate_user_ids=None):
+        """
+        Build the approval chain template of an employee for a leave type
+        
+        Works only on preloaded data, so it can be run for many employees
+        without creating (virtual) leave records. The HR Manager depends on
+        the load of each HR manager at submission time, so it is left as a
+        placeholder resolved by _resolve_approval_chain.
+        
         Two Modes:
         1. Organization Chart Mode (use_orgchart_approval = True):
            - Smart Detection based on subordinates
@@ -323,128 +709,122 @@ class HrLeave(models.Model):
            - Direct manager only (1 level)
            - No org chart hierarchy lookup
         
-        Returns list of res.users in order of approval
-        """
-        self.ensure_one()
+        :param employee: hr.employee record (sudo, fields are group restricted)
+        :param leave_type: hr.leave.type record
+        :param ancestors: [(manager_id, manager_user_id), ...] of the employee,
+            from the direct manager upwards
+        :param company: res.company of the leave (top management roster)
+        :param subordinate_user_ids: optional preloaded users below the
+            employee, at least the department head and HR managers among them
+            (read from the closure table otherwise)
         
+        Returns list of entries in order of approval:
+        ('user', user id), ('hr_manager', (skipped user ids)) placeholder
+        and ('officers', (user ids)) for FYI officers
+        """
         approvers = []
-        leave_type = self.holiday_status_id
-        employee_dept = self.employee_id.department_id
+        employee_dept = employee.department_id
+        
+        # Approvers below the employee in the org chart are skipped (type
+        # setting); subordinates are read once from the closure table and
+        # only used while building, never stored in the template
+        skipped_user_ids = frozenset()
+        if leave_type.skip_manager_if_subordinate:
+            if subordinate_user_ids is None:
+                subordinate_user_ids = self.env['hr.employee.hierarchy'].sudo()._get_subordinate_user_ids(
+                    employee.id
+                )
+            skipped_user_ids = frozenset(subordinate_user_ids)
         
         # CHECK DEPARTMENT APPROVAL MODE
         # ==============================
         if employee_dept and not employee_dept.use_orgchart_approval:
             # SIMPLE MODE: Direct manager only
-            _logger.info(f"📋 SIMPLE MODE: Department '{employee_dept.name}' uses direct manager approval only")
+            _chain_tracer.debug("📋 SIMPLE MODE: Department %s uses direct manager approval only",
+                                lambda: employee_dept.name)
             
-            direct_manager = self.employee_id.parent_id
-            if direct_manager and direct_manager.user_id:
-                approvers.append(direct_manager.user_id)
-                _logger.info(f"✅ Added direct manager: {direct_manager.name}")
+            direct_manager_id, direct_manager_user_id = ancestors[0] if ancestors else (False, False)
+            if direct_manager_user_id:
+                approvers.append(('user', direct_manager_user_id))
+                _chain_tracer.debug("Added direct manager: employee %s", direct_manager_id)
             else:
-                _logger.warning(f"⚠️ No direct manager found for {self.employee_id.name}")
+                _chain_tracer.warning("⚠️ No direct manager found for %s", lambda: employee.name)
             
         else:
             # ORGANIZATION CHART MODE: Smart Detection
-            _logger.info(f"🔍 ORG CHART MODE: Using smart detection for {self.employee_id.name}")
             
             # STEP 1: SMART DETECTION - Determine required levels
             # ====================================================
-            subordinates_count = self.env['hr.employee'].search_count([
-                ('parent_id', '=', self.employee_id.id)
-            ])
-            
-            # Check if employee has force single level override
-            # Use sudo() to bypass security check (field has groups restriction)
-            if self.employee_id.sudo().force_single_approval_level:
+            if employee.force_single_approval_level:
                 # OVERRIDE: Force single approval level
                 required_levels = 1
-                _logger.info(f"⚙️ OVERRIDE: {self.employee_id.name} has 'Force Single Approval Level' enabled → 1 approval level")
-            elif subordinates_count > 0:
+                _chain_tracer.debug("⚙️ OVERRIDE: employee %s forces a single approval level", employee.id)
+            elif employee.direct_subordinate_count > 0:
                 # Has team = Manager level
                 required_levels = 1
-                _logger.info(f"🔍 SMART DETECTION: {self.employee_id.name} is a MANAGER "
-                            f"({subordinates_count} subordinates) → 1 approval level")
+                _chain_tracer.debug("🔍 SMART DETECTION: employee %s is a MANAGER → 1 approval level", employee.id)
             else:
                 # No team = Staff level
                 required_levels = 2
-                _logger.info(f"🔍 SMART DETECTION: {self.employee_id.name} is STAFF "
-                            f"(no subordinates) → 2 approval levels")
+                _chain_tracer.debug("🔍 SMART DETECTION: employee %s is STAFF → 2 approval levels", employee.id)
             
             # STEP 2: Build approval chain from org chart
             # ============================================
-            current_employee = self.employee_id
+            # Managers come from the closure table, direct manager first
             level = 0
             
-            _logger.info(f"Building approval chain for {self.employee_id.name}")
-            _logger.info(f"Required org chart levels: {required_levels}")
-            
-            while current_employee and level < required_levels:
-                # Get direct manager
-                manager = current_employee.parent_id
-                
-                if not manager:
-                    _logger.info(f"No manager found at level {level + 1}, stopping")
+            for manager_id, manager_user_id in ancestors:
+                if level >= required_levels:
                     break
                 
                 # Check if manager has a user account
-                if manager.user_id:
-                    if manager.user_id not in approvers:
-                        approvers.append(manager.user_id)
+                if manager_user_id:
+                    if ('user', manager_user_id) not in approvers:
+                        approvers.append(('user', manager_user_id))
                         level += 1
-                        _logger.info(f"Added Level {level}: {manager.name} (from org chart)")
+                        _chain_tracer.debug("Added Level %s: employee %s (from org chart)", level, manager_id)
                 else:
-                    _logger.warning(f"Manager {manager.name} has no user account, skipping")
-                
-                # Move up one level for next iteration
-                current_employee = manager
+                    _chain_tracer.debug("Manager employee %s has no user account, skipping", manager_id)
             
-            _logger.info(f"Total org chart approvers added: {len(approvers)}")
+            if level < required_levels:
+                _chain_tracer.debug("No manager found at level %s, stopping", level + 1)
         
         # STEP 3: Add optional approvers (NOT counted in levels)
         # ======================================================
         
         # Add Department Head (if enabled and not already in chain)
         if leave_type.require_department_head_approval:
-            if self.employee_id.department_id and self.employee_id.department_id.manager_id:
-                dept_head = self.employee_id.department_id.manager_id
-                if dept_head.user_id and dept_head.user_id not in approvers:
-                    approvers.append(dept_head.user_id)
-                    _logger.info(f"Added Department Head: {dept_head.name}")
+            dept_head_user = employee_dept.manager_id.user_id
+            if dept_head_user.id in skipped_user_ids:
+                _chain_tracer.debug("Department Head user %s is a subordinate, skipping", dept_head_user.id)
+            elif dept_head_user and ('user', dept_head_user.id) not in approvers:
+                approvers.append(('user', dept_head_user.id))
+                _chain_tracer.debug("Added Department Head: user %s", dept_head_user.id)
         
-        # Add HR Manager (if enabled and not already in chain)
+        # Add HR Manager placeholder (if enabled), with the subordinates that
+        # could be picked as HR Manager (the template follows the group)
         if leave_type.require_hr_approval:
-            hr_manager = self._get_hr_manager()
-            if hr_manager and hr_manager not in approvers:
-                approvers.append(hr_manager)
-                _logger.info(f"Added HR Manager: {hr_manager.name}")
+            skipped_hr_manager_ids = skipped_user_ids & self._get_hr_manager_user_ids()
+            approvers.append(('hr_manager', tuple(sorted(skipped_hr_manager_ids))))
         
         # Add Time Off Officers (if enabled and not already in chain)
         # NOTE: Officers are NOT added to approval chain - they only get FYI notification
         # Leave is approved after manager levels complete
-        officer_ids = []
+        # STRICT MODE: only officers of the employee's department, no fallback
         if leave_type.require_officer_final_approval:
-            officers = self._get_time_off_officer()
-            if officers:
-                # Store officer IDs for later notification
-                officer_ids = [o.id for o in officers]
-                _logger.info(f"Found {len(officers)} Time Off Officers for FYI notification: {[u.name for u in officers]}")
-            else:
-                _logger.warning("No Time Off Officers found")
-        
-        # Store in approvers list as marker (will be filtered out during level creation)
-        if officer_ids:
-            approvers.append(('officers', officer_ids))  # Tuple marker
+            officer_ids = employee_dept.notification_officer_ids.ids
+            if officer_ids:
+                # Stored as marker (will be filtered out during level creation)
+                approvers.append(('officers', tuple(officer_ids)))
+                _chain_tracer.debug("Found %s Time Off Officers for FYI notification", len(officer_ids))
         
         # Add Top Management (if enabled)
+        # Root employees of the org chart, so never subordinates of the employee
         if leave_type.require_top_management:
-            top_managers = self._get_top_management()
-            for manager in top_managers:
-                if manager not in approvers:
-                    approvers.append(manager)
-                    _logger.info(f"Added Top Management: {manager.name}")
-        
-        _logger.info(f"Final approval chain has {len(approvers)} approvers")
+            for manager in self._get_top_management_users(company, leave_type):
+                if ('user', manager.id) not in approvers:
+                    approvers.append(('user', manager.id))
+                    _chain_tracer.debug("Added Top Management: user %s", manager.id)
         
         return approvers
     
@@ -473,18 +853,21 @@ class HrLeave(models.Model):
             if dept_officers:
                 # Department has assigned officers - use them ALL (no limit)
                 officers = list(dept_officers)
-                _logger.info(f"✅ Using department officers for {self.employee_id.department_id.name}: "
-                           f"{[u.name for u in officers]}")
+                _officer_tracer.debug("✅ Using department officers for %s: %s",
+                                      lambda: self.employee_id.department_id.name,
+                                      lambda: [u.name for u in officers])
                 return officers
             else:
                 # Department has NO officers - return empty (NO notification sent!)
-                _logger.info(f"ℹ️ Department {self.employee_id.department_id.name} has no assigned officers. "
-                           f"No officer notification will be sent (STRICT MODE - no fallback).")
+                _officer_tracer.debug("ℹ️ Department %s has no assigned officers. "
+                                      "No officer notification will be sent (STRICT MODE - no fallback).",
+                                      lambda: self.employee_id.department_id.name)
                 return []
         else:
             # Employee has no department - return empty (NO notification sent!)
-            _logger.info(f"ℹ️ Employee {self.employee_id.name} has no department. "
-                       f"No officer notification will be sent (STRICT MODE).")
+            _officer_tracer.debug("ℹ️ Employee %s has no department. "
+                                  "No officer notification will be sent (STRICT MODE).",
+                                  lambda: self.employee_id.name)
             return []
     
     # NOTE: STRICT MODE - No fallback methods!
@@ -493,35 +876,108 @@ class HrLeave(models.Model):
     # - Empty department = No notification
     # This gives full per-department control to administrators
 
-    def _get_hr_manager(self):
-        """Get HR Manager user"""
-        # Method 1: Get user with HR Manager group (most reliable)
+    @api.model
+    def _get_hr_manager_user_ids(self):
+        """Ids of the Time Off Administrators, who can be picked as HR Manager"""
+        group = self.env.ref('hr_holidays.group_hr_holidays_manager', raise_if_not_found=False)
+        return frozenset(group.sudo().users.ids) if group else frozenset()
+
+    @api.model
+    def _invalidate_if_hr_managers_changed(self, hr_manager_ids):
+        """Invalidate the chain templates when the Time Off Administrators changed"""
+        if self._get_hr_manager_user_ids() != hr_manager_ids:
+            self._invalidate_approval_chain_templates()
+
+    def _get_hr_manager(self, excluded_ids=()):
+        """
+        Get HR Manager user according to the leave type selection strategy
+        
+        Pending counts are counted once per transaction (see
+        _get_hr_manager_pending_counts), so a batch of leaves is spread over
+        the HR managers deterministically.
+        
+        :param excluded_ids: ids of users already in the chain or skipped;
+            'least_pending' picks the least loaded HR manager among the
+            others, the other strategies may return an excluded user (not
+            added to the chain by _resolve_approval_chain)
+        :return: res.users record, or False
+        """
         try:
             hr_managers = self.env.ref('hr_holidays.group_hr_holidays_manager').users
-            if hr_managers:
-                _logger.info(f"HR Manager from group: {hr_managers[0].name}")
-                return hr_managers[0]  # Return first HR manager
-        except Exception as e:
+        except ValueError as e:
             _logger.warning(f"Could not get HR Manager from group: {e}")
+            return False
+        
+        if not hr_managers:
+            return False
+        
+        strategy = self.holiday_status_id.hr_manager_selection or 'first'
+        
+        if strategy == 'round_robin':
+            hr_manager = hr_managers.sorted('id')[(self._origin.id or 0) % len(hr_managers)]
+        elif strategy == 'least_pending':
+            counts = self._get_hr_manager_pending_counts(hr_managers)
+            candidates = hr_managers.filtered(lambda user: user.id not in excluded_ids)
+            if not candidates:
+                return False
+            hr_manager = min(candidates, key=lambda user: (counts[user.id], user.id))
+            # The level is only created later in the batch, count it right away
+            counts[hr_manager.id] += 1
+        else:
+            hr_manager = hr_managers[0]
         
-        return False
+        _chain_tracer.debug("HR Manager (%s): %s", strategy, lambda: hr_manager.name)
+        return hr_manager
+
+    def _get_hr_manager_pending_counts(self, hr_managers):
+        """
+        Return the pending level count of each HR manager for this transaction
+        
+        Counted once with a grouped query on the pending levels, then
+        incremented in memory by _get_hr_manager for each assignment made in
+        the same transaction.
+        """
+        cr = self.env.cr
+        counts = cr.cache.get(HR_MANAGER_COUNTS_KEY)
+        if counts is None:
+            counts = cr.cache[HR_MANAGER_COUNTS_KEY] = {}
+            cr.postcommit.add(lambda: cr.cache.pop(HR_MANAGER_COUNTS_KEY, None))
+            cr.postrollback.add(lambda: cr.cache.pop(HR_MANAGER_COUNTS_KEY, None))
+        
+        missing = [user_id for user_id in hr_managers.ids if user_id not in counts]
+        if missing:
+            counts.update(dict.fromkeys(missing, 0))
+            counts.update(
+                (approver.id, count)
+                for approver, count in self.env['leave.approval.level'].sudo()._read_group(
+                    [('approver_id', 'in', missing), ('state', '=', 'pending')],
+                    ['approver_id'],
+                    ['__count'],
+                )
+            )
+        return counts
 
     def _get_top_management(self):
-        """Get top management users (CEO, CFO, etc.)"""
-        top_managers = []
+        """Get top management users (CEO, CFO, etc.) of this leave"""
+        self.ensure_one()
+        return self._get_top_management_users(self.company_id, self.holiday_status_id)
+
+    @api.model
+    def _get_top_management_users(self, company, leave_type):
+        """
+        Get top management users of a company for a leave type
         
-        # Get employees at top of org chart (no parent)
-        top_employees = self.env['hr.employee'].search([
-            ('parent_id', '=', False),
-            ('user_id', '!=', False),
-            ('company_id', '=', self.company_id.id)
-        ])
+        Reads the cached roster of the company (root employees of the org
+        chart, see hr.employee._get_top_management_roster), capped by the
+        leave type setting.
+        """
+        user_ids = self.env['hr.employee']._get_top_management_roster(company.id)
         
-        for employee in top_employees:
-            if employee.user_id:
-                top_managers.append(employee.user_id)
+        limit = leave_type.top_management_limit
+        if limit > 0:
+            user_ids = user_ids[:limit]
         
-        return top_managers
+        return list(self.env['res.users'].browse(user_ids))
 
 
     def _notify_officers_fyi(self, officer_ids=None):
@@ -542,12 +998,12 @@ class HrLeave(models.Model):
                 officer_ids = [o.id for o in officers] if officers else []
         
         if not officer_ids:
-            _logger.info("No officers selected for notification")
+            _officer_tracer.debug("No officers selected for notification")
             return
         
         # Get selected officers
         officers = self.env['res.users'].browse(officer_ids)
-        _logger.info(f"Officers selected in department: {officers.mapped('name')}")
+        _officer_tracer.debug("Officers selected in department: %s", lambda: officers.mapped('name'))
         
         # CRITICAL FILTER: Only officers with Snifx group
         try:
@@ -559,8 +1015,8 @@ class HrLeave(models.Model):
             # Log filtering results
             filtered_out = officers - snifx_officers
             if filtered_out:
-                _logger.info(f"Filtered out non-Snifx officers (don't have 'Officer: Manage Department Requests' group): "
-                           f"{filtered_out.mapped('name')}")
+                _officer_tracer.info("Filtered out non-Snifx officers (don't have 'Officer: Manage Department Requests' group): %s",
+                                     lambda: filtered_out.mapped('name'))
             
             if not snifx_officers:
                 _logger.warning(f"No officers with Snifx group found! "
@@ -568,7 +1024,8 @@ class HrLeave(models.Model):
                               f"but none have 'Officer: Manage Department Requests' group.")
                 return
             
-            _logger.info(f"Sending notifications to Snifx officers only: {snifx_officers.mapped('name')}")
+            _officer_tracer.debug("Sending notifications to Snifx officers only: %s",
+                                  lambda: snifx_officers.mapped('name'))
             
         except Exception as e:
             _logger.error(f"Error filtering Snifx officers: {e}")
@@ -578,7 +1035,8 @@ class HrLeave(models.Model):
         for officer in snifx_officers:
             try:
                 # Post message to notify officer
-                self.message_post(
+                # (queued notification mail, not sent during the approval)
+                self.with_context(mail_notify_force_send=False).message_post(
                     body=_('Time Off Approved - FYI<br/>'
                           'Leave for <strong>%s</strong> has been approved.<br/>'
                           'Type: %s<br/>'
@@ -607,7 +1065,7 @@ class HrLeave(models.Model):
                     _logger.debug(f"Activity creation failed for {officer.name}: {activity_error}")
                     pass  # Activity is optional, message is primary
                 
-                _logger.info(f"✅ Sent FYI notification to Snifx officer: {officer.name}")
+                _officer_tracer.info("✅ Sent FYI notification to Snifx officer: %s", lambda: officer.name)
             except Exception as e:
                 _logger.error(f"❌ Could not send FYI to {officer.name}: {e}")
 
@@ -629,88 +1087,95 @@ class HrLeave(models.Model):
         return super(HrLeave, self).action_validate(*args, **kwargs)
     
     def _check_approval_completion(self):
-        """Check if all approval levels are complete"""
-        self.ensure_one()
-        
-        _logger.info(f"=== _check_approval_completion called for leave {self.id} ===")
+        """Check if all approval levels are complete, for every leave of the recordset"""
+        for leave in self:
+            _approval_tracer.debug("=== _check_approval_completion called for leave %s ===", leave.id)
         
-        if not self.use_orgchart_approval:
-            _logger.info(f"  Leave {self.id} does not use orgchart approval, skipping")
-            return
+            if not leave.use_orgchart_approval:
+                _approval_tracer.debug("  Leave %s does not use orgchart approval, skipping", leave.id)
+                continue
         
-        # Log all approval levels state
-        _logger.info(f"  Checking approval levels for leave {self.id}:")
-        for level in self.approval_level_ids:
-            _logger.info(f"    Level {level.level}: {level.approver_id.name} - State: {level.state}")
+            # Log all approval levels state (no approver reads unless traced)
+            if _approval_tracer.is_enabled():
+                for level in leave.approval_level_ids:
+                    _approval_tracer.debug("    Level %s: %s - State: %s",
+                                           level.level, lambda: level.approver_id.name, level.state)
         
-        # Check if all levels are approved or skipped
-        all_approved = all(
-            level.state in ['approved', 'skipped']
-            for level in self.approval_level_ids
-        )
+            # Check if all levels are approved or skipped
+            all_approved = all(
+                level.state in ['approved', 'skipped']
+                for level in leave.approval_level_ids
+            )
         
-        _logger.info(f"  All levels approved? {all_approved}")
+            _approval_tracer.debug("  All levels approved? %s", all_approved)
         
-        if all_approved:
-            _logger.info(f"  ✅ ALL LEVELS APPROVED! Calling action_validate() for leave {self.id}")
-            # All levels approved - approve the leave
-            # Use sudo to bypass standard manager validation
-            # since we have our own approval chain
-            self.sudo().action_validate()
+            if all_approved:
+                _approval_tracer.info("✅ ALL LEVELS APPROVED! Calling action_validate() for leave %s", leave.id)
+                # All levels approved - approve the leave
+                # Use sudo to bypass standard manager validation
+                # since we have our own approval chain
+                leave.sudo().action_validate()
             
-            # Send FYI notification to officers
-            # Get officer IDs from approval chain context
-            officer_ids = []
-            for level_record in self.approval_level_ids:
-                # Officers should be stored somewhere - for now get from config
-                pass
+                # Send FYI notification to officers
+                # Get officer IDs from approval chain context
+                officer_ids = []
+                for level_record in leave.approval_level_ids:
+                    # Officers should be stored somewhere - for now get from config
+                    pass
             
-            # Call with officer IDs
-            self._notify_officers_fyi(officer_ids=None)  # Will auto-detect from config
+                # Call with officer IDs
+                leave._notify_officers_fyi(officer_ids=None)  # Will auto-detect from config
             
-            # Post message
-            try:
-                self.sudo().message_post(
-                    body=_('All approval levels completed. Leave request approved.'),
-                    subtype_xmlid='mail.mt_comment'
-                )
-            except Exception as e:
-                _logger.warning(f"Could not post completion message: {e}")
+                # Post message
+                try:
+                    leave.sudo().message_post(
+                        body=_('All approval levels completed. Leave request approved.'),
+                        subtype_xmlid='mail.mt_comment'
+                    )
+                except Exception as e:
+                    _logger.warning(f"Could not post completion message: {e}")
             
-            # Notify employee
-            self._send_approval_notification_to_employee()
-        else:
-            _logger.info(f"  ⏳ NOT all levels approved yet. Waiting for remaining approvals.")
-            pending_levels = self.approval_level_ids.filtered(lambda l: l.state == 'pending')
-            for level in pending_levels:
-                _logger.info(f"    Pending: Level {level.level} - {level.approver_id.name}")
+                # Notify employee
+                leave._send_approval_notification_to_employee()
+            else:
+                _approval_tracer.debug("  ⏳ Leave %s: NOT all levels approved yet. Waiting for remaining approvals.",
+                                       leave.id)
 
     def _send_approval_notification_to_employee(self):
         """Send notification to employee that leave is approved"""
         self.ensure_one()
         
         template = self.env.ref(
-            'hr_leave_orgchart_approval.email_template_leave_approved',
+            'snifx_hr_leave_orgchart_approval.email_template_leave_approved',
             raise_if_not_found=False
         )
         
         if template and self.employee_id.user_id:
-            template.send_mail(self.id, force_send=True)
+            self.env['snifx.mail.outbox'].enqueue(template, self.ids)
 
-    def action_approve(self):
-        """Override to use approval levels"""
-        if self.use_orgchart_approval:
-            # Find current level and approve it
-            current_level = self.approval_level_ids.filtered(
+    def action_approve(self, *args, **kwargs):
+        """Override to use approval levels (supports recordsets)"""
+        orgchart_leaves = self.filtered('use_orgchart_approval')
+        
+        # Find current level of every leave and approve them together
+        current_levels = self.env['leave.approval.level']
+        for leave in orgchart_leaves:
+            current_level = leave.approval_level_ids.filtered(
                 lambda l: l.is_current_level and l.state == 'pending'
             )
-            if current_level:
-                return current_level[0].action_approve()
-            else:
+            if not current_level:
                 raise UserError(_('No pending approval level found.'))
-        else:
-            # Use standard approval
-            return super(HrLeave, self).action_approve()
+            current_levels |= current_level[0]
+        
+        result = True
+        if current_levels:
+            result = current_levels.action_approve()
+        
+        # Use standard approval for the others
+        standard_leaves = self - orgchart_leaves
+        if standard_leaves:
+            result = super(HrLeave, standard_leaves).action_approve(*args, **kwargs)
+        return result
 
     def action_refuse(self):
         """Override to handle rejection"""
@@ -3,6 +3,19 @@
 from odoo import models, fields, api, _
 from odoo.exceptions import ValidationError
 
+from .hr_leave import APPROVAL_CHAIN_CACHE
+
+# Fields that change cached approval chain templates (see hr.leave)
+APPROVAL_CHAIN_FIELDS = {
+    'use_orgchart_approval',
+    'require_department_head_approval',
+    'require_hr_approval',
+    'require_officer_final_approval',
+    'require_top_management',
+    'top_management_limit',
+    'skip_manager_if_subordinate',
+}
+
 
 class HrLeaveType(models.Model):
     _inherit = 'hr.leave.type'
@@ -32,6 +45,19 @@ class HrLeaveType(models.Model):
         help="Add HR Manager as final approver"
     )
     
+    hr_manager_selection = fields.Selection([
+        ('first', 'First HR Manager'),
+        ('least_pending', 'Least Pending Approvals'),
+        ('round_robin', 'Round Robin'),
+    ], string='HR Manager Selection',
+        default='first',
+        required=True,
+        help="How the HR Manager approver is picked among the Time Off Administrators:\n"
+             "- First: always the first one (by name)\n"
+             "- Least Pending: the one with the fewest pending approval levels\n"
+             "- Round Robin: rotate on the leave request number"
+    )
+    
     require_officer_final_approval = fields.Boolean(
         string='Require Time Off Officer Final Approval',
         default=False,
@@ -44,6 +70,13 @@ class HrLeaveType(models.Model):
         help="Require approval from top management (CEO, etc.) for this leave type"
     )
     
+    top_management_limit = fields.Integer(
+        string='Max Top Management Approvers',
+        default=0,
+        help="Maximum number of top management approvers added to the chain "
+             "(root employees of the company, by name). 0 = no limit."
+    )
+    
     # SLA Settings
     approval_sla_hours = fields.Float(
         string='Approval SLA (Hours)',
@@ -51,11 +84,18 @@ class HrLeaveType(models.Model):
         help="Expected time for each approval level in hours"
     )
     
+    sla_business_hours = fields.Boolean(
+        string='SLA in Business Hours',
+        default=False,
+        help="Count the approval SLA in working hours of the approver's schedule "
+             "(company schedule as fallback), skipping week-ends and public holidays"
+    )
+    
     # Auto-approval settings
     auto_approve_if_manager_absent = fields.Boolean(
         string='Auto-approve if Manager Absent',
         default=False,
-        help="Automatically approve level if approver is on leave"
+        help="Skip a level when it is activated while its approver is on approved time off"
     )
     
     skip_manager_if_subordinate = fields.Boolean(
@@ -72,6 +112,19 @@ class HrLeaveType(models.Model):
             if record.orgchart_approval_levels > 10:
                 raise ValidationError(_('Number of approval levels cannot exceed 10.'))
 
+    @api.constrains('top_management_limit')
+    def _check_top_management_limit(self):
+        for record in self:
+            if record.top_management_limit < 0:
+                raise ValidationError(_('Max top management approvers cannot be negative.'))
+
+    def write(self, vals):
+        result = super(HrLeaveType, self).write(vals)
+        # Cached approval chain templates depend on these (see hr.leave)
+        if APPROVAL_CHAIN_FIELDS.intersection(vals):
+            self.env['hr.leave']._invalidate_approval_chain_templates()
+        return result
+
     @api.onchange('use_orgchart_approval')
     def _onchange_use_orgchart_approval(self):
         """Disable standard validation if using org chart"""
@@ -84,24 +137,88 @@ class HrLeaveType(models.Model):
         Used in UI to show who will approve
         """
         self.ensure_one()
+        return self.get_approval_chain_previews([employee_id])[self.id][employee_id]
+
+    def get_approval_chain_previews(self, employee_ids):
+        """
+        Preview the approval chains of many employees for these leave types
+        
+        Chains come from the cached approval chain templates, built from
+        preloaded data (hierarchy closure table, batched employee/department
+        reads, cached top management roster) without creating virtual leave
+        records.
         
-        if not self.use_orgchart_approval:
-            return []
+        For the HR Manager, 'least_pending' shows the current least loaded
+        manager; 'round_robin' depends on the leave request and shows the
+        first manager of the rotation.
         
-        # Create temporary leave record (not saved) to get chain
-        temp_leave = self.env['hr.leave'].new({
-            'employee_id': employee_id,
-            'holiday_status_id': self.id,
-        })
+        :param employee_ids: list of hr.employee ids
+        :return: dict {leave_type_id: {employee_id: [approver dicts]}}
+        """
+        Leave = self.env['hr.leave']
+        employees = self.env['hr.employee'].sudo().browse(employee_ids).exists()
+        ancestors = self.env['hr.employee.hierarchy'].sudo()._get_ancestors(employees.ids)
+        subordinate_user_ids = {}
+        if any(leave_type.use_orgchart_approval and leave_type.skip_manager_if_subordinate for leave_type in self):
+            subordinate_user_ids = Leave._get_subordinate_approver_user_ids(employees)
+        token = APPROVAL_CHAIN_CACHE.token(self.env)
+        
+        result = {}
+        chains = []
+        for leave_type in self:
+            result[leave_type.id] = {employee_id: [] for employee_id in employee_ids}
+            if not leave_type.use_orgchart_approval:
+                continue
+            hr_manager = leave_type._get_preview_hr_manager()
+            for employee in employees:
+                template = Leave._get_approval_chain_template(
+                    employee.id,
+                    leave_type.id,
+                    employee.company_id.id,
+                    Leave._get_department_approval_mode(employee),
+                    ancestors=ancestors.get(employee.id, []),
+                    token=token,
+                    subordinate_user_ids=subordinate_user_ids.get(employee.id),
+                )
+                chain = [
+                    approver
+                    for approver in Leave._resolve_approval_chain(template, lambda excluded_ids: hr_manager)
+                    if not isinstance(approver, tuple)  # FYI officers marker
+                ]
+                chains.append((leave_type.id, employee.id, chain))
+        
+        # Resolve approver employees of every chain at once
+        approver_user_ids = {user.id for __, __, chain in chains for user in chain}
+        employee_by_user = self.env['snifx.user.resolver'].get_user_employees(approver_user_ids)
+        users = self.env['res.users'].browse(approver_user_ids)
+        users.fetch(['name', 'email'])
         
-        chain = temp_leave._get_approval_chain_from_orgchart()
+        for leave_type_id, employee_id, chain in chains:
+            result[leave_type_id][employee_id] = [{
+                'level': idx + 1,
+                'user_id': user.id,
+                'name': user.name,
+                'email': user.email,
+                'employee_name': employee_by_user[user.id].name or '',
+                'job_title': employee_by_user[user.id].sudo().job_title or '',
+            } for idx, user in enumerate(chain)]
         
-        # Return list of dicts with user info
-        return [{
-            'level': idx + 1,
-            'user_id': user.id,
-            'name': user.name,
-            'email': user.email,
-            'employee_name': user.employee_id.name if user.employee_id else '',
-            'job_title': user.employee_id.job_title if user.employee_id else '',
-        } for idx, user in enumerate(chain)]
+        return result
+
+    def _get_preview_hr_manager(self):
+        """HR Manager shown in previews, without reserving a pending slot"""
+        self.ensure_one()
+        if not self.require_hr_approval:
+            return False
+        try:
+            hr_managers = self.env.ref('hr_holidays.group_hr_holidays_manager').users
+        except ValueError:
+            return False
+        if not hr_managers:
+            return False
+        if self.hr_manager_selection == 'least_pending':
+            counts = self.env['hr.leave']._get_hr_manager_pending_counts(hr_managers)
+            return min(hr_managers, key=lambda user: (counts[user.id], user.id))
+        if self.hr_manager_selection == 'round_robin':
+            return hr_managers.sorted('id')[0]
+        return hr_managers[0]
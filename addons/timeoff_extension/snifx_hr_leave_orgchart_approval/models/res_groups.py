@@ -0,0 +1,17 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models
+
+
+class ResGroups(models.Model):
+    _inherit = 'res.groups'
+
+    def write(self, vals):
+        # Approval chain templates list the subordinates who are HR managers
+        if not {'users', 'implied_ids'}.intersection(vals):
+            return super(ResGroups, self).write(vals)
+        Leave = self.env['hr.leave']
+        hr_manager_ids = Leave._get_hr_manager_user_ids()
+        result = super(ResGroups, self).write(vals)
+        Leave._invalidate_if_hr_managers_changed(hr_manager_ids)
+        return result
@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models
+
+# Fields of the user form setting the groups (reified groups_id)
+GROUP_FIELD_PREFIXES = ('in_group_', 'sel_groups_')
+
+
+class ResUsers(models.Model):
+    _inherit = 'res.users'
+
+    def write(self, vals):
+        # Approval chain templates list the subordinates who are HR managers
+        if not any(key in ('groups_id', 'active') or key.startswith(GROUP_FIELD_PREFIXES) for key in vals):
+            return super(ResUsers, self).write(vals)
+        Leave = self.env['hr.leave']
+        hr_manager_ids = Leave._get_hr_manager_user_ids()
+        result = super(ResUsers, self).write(vals)
+        Leave._invalidate_if_hr_managers_changed(hr_manager_ids)
+        return result
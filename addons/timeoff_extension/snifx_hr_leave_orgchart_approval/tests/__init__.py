@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+
+from . import test_approval_chain
+from . import test_overdue_reminder
+from . import test_approval_actions
+from . import test_delegation
+from . import test_absent_approver
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+from datetime import date
+
+from odoo.tests import TransactionCase, new_test_user
+
+
+class OrgchartApprovalCase(TransactionCase):
+    """
+    Org chart used by the tests:
+
+        CEO
+        ├── Manager ── Staff
+        └── Manager 2
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.company = cls.env.company
+        cls.user_ceo = new_test_user(
+            cls.env, login='snifx_ceo', groups='base.group_user', email='snifx_ceo@example.com'
+        )
+        cls.user_manager = new_test_user(
+            cls.env, login='snifx_manager', groups='base.group_user', email='snifx_manager@example.com'
+        )
+        cls.user_manager_2 = new_test_user(
+            cls.env, login='snifx_manager_2', groups='base.group_user', email='snifx_manager_2@example.com'
+        )
+        cls.user_staff = new_test_user(
+            cls.env, login='snifx_staff', groups='base.group_user', email='snifx_staff@example.com'
+        )
+
+        Employee = cls.env['hr.employee']
+        cls.ceo = Employee.create({
+            'name': 'Snifx CEO',
+            'user_id': cls.user_ceo.id,
+            'company_id': cls.company.id,
+        })
+        cls.manager = Employee.create({
+            'name': 'Snifx Manager',
+            'user_id': cls.user_manager.id,
+            'parent_id': cls.ceo.id,
+            'company_id': cls.company.id,
+        })
+        cls.manager_2 = Employee.create({
+            'name': 'Snifx Manager 2',
+            'user_id': cls.user_manager_2.id,
+            'parent_id': cls.ceo.id,
+            'company_id': cls.company.id,
+        })
+        cls.staff = Employee.create({
+            'name': 'Snifx Staff',
+            'user_id': cls.user_staff.id,
+            'parent_id': cls.manager.id,
+            'company_id': cls.company.id,
+        })
+
+        cls.leave_type = cls.env['hr.leave.type'].create({
+            'name': 'Snifx Org Chart Leave',
+            'requires_allocation': 'no',
+            'use_orgchart_approval': True,
+            'company_id': cls.company.id,
+        })
+
+    def _get_template(self, employee, leave_type=None):
+        Leave = self.env['hr.leave']
+        return Leave._get_approval_chain_template(
+            employee.id,
+            (leave_type or self.leave_type).id,
+            employee.company_id.id,
+            Leave._get_department_approval_mode(employee),
+        )
+
+    def _create_leave(self, employee, leave_date=date(2030, 1, 7)):
+        return self.env['hr.leave'].create({
+            'employee_id': employee.id,
+            'holiday_status_id': self.leave_type.id,
+            'request_date_from': leave_date,
+            'request_date_to': leave_date,
+        })
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+from datetime import date, datetime
+
+from freezegun import freeze_time
+
+from odoo.tests import tagged
+
+from .common import OrgchartApprovalCase
+
+# Monday, within working hours
+NOW = datetime(2030, 1, 7, 10, 0)
+
+
+@tagged('post_install', '-at_install')
+class TestAbsentApprover(OrgchartApprovalCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.leave_type.auto_approve_if_manager_absent = True
+        cls.absence_type = cls.env['hr.leave.type'].create({
+            'name': 'Snifx Absence',
+            'requires_allocation': 'no',
+            'leave_validation_type': 'no_validation',
+            'company_id': cls.company.id,
+        })
+
+    def _create_absence(self, employee):
+        absence = self.env['hr.leave'].create({
+            'employee_id': employee.id,
+            'holiday_status_id': self.absence_type.id,
+            'request_date_from': NOW.date(),
+            'request_date_to': NOW.date(),
+        })
+        self.assertEqual(absence.state, 'validate')
+        return absence
+
+    @freeze_time(NOW)
+    def test_absent_approver_skipped_at_creation(self):
+        self._create_absence(self.manager)
+        leave = self._create_leave(self.staff, date(2030, 1, 14))
+        level_1, level_2 = leave.approval_level_ids.sorted('level')
+
+        self.assertEqual(level_1.state, 'skipped')
+        self.assertEqual(level_2.state, 'pending')
+        self.assertTrue(level_2.is_current_level)
+
+    @freeze_time(NOW)
+    def test_absent_approver_skipped_when_level_activated(self):
+        self._create_absence(self.ceo)
+        leave = self._create_leave(self.staff, date(2030, 1, 14))
+        level_1, level_2 = leave.approval_level_ids.sorted('level')
+        self.assertEqual(level_2.state, 'pending')
+
+        level_1.with_user(self.user_manager).action_approve()
+        self.assertEqual(level_2.state, 'skipped')
+        self.assertEqual(leave.state, 'validate')
+
+    @freeze_time(NOW)
+    def test_absent_approver_kept_without_auto_approval(self):
+        self.leave_type.auto_approve_if_manager_absent = False
+        self._create_absence(self.manager)
+        leave = self._create_leave(self.staff, date(2030, 1, 14))
+        level_1 = leave.approval_level_ids.sorted('level')[0]
+
+        self.assertEqual(level_1.state, 'pending')
+        self.assertTrue(level_1.is_current_level)
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+
+from datetime import date
+
+from odoo.exceptions import UserError
+from odoo.tests import tagged
+
+from .common import OrgchartApprovalCase
+
+
+@tagged('post_install', '-at_install')
+class TestApprovalActions(OrgchartApprovalCase):
+
+    def _create_leaves(self):
+        leave_1 = self._create_leave(self.staff, date(2030, 1, 7))
+        leave_2 = self._create_leave(self.staff, date(2030, 1, 8))
+        return leave_1, leave_2
+
+    def _levels(self, leaves, level):
+        return leaves.approval_level_ids.filtered(lambda l: l.level == level)
+
+    def test_approve_levels_of_many_leaves(self):
+        leaves = self._create_leaves()
+        leaves = leaves[0] | leaves[1]
+
+        self._levels(leaves, 1).with_user(self.user_manager).action_approve()
+        self.assertEqual(set(self._levels(leaves, 1).mapped('state')), {'approved'})
+        self.assertTrue(all(self._levels(leaves, 2).mapped('is_current_level')))
+        self.assertEqual(set(leaves.mapped('state')), {'confirm'})
+
+        self._levels(leaves, 2).with_user(self.user_ceo).action_approve()
+        self.assertEqual(set(self._levels(leaves, 2).mapped('state')), {'approved'})
+        self.assertEqual(set(leaves.mapped('state')), {'validate'})
+
+    def test_reject_levels_of_many_leaves(self):
+        leaves = self._create_leaves()
+        leaves = leaves[0] | leaves[1]
+
+        self._levels(leaves, 1).with_user(self.user_manager).action_reject()
+        self.assertEqual(set(self._levels(leaves, 1).mapped('state')), {'rejected'})
+        self.assertEqual(set(leaves.mapped('state')), {'refuse'})
+
+    def test_batch_with_level_not_current_is_not_processed(self):
+        leave = self._create_leave(self.staff)
+        level_1 = self._levels(leave, 1)
+        # Level 2 still waits for level 1
+        levels = level_1 | self._levels(leave, 2)
+
+        with self.assertRaises(UserError):
+            levels.with_user(self.user_ceo).action_approve()
+        self.assertEqual(level_1.state, 'pending')
+
+    def test_batch_with_other_approver_is_not_processed(self):
+        leave_1, leave_2 = self._create_leaves()
+        self._levels(leave_2, 1).with_user(self.user_manager).action_approve()
+        # Current levels of the manager and of the CEO
+        levels = self._levels(leave_1, 1) | self._levels(leave_2, 2)
+
+        with self.assertRaises(UserError):
+            levels.with_user(self.user_manager).action_reject()
+        self.assertEqual(set(levels.mapped('state')), {'pending'})
+        self.assertEqual(set((leave_1 | leave_2).mapped('state')), {'confirm'})
+
+    def test_processed_level_is_not_processed_again(self):
+        leave_1, leave_2 = self._create_leaves()
+        level_1 = self._levels(leave_1, 1)
+        level_1.with_user(self.user_manager).action_approve()
+        levels = level_1 | self._levels(leave_2, 1)
+
+        with self.assertRaises(UserError):
+            levels.with_user(self.user_manager).action_approve()
+        self.assertEqual(self._levels(leave_2, 1).state, 'pending')
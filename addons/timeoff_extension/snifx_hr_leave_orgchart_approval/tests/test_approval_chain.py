@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+
+from odoo import Command
+from odoo.tests import tagged
+
+from .common import OrgchartApprovalCase
+
+
+@tagged('post_install', '-at_install')
+class TestApprovalChainTemplate(OrgchartApprovalCase):
+
+    def test_staff_template(self):
+        self.assertEqual(self._get_template(self.staff), (
+            ('user', self.user_manager.id),
+            ('user', self.user_ceo.id),
+        ))
+
+    def test_template_follows_manager_change(self):
+        self._get_template(self.staff)
+        self.staff.parent_id = self.manager_2
+        self.assertEqual(self._get_template(self.staff), (
+            ('user', self.user_manager_2.id),
+            ('user', self.user_ceo.id),
+        ))
+
+    def test_template_follows_manager_user_change(self):
+        self._get_template(self.staff)
+        user = self.user_manager_2
+        self.manager_2.user_id = False
+        self.manager.user_id = user
+        self.assertEqual(self._get_template(self.staff)[0], ('user', user.id))
+
+    def test_template_follows_single_level_override(self):
+        self._get_template(self.staff)
+        self.staff.force_single_approval_level = True
+        self.assertEqual(self._get_template(self.staff), (('user', self.user_manager.id),))
+
+    def test_template_follows_leave_type_change(self):
+        self._get_template(self.staff)
+        self.leave_type.require_hr_approval = True
+        self.assertIn('hr_manager', [kind for kind, __ in self._get_template(self.staff)])
+
+    def test_skipped_hr_managers_follow_group(self):
+        """Only subordinates who are HR managers are kept in the placeholder"""
+        self.leave_type.require_hr_approval = True
+        self.assertIn(('hr_manager', ()), self._get_template(self.manager))
+        self.env.ref('hr_holidays.group_hr_holidays_manager').write({
+            'users': [Command.link(self.user_staff.id)],
+        })
+        self.assertIn(('hr_manager', (self.user_staff.id,)), self._get_template(self.manager))
+
+    def test_template_follows_department_mode(self):
+        department = self.env['hr.department'].create({'name': 'Snifx Department'})
+        self.staff.department_id = department
+        self.assertEqual(len(self._get_template(self.staff)), 2)
+        department.use_orgchart_approval = False
+        self.assertEqual(self._get_template(self.staff), (('user', self.user_manager.id),))
+
+    def test_roster_follows_root_employee_change(self):
+        Employee = self.env['hr.employee']
+        self.assertIn(self.user_ceo.id, Employee._get_top_management_roster(self.company.id))
+        self.ceo.user_id = False
+        self.assertNotIn(self.user_ceo.id, Employee._get_top_management_roster(self.company.id))
+        # A manager without manager joins the roster
+        self.manager_2.parent_id = False
+        self.assertIn(self.user_manager_2.id, Employee._get_top_management_roster(self.company.id))
+
+    def test_hr_manager_keeps_its_position(self):
+        """A top manager who is also the HR Manager approves once, as HR Manager"""
+        Leave = self.env['hr.leave']
+        template = (
+            ('user', self.user_manager.id),
+            ('hr_manager', ()),
+            ('user', self.user_manager_2.id),
+            ('user', self.user_ceo.id),
+        )
+        chain = Leave._resolve_approval_chain(template, lambda excluded_ids: self.user_ceo)
+        self.assertEqual(
+            [user.id for user in chain],
+            [self.user_manager.id, self.user_ceo.id, self.user_manager_2.id],
+        )
+        # Already in the chain: not added as HR Manager
+        chain = Leave._resolve_approval_chain(template, lambda excluded_ids: self.user_manager)
+        self.assertEqual(
+            [user.id for user in chain],
+            [self.user_manager.id, self.user_manager_2.id, self.user_ceo.id],
+        )
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+from datetime import timedelta
+
+from freezegun import freeze_time
+
+from odoo import fields
+from odoo.tests import tagged
+
+from .common import OrgchartApprovalCase
+
+
+@tagged('post_install', '-at_install')
+class TestDelegation(OrgchartApprovalCase):
+
+    def _create_delegation(self, user, delegate):
+        now = fields.Datetime.now()
+        return self.env['leave.approval.delegation'].create({
+            'user_id': user.id,
+            'delegate_id': delegate.id,
+            'date_from': now - timedelta(hours=1),
+            'date_to': now + timedelta(days=1),
+        })
+
+    def test_pending_level_rerouted_to_delegate(self):
+        leave = self._create_leave(self.staff)
+        level_1 = leave.approval_level_ids.sorted('level')[0]
+        delegation = self._create_delegation(self.user_manager, self.user_manager_2)
+
+        self.assertEqual(level_1.approver_id, self.user_manager_2)
+        self.assertEqual(level_1.original_approver_id, self.user_manager)
+        self.assertEqual(level_1.delegation_id, delegation)
+
+    def test_new_level_assigned_to_delegate(self):
+        delegation = self._create_delegation(self.user_manager, self.user_manager_2)
+        leave = self._create_leave(self.staff)
+        level_1 = leave.approval_level_ids.sorted('level')[0]
+
+        self.assertEqual(level_1.approver_id, self.user_manager_2)
+        self.assertEqual(level_1.original_approver_id, self.user_manager)
+        self.assertEqual(level_1.delegation_id, delegation)
+
+    def test_rerouted_level_reverted_on_expiry(self):
+        leave = self._create_leave(self.staff)
+        level_1 = leave.approval_level_ids.sorted('level')[0]
+        self._create_delegation(self.user_manager, self.user_manager_2)
+
+        with freeze_time(fields.Datetime.now() + timedelta(days=2)):
+            self.env['leave.approval.delegation']._cron_reroute_levels()
+        self.assertEqual(level_1.approver_id, self.user_manager)
+        self.assertFalse(level_1.original_approver_id)
+        self.assertFalse(level_1.delegation_id)
+
+    def test_rerouted_level_reverted_on_delegation_unlink(self):
+        leave = self._create_leave(self.staff)
+        level_1 = leave.approval_level_ids.sorted('level')[0]
+        delegation = self._create_delegation(self.user_manager, self.user_manager_2)
+
+        delegation.unlink()
+        self.assertEqual(level_1.approver_id, self.user_manager)
+        self.assertFalse(level_1.delegation_id)
+
+    def test_delegations_followed_transitively(self):
+        first = self._create_delegation(self.user_manager, self.user_manager_2)
+        second = self._create_delegation(self.user_manager_2, self.user_ceo)
+        # Back to the first approver: the chain stops before the cycle
+        self._create_delegation(self.user_ceo, self.user_manager)
+
+        delegations = self.env['leave.approval.delegation']._get_delegations(
+            [self.user_manager.id, self.user_manager_2.id]
+        )
+        self.assertEqual(delegations[self.user_manager.id], (self.user_ceo.id, first.id))
+        self.assertEqual(delegations[self.user_manager_2.id], (self.user_manager.id, second.id))
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+from datetime import timedelta
+
+from odoo import fields
+from odoo.tests import tagged
+
+from .common import OrgchartApprovalCase
+
+
+@tagged('post_install', '-at_install')
+class TestOverdueReminder(OrgchartApprovalCase):
+
+    def _set_deadline_passed(self, levels):
+        levels.flush_recordset()
+        self.env.cr.execute(
+            "UPDATE leave_approval_level SET deadline = %s WHERE id = ANY(%s)",
+            [fields.Datetime.now() - timedelta(hours=1), levels.ids],
+        )
+        levels.invalidate_recordset(['deadline'])
+
+    def test_level_flagged_once_current(self):
+        Level = self.env['leave.approval.level']
+        leave = self._create_leave(self.staff)
+        level_1, level_2 = leave.approval_level_ids.sorted('level')
+        self._set_deadline_passed(level_1 | level_2)
+
+        self.assertEqual(Level._flag_overdue_levels(), level_1)
+        self.assertFalse(level_2.is_overdue)
+
+        level_1.with_user(self.user_manager).action_approve()
+        self.assertTrue(level_2.is_current_level)
+        self.assertEqual(Level._flag_overdue_levels(), level_2)
+        self.assertTrue(level_2.is_overdue)
+        self.assertFalse(Level._flag_overdue_levels())
+
+    def test_cron_reminds_level_once_current(self):
+        Level = self.env['leave.approval.level']
+        leave = self._create_leave(self.staff)
+        level_1, level_2 = leave.approval_level_ids.sorted('level')
+        self._set_deadline_passed(level_1 | level_2)
+        Level._cron_reminder_overdue()
+        level_1.with_user(self.user_manager).action_approve()
+
+        mails = self.env['mail.mail'].search([('email_to', 'ilike', self.user_ceo.email)])
+        Level._cron_reminder_overdue()
+        self.assertTrue(level_2.is_overdue)
+        self.assertTrue(
+            self.env['mail.mail'].search([('email_to', 'ilike', self.user_ceo.email)]) - mails
+        )
+
+    def test_cron_reminds_level_with_deadline_moved_to_past(self):
+        Level = self.env['leave.approval.level']
+        leave = self._create_leave(self.staff)
+        level_1 = leave.approval_level_ids.sorted('level')[0]
+        level_1.write({'deadline': fields.Datetime.now() - timedelta(hours=1)})
+        self.assertFalse(level_1.is_overdue)
+
+        mails = self.env['mail.mail'].search([('email_to', 'ilike', self.user_manager.email)])
+        Level._cron_reminder_overdue()
+        self.assertTrue(level_1.is_overdue)
+        self.assertTrue(
+            self.env['mail.mail'].search([('email_to', 'ilike', self.user_manager.email)]) - mails
+        )
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+{
+    'name': 'Snifx Time Off Core',
+    'version': '18.0.1.0.0',
+    'category': 'Human Resources/Time Off',
+    'summary': """
+        Shared technical services for the Snifx Time Off add-ons.
+    """,
+    'description': """
+Snifx Time Off Core
+===================
+
+Technical base module shared by the Snifx Time Off add-ons
+(org chart approval, PIC pengganti, ...).
+
+Services:
+---------
+* **User Resolver** (``snifx.user.resolver``): maps many users to their
+  employee, partner and email (or many employees to their user, partner
+  and emails) with one query per chunk, cached for the current transaction.
+* **Business Hours** (``snifx.business.hours``): adds working hours to
+  datetimes following a resource calendar (schedule, week-ends, public
+  holidays), with working intervals cached per calendar and year.
+* **Tracing** (``tools.get_tracer``): lazy, per-subsystem trace points
+  with sampling for the hot paths of the add-ons.
+* **Versioned Caches** (``tools.VersionedCache``): bounded worker-local
+  caches invalidated across workers by bumping a version token
+  (``snifx.cache.version``), without clearing the registry caches.
+* **Mail Outbox** (``snifx.mail.outbox``): mails are queued in the
+  transaction of the user action and sent by a scheduled action, with
+  retry/backoff and a dead-letter state (Settings > Technical > Email).
+
+Compatible with Odoo 18 Community Edition.
+    """,
+    'author': 'Snifx Technical',
+    'website': 'https://www.yourcompany.com',
+    'license': 'LGPL-3',
+    'depends': [
+        'hr',
+        'resource',
+        'mail',
+    ],
+    'data': [
+        'security/ir.model.access.csv',
+        'data/ir_cron.xml',
+        'views/mail_outbox_views.xml',
+    ],
+    'installable': True,
+    'auto_install': False,
+    'application': False,
+}
@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+
+from . import user_resolver
+from . import hr_employee
+from . import res_users
+from . import res_partner
+from . import mail_outbox
+from . import business_hours
+from . import resource_calendar
+from . import cache_version
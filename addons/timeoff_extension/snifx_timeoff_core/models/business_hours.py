@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+
+from bisect import bisect_right
+from datetime import datetime, timedelta
+
+from pytz import utc
+
+from odoo import models, api
+
+from ..tools import VersionedCache
+
+# Years scanned forward before giving up (calendar without working time)
+MAX_YEARS = 3
+
+# Working intervals per (calendar, year)
+YEAR_INTERVALS_CACHE = VersionedCache('snifx_timeoff_core.year_intervals', 1024)
+
+
+class SnifxBusinessHours(models.AbstractModel):
+    """
+    Business hours engine
+
+    Adds working hours to datetimes following a resource.calendar: work
+    schedule, week-ends and public holidays (global resource.calendar.leaves)
+    are taken into account. The working intervals of a calendar are computed
+    once per year and cached, so deadlines of many records are computed with
+    in-memory lookups only.
+    """
+    _name = 'snifx.business.hours'
+    _description = 'Business Hours Engine'
+
+    @api.model
+    def _get_year_intervals(self, calendar_id, year, token=None):
+        """
+        Working intervals of a calendar for a year (cached)
+
+        :param token: token of the cache if already read for the batch
+        :return: see _read_year_intervals
+        """
+        return YEAR_INTERVALS_CACHE.get(
+            self.env, (calendar_id, year),
+            lambda: self._read_year_intervals(calendar_id, year),
+            token=token,
+        )
+
+    @api.model
+    def _read_year_intervals(self, calendar_id, year):
+        """
+        Compute the working intervals of a calendar for a year
+
+        :return: (starts, ends, cumulated) tuples: interval bounds as naive
+            UTC datetimes and the working seconds before each interval
+        """
+        calendar = self.env['resource.calendar'].sudo().browse(calendar_id)
+        start = utc.localize(datetime(year, 1, 1))
+        stop = utc.localize(datetime(year + 1, 1, 1))
+        intervals = calendar._work_intervals_batch(start, stop)[False]
+
+        starts, ends, cumulated = [], [], []
+        total = 0.0
+        for interval_start, interval_stop, __ in intervals:
+            interval_start = interval_start.astimezone(utc).replace(tzinfo=None)
+            interval_stop = interval_stop.astimezone(utc).replace(tzinfo=None)
+            starts.append(interval_start)
+            ends.append(interval_stop)
+            cumulated.append(total)
+            total += (interval_stop - interval_start).total_seconds()
+        return tuple(starts), tuple(ends), tuple(cumulated)
+
+    @api.model
+    def add_hours(self, calendar, start_dt, hours, token=None):
+        """
+        Return the datetime reached after working `hours` from `start_dt`
+
+        :param calendar: resource.calendar record (falsy = wall-clock hours)
+        :param start_dt: naive UTC datetime
+        :param hours: working hours to add
+        :param token: token of the interval cache if already read for the batch
+        :return: naive UTC datetime
+        """
+        if not calendar or hours <= 0:
+            return start_dt + timedelta(hours=hours)
+
+        if token is None:
+            token = YEAR_INTERVALS_CACHE.token(self.env)
+        remaining = hours * 3600
+        current = start_dt
+        for year in range(start_dt.year, start_dt.year + MAX_YEARS):
+            starts, ends, cumulated = self._get_year_intervals(calendar.id, year, token=token)
+            # First interval ending after the current datetime
+            index = bisect_right(ends, current)
+            if index >= len(starts):
+                current = datetime(year + 1, 1, 1)
+                continue
+            # Working seconds available from current to the end of the year
+            offset = cumulated[index] + max((current - starts[index]).total_seconds(), 0)
+            target = offset + remaining
+            year_total = cumulated[-1] + (ends[-1] - starts[-1]).total_seconds()
+            if target > year_total:
+                remaining = target - year_total
+                current = datetime(year + 1, 1, 1)
+                continue
+            # Interval containing the target
+            position = bisect_right(cumulated, target) - 1
+            if position > index and cumulated[position] == target:
+                # Exactly at an interval boundary: end of the previous one
+                return ends[position - 1]
+            return starts[position] + timedelta(seconds=target - cumulated[position])
+
+        # No working time found: fall back to wall-clock hours
+        return start_dt + timedelta(hours=hours)
+
+    @api.model
+    def add_hours_batch(self, requests):
+        """
+        Compute many deadlines at once
+
+        :param requests: iterable of (calendar, start_dt, hours)
+        :return: list of naive UTC datetimes, in the order of the requests
+        """
+        token = YEAR_INTERVALS_CACHE.token(self.env)
+        return [
+            self.add_hours(calendar, start_dt, hours, token=token)
+            for calendar, start_dt, hours in requests
+        ]
+
+    @api.model
+    def _invalidate_cache(self):
+        """Invalidate cached interval tables (in every worker once committed)"""
+        YEAR_INTERVALS_CACHE.invalidate(self.env)
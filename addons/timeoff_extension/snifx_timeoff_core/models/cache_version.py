@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, fields, api
+
+
+class SnifxCacheVersion(models.Model):
+    """
+    Version tokens of the worker-local caches of the Snifx Time Off add-ons
+
+    A cache (see ``tools.VersionedCache``) keys its entries on its current
+    token. Bumping a token in a transaction invalidates the entries of every
+    worker once the transaction is committed; a rolled back bump is never
+    seen by the other workers. Tokens come from a sequence, so a token is
+    never reused, even after a rollback.
+    """
+    _name = 'snifx.cache.version'
+    _description = 'Cache Version'
+    _log_access = False
+
+    name = fields.Char(string='Cache', required=True)
+    token = fields.Integer(string='Token', required=True, default=0)
+
+    _sql_constraints = [
+        ('name_uniq', 'unique(name)', 'A cache can only have one version.'),
+    ]
+
+    def init(self):
+        self.env.cr.execute("CREATE SEQUENCE IF NOT EXISTS snifx_cache_version_token_seq")
+
+    @api.model
+    def get_tokens(self, names):
+        """
+        Get the current token of caches
+
+        Always read from the table (one primary key lookup): a token kept
+        on the cursor would survive the rollback of a savepoint that bumped
+        it, and serve entries computed from rolled back data.
+
+        :param names: iterable of cache names
+        :return: dict {name: token} (0 for a cache never bumped)
+        """
+        names = list(names)
+        self.env.cr.execute("""
+            SELECT name, token FROM snifx_cache_version WHERE name = ANY(%s)
+        """, [names])
+        tokens = dict(self.env.cr.fetchall())
+        return {name: tokens.get(name, 0) for name in names}
+
+    @api.model
+    def get_token(self, name):
+        return self.get_tokens([name])[name]
+
+    @api.model
+    def bump(self, names):
+        """
+        Invalidate caches: give them a new token
+
+        :param names: iterable of cache names
+        """
+        names = sorted(set(names))
+        if not names:
+            return
+        self.env.cr.execute("""
+            INSERT INTO snifx_cache_version (name, token)
+                 SELECT name, nextval('snifx_cache_version_token_seq')
+                   FROM unnest(%s::varchar[]) AS name
+            ON CONFLICT (name) DO UPDATE SET token = EXCLUDED.token
+        """, [names])
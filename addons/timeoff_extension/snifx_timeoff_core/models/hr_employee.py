@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, api
+
+# Fields that change the result of snifx.user.resolver
+RESOLVER_FIELDS = {'user_id', 'active', 'company_id', 'work_email', 'work_contact_id'}
+
+
+class HrEmployee(models.Model):
+    _inherit = 'hr.employee'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        employees = super(HrEmployee, self).create(vals_list)
+        self.env['snifx.user.resolver']._invalidate_cache()
+        return employees
+
+    def write(self, vals):
+        result = super(HrEmployee, self).write(vals)
+        if RESOLVER_FIELDS.intersection(vals):
+            self.env['snifx.user.resolver']._invalidate_cache()
+        return result
+
+    def unlink(self):
+        result = super(HrEmployee, self).unlink()
+        self.env['snifx.user.resolver']._invalidate_cache()
+        return result
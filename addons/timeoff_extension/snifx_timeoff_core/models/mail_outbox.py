@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+
+import logging
+from datetime import timedelta
+
+from odoo import models, fields, api
+from odoo.tools import create_index
+
+_logger = logging.getLogger(__name__)
+
+# Rows sent per cron call
+BATCH_SIZE = 50
+# Failed sends are retried after 5, 10, 20, 40 minutes, then dead-lettered
+MAX_ATTEMPTS = 5
+RETRY_BASE_MINUTES = 5
+# Sent rows are kept this long for troubleshooting
+KEEP_SENT_DAYS = 7
+
+
+class SnifxMailOutbox(models.Model):
+    """
+    Transactional outbox for the mails of the Snifx Time Off add-ons
+
+    Mails are enqueued in the transaction of the user action (submit,
+    approve, ...) and sent afterwards by a scheduled action, so the user
+    never waits for the SMTP server. Failed sends are retried with an
+    exponential backoff and end up in the 'dead' state after MAX_ATTEMPTS.
+    """
+    _name = 'snifx.mail.outbox'
+    _description = 'Time Off Mail Outbox'
+    _order = 'next_attempt_date, id'
+
+    template_id = fields.Many2one(
+        'mail.template',
+        string='Template',
+        required=True,
+        ondelete='cascade'
+    )
+    model = fields.Char(
+        related='template_id.model',
+        string='Model'
+    )
+    res_id = fields.Integer(
+        string='Record ID',
+        required=True
+    )
+    email_values = fields.Json(
+        string='Email Values',
+        help="Values overriding the rendered template (see mail.template.send_mail)"
+    )
+    state = fields.Selection([
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('dead', 'Dead Letter'),
+    ], string='Status', default='pending', required=True)
+    attempt_count = fields.Integer(
+        string='Attempts',
+        default=0
+    )
+    next_attempt_date = fields.Datetime(
+        string='Next Attempt',
+        default=fields.Datetime.now,
+        required=True
+    )
+    last_error = fields.Text(
+        string='Last Error'
+    )
+
+    def init(self):
+        # Queue of the drain cron: pending rows by due date
+        create_index(
+            self._cr, 'snifx_mail_outbox_pending_index',
+            self._table, ['next_attempt_date', 'id'],
+            where="state = 'pending'"
+        )
+
+    @api.model
+    def enqueue(self, template, res_ids, email_values=None):
+        """
+        Queue one mail per record, to be sent after the current transaction
+
+        :param template: mail.template record
+        :param res_ids: ids of records of the template model
+        :param email_values: optional dict passed to send_mail for every mail
+        :return: created snifx.mail.outbox records
+        """
+        if not template or not res_ids:
+            return self.browse()
+
+        rows = self.sudo().create([{
+            'template_id': template.id,
+            'res_id': res_id,
+            'email_values': email_values or False,
+        } for res_id in res_ids])
+
+        cron = self.env.ref('snifx_timeoff_core.ir_cron_mail_outbox', raise_if_not_found=False)
+        if cron:
+            cron.sudo()._trigger()
+        return rows
+
+    @api.model
+    def _cron_process_outbox(self):
+        """Send a batch of due mails; the scheduler calls again while work remains"""
+        self.flush_model()
+        self.env.cr.execute("""
+            SELECT id
+              FROM snifx_mail_outbox
+             WHERE state = 'pending'
+               AND next_attempt_date <= (now() AT TIME ZONE 'UTC')
+          ORDER BY next_attempt_date, id
+             LIMIT %s
+               FOR UPDATE SKIP LOCKED
+        """, [BATCH_SIZE])
+        rows = self.browse([row[0] for row in self.env.cr.fetchall()])
+
+        for row in rows:
+            row._send()
+
+        self.env.cr.execute("""
+            SELECT COUNT(*)
+              FROM snifx_mail_outbox
+             WHERE state = 'pending'
+               AND next_attempt_date <= (now() AT TIME ZONE 'UTC')
+        """)
+        remaining = self.env.cr.fetchone()[0]
+        self.env['ir.cron']._notify_progress(done=len(rows), remaining=remaining)
+
+    def _send(self):
+        """Send this row, scheduling a retry (or dead-lettering it) on failure"""
+        self.ensure_one()
+
+        # Render as the user who queued the mail (default sender)
+        template = self.template_id.with_user(self.create_uid).sudo()
+        record = self.env[template.model].sudo().browse(self.res_id).exists()
+        if not record:
+            self.write({'state': 'dead', 'last_error': 'Record no longer exists'})
+            return
+
+        try:
+            with self.env.cr.savepoint():
+                template.send_mail(
+                    self.res_id,
+                    force_send=True,
+                    raise_exception=True,
+                    email_values=self.email_values or None,
+                )
+        except Exception as e:
+            attempts = self.attempt_count + 1
+            if attempts >= MAX_ATTEMPTS:
+                _logger.error(f"❌ Outbox mail {self.id} dead-lettered after {attempts} attempts: {e}")
+                self.write({'state': 'dead', 'attempt_count': attempts, 'last_error': str(e)})
+            else:
+                delay = RETRY_BASE_MINUTES * 2 ** (attempts - 1)
+                _logger.warning(f"Outbox mail {self.id} failed (attempt {attempts}), retry in {delay} min: {e}")
+                self.write({
+                    'attempt_count': attempts,
+                    'last_error': str(e),
+                    'next_attempt_date': fields.Datetime.now() + timedelta(minutes=delay),
+                })
+            return
+
+        self.write({
+            'state': 'sent',
+            'attempt_count': self.attempt_count + 1,
+            'last_error': False,
+        })
+
+    def action_retry(self):
+        """
+        Put dead-lettered mails back in the queue
+
+        Sent mails are left alone (retrying them would send them twice),
+        pending ones are already queued.
+        """
+        dead = self.filtered(lambda outbox: outbox.state == 'dead')
+        if not dead:
+            return True
+        dead.write({
+            'state': 'pending',
+            'attempt_count': 0,
+            'next_attempt_date': fields.Datetime.now(),
+        })
+        self.env.ref('snifx_timeoff_core.ir_cron_mail_outbox')._trigger()
+        return True
+
+    @api.autovacuum
+    def _gc_sent_mails(self):
+        """Delete rows sent more than KEEP_SENT_DAYS ago"""
+        limit_date = fields.Datetime.now() - timedelta(days=KEEP_SENT_DAYS)
+        self.search([('state', '=', 'sent'), ('write_date', '<', limit_date)]).unlink()
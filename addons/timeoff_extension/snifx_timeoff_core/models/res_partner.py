@@ -0,0 +1,13 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models
+
+
+class ResPartner(models.Model):
+    _inherit = 'res.partner'
+
+    def write(self, vals):
+        result = super(ResPartner, self).write(vals)
+        if 'email' in vals:
+            self.env['snifx.user.resolver']._invalidate_cache()
+        return result
@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, api
+
+
+class ResUsers(models.Model):
+    _inherit = 'res.users'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        users = super(ResUsers, self).create(vals_list)
+        self.env['snifx.user.resolver']._invalidate_cache()
+        return users
+
+    def write(self, vals):
+        result = super(ResUsers, self).write(vals)
+        if {'partner_id', 'email', 'active'}.intersection(vals):
+            self.env['snifx.user.resolver']._invalidate_cache()
+        return result
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, api
+
+
+class ResourceCalendar(models.Model):
+    _inherit = 'resource.calendar'
+
+    def write(self, vals):
+        result = super(ResourceCalendar, self).write(vals)
+        if {'attendance_ids', 'tz', 'leave_ids', 'flexible_hours'}.intersection(vals):
+            self.env['snifx.business.hours']._invalidate_cache()
+        return result
+
+
+class ResourceCalendarAttendance(models.Model):
+    _inherit = 'resource.calendar.attendance'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        attendances = super(ResourceCalendarAttendance, self).create(vals_list)
+        self.env['snifx.business.hours']._invalidate_cache()
+        return attendances
+
+    def write(self, vals):
+        result = super(ResourceCalendarAttendance, self).write(vals)
+        self.env['snifx.business.hours']._invalidate_cache()
+        return result
+
+    def unlink(self):
+        result = super(ResourceCalendarAttendance, self).unlink()
+        self.env['snifx.business.hours']._invalidate_cache()
+        return result
+
+
+class ResourceCalendarLeaves(models.Model):
+    _inherit = 'resource.calendar.leaves'
+
+    # Only public holidays (no resource) are part of the cached intervals
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        leaves = super(ResourceCalendarLeaves, self).create(vals_list)
+        if leaves.filtered(lambda l: not l.resource_id):
+            self.env['snifx.business.hours']._invalidate_cache()
+        return leaves
+
+    def write(self, vals):
+        is_public = bool(self.filtered(lambda l: not l.resource_id))
+        result = super(ResourceCalendarLeaves, self).write(vals)
+        if is_public or self.filtered(lambda l: not l.resource_id):
+            self.env['snifx.business.hours']._invalidate_cache()
+        return result
+
+    def unlink(self):
+        is_public = bool(self.filtered(lambda l: not l.resource_id))
+        result = super(ResourceCalendarLeaves, self).unlink()
+        if is_public:
+            self.env['snifx.business.hours']._invalidate_cache()
+        return result
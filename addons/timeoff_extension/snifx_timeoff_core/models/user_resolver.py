@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, api
+from odoo.tools import split_every
+
+# Key of the resolver cache in cr.cache
+CACHE_KEY = 'snifx_user_resolver'
+
+
+class SnifxUserResolver(models.AbstractModel):
+    """
+    Bulk user <-> employee resolution service
+
+    Maps many users to their employee, partner and email (or many employees
+    to their user, partner and emails) with one query per chunk of ids.
+    Results are cached on the cursor for the current transaction.
+    """
+    _name = 'snifx.user.resolver'
+    _description = 'User / Employee Resolution Service'
+
+    # Fields read by the queries below, flushed before querying
+    _FLUSH_FIELDS = {
+        'hr.employee': ['user_id', 'active', 'company_id', 'work_email'],
+        'res.users': ['partner_id'],
+        'res.partner': ['email'],
+    }
+
+    def _get_cache(self):
+        """Return the transaction-level cache, created on first use"""
+        cr = self.env.cr
+        cache = cr.cache.get(CACHE_KEY)
+        if cache is None:
+            cache = cr.cache[CACHE_KEY] = {'users': {}, 'employees': {}}
+            # Drop the cache with the transaction
+            cr.postcommit.add(lambda: cr.cache.pop(CACHE_KEY, None))
+            cr.postrollback.add(lambda: cr.cache.pop(CACHE_KEY, None))
+        return cache
+
+    @api.model
+    def _invalidate_cache(self):
+        """Forget every resolution of the current transaction"""
+        self.env.cr.cache.pop(CACHE_KEY, None)
+
+    def _flush(self):
+        for model_name, field_names in self._FLUSH_FIELDS.items():
+            self.env[model_name].flush_model(field_names)
+
+    @api.model
+    def resolve_users(self, user_ids):
+        """
+        Resolve users to their employee, partner and email
+
+        When a user is linked to several employees, the employee of the
+        current company wins, then the oldest one. Archived employees are
+        ignored.
+
+        :param user_ids: iterable of res.users ids
+        :return: dict {user_id: {'employee_id', 'partner_id', 'email'}}
+        """
+        company_id = self.env.company.id
+        cache = self._get_cache()['users']
+        user_ids = {user_id for user_id in user_ids if user_id}
+        missing = [user_id for user_id in user_ids if (company_id, user_id) not in cache]
+
+        if missing:
+            self._flush()
+            for chunk in split_every(self.env.cr.IN_MAX, missing, list):
+                self.env.cr.execute("""
+                    SELECT u.id, emp.id, u.partner_id, p.email
+                      FROM res_users u
+                      JOIN res_partner p ON p.id = u.partner_id
+                 LEFT JOIN LATERAL (
+                               SELECT e.id
+                                 FROM hr_employee e
+                                WHERE e.user_id = u.id AND e.active
+                             ORDER BY e.company_id = %(company_id)s DESC, e.id
+                                LIMIT 1
+                           ) emp ON TRUE
+                     WHERE u.id = ANY(%(ids)s)
+                """, {'company_id': company_id, 'ids': chunk})
+                for user_id, employee_id, partner_id, email in self.env.cr.fetchall():
+                    cache[(company_id, user_id)] = {
+                        'employee_id': employee_id or False,
+                        'partner_id': partner_id or False,
+                        'email': email or False,
+                    }
+
+        return {
+            user_id: cache[(company_id, user_id)]
+            for user_id in user_ids
+            if (company_id, user_id) in cache
+        }
+
+    @api.model
+    def resolve_employees(self, employee_ids):
+        """
+        Resolve employees to their user, partner and emails
+
+        :param employee_ids: iterable of hr.employee ids
+        :return: dict {employee_id: {'user_id', 'partner_id', 'email', 'work_email'}}
+            where 'email' is the email of the user's partner
+        """
+        cache = self._get_cache()['employees']
+        employee_ids = {employee_id for employee_id in employee_ids if employee_id}
+        missing = [employee_id for employee_id in employee_ids if employee_id not in cache]
+
+        if missing:
+            self._flush()
+            for chunk in split_every(self.env.cr.IN_MAX, missing, list):
+                self.env.cr.execute("""
+                    SELECT e.id, e.user_id, u.partner_id, p.email, e.work_email
+                      FROM hr_employee e
+                 LEFT JOIN res_users u ON u.id = e.user_id
+                 LEFT JOIN res_partner p ON p.id = u.partner_id
+                     WHERE e.id = ANY(%s)
+                """, [chunk])
+                for employee_id, user_id, partner_id, email, work_email in self.env.cr.fetchall():
+                    cache[employee_id] = {
+                        'user_id': user_id or False,
+                        'partner_id': partner_id or False,
+                        'email': email or False,
+                        'work_email': work_email or False,
+                    }
+
+        return {
+            employee_id: cache[employee_id]
+            for employee_id in employee_ids
+            if employee_id in cache
+        }
+
+    @api.model
+    def get_user_employees(self, user_ids):
+        """Return {user_id: hr.employee record (possibly empty)}"""
+        Employee = self.env['hr.employee']
+        resolved = self.resolve_users(user_ids)
+        prefetch_ids = [info['employee_id'] for info in resolved.values() if info['employee_id']]
+        return {
+            user_id: Employee.browse(info['employee_id']).with_prefetch(prefetch_ids)
+            for user_id, info in resolved.items()
+        }
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from freezegun import freeze_time
+
+from odoo.tests import TransactionCase, tagged
+
+from odoo.addons.snifx_timeoff_core.models.mail_outbox import MAX_ATTEMPTS
+
+NOW = datetime(2030, 1, 7, 10, 0)
+
+
+@tagged('post_install', '-at_install')
+class TestMailOutbox(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.Outbox = cls.env['snifx.mail.outbox']
+        cls.partner = cls.env['res.partner'].create({
+            'name': 'Snifx Outbox Partner',
+            'email': 'snifx_outbox@example.com',
+        })
+        cls.template = cls.env['mail.template'].create({
+            'name': 'Snifx Outbox Template',
+            'model_id': cls.env['ir.model']._get_id('res.partner'),
+            'subject': 'Outbox test',
+            'email_to': '{{ object.email }}',
+            'body_html': '<p>Outbox test</p>',
+        })
+
+    def _enqueue(self, **values):
+        row = self.Outbox.enqueue(self.template, [self.partner.id])
+        if values:
+            row.write(values)
+        return row
+
+    def _patch_send_failure(self):
+        return patch.object(
+            type(self.env['mail.template']), 'send_mail',
+            side_effect=Exception('SMTP server unavailable'),
+        )
+
+    def test_cron_sends_due_mails(self):
+        row = self._enqueue(next_attempt_date=datetime(2000, 1, 1))
+        self.Outbox._cron_process_outbox()
+        self.assertEqual(row.state, 'sent')
+        self.assertEqual(row.attempt_count, 1)
+        self.assertFalse(row.last_error)
+
+    def test_failed_send_retried_with_backoff(self):
+        row = self._enqueue()
+        with self._patch_send_failure(), freeze_time(NOW):
+            row._send()
+            self.assertEqual(row.state, 'pending')
+            self.assertEqual(row.attempt_count, 1)
+            self.assertEqual(row.last_error, 'SMTP server unavailable')
+            self.assertEqual(row.next_attempt_date, NOW + timedelta(minutes=5))
+
+            row._send()
+            self.assertEqual(row.attempt_count, 2)
+            self.assertEqual(row.next_attempt_date, NOW + timedelta(minutes=10))
+
+    def test_failed_send_dead_lettered_after_max_attempts(self):
+        row = self._enqueue(attempt_count=MAX_ATTEMPTS - 1)
+        with self._patch_send_failure():
+            row._send()
+        self.assertEqual(row.state, 'dead')
+        self.assertEqual(row.attempt_count, MAX_ATTEMPTS)
+
+    def test_send_of_deleted_record_dead_lettered(self):
+        partner = self.env['res.partner'].create({'name': 'Snifx Deleted Partner'})
+        row = self.Outbox.enqueue(self.template, [partner.id])
+        partner.unlink()
+        row._send()
+        self.assertEqual(row.state, 'dead')
+
+    def test_retry_requeues_dead_mails_only(self):
+        dead = self._enqueue(state='dead', attempt_count=MAX_ATTEMPTS)
+        sent = self._enqueue(state='sent', attempt_count=1)
+        pending = self._enqueue(attempt_count=2, next_attempt_date=NOW)
+
+        with freeze_time(NOW + timedelta(hours=1)):
+            (dead | sent | pending).action_retry()
+            self.assertEqual(dead.state, 'pending')
+            self.assertEqual(dead.attempt_count, 0)
+            self.assertEqual(dead.next_attempt_date, NOW + timedelta(hours=1))
+        self.assertEqual(sent.state, 'sent')
+        self.assertEqual(sent.attempt_count, 1)
+        self.assertEqual(pending.attempt_count, 2)
+        self.assertEqual(pending.next_attempt_date, NOW)
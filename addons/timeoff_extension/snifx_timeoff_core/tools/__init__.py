@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+
+from .tracing import get_tracer
+from .cache import VersionedCache
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+Worker-local caches invalidated through a version token
+
+Large caches of the Snifx Time Off add-ons (approval chain templates,
+officer department trees, ...) do not use ``tools.ormcache``: they would
+share the registry LRU with ``ir.rule``, ``ir.model.access``, ... and
+evict them, and invalidating them would mean ``registry.clear_cache()``,
+which empties that LRU in every worker::
+
+    from odoo.addons.snifx_timeoff_core.tools import VersionedCache
+
+    CHAIN_CACHE = VersionedCache('approval_chain', 4096)
+
+    template = CHAIN_CACHE.get(env, key, lambda: build(key))
+    CHAIN_CACHE.invalidate(env)
+
+* Each cache has its own bounded LRU in each worker.
+* Entries are keyed on the database and the token of the cache
+  (``snifx.cache.version``); read the token once per batch of lookups.
+* ``invalidate`` gives the cache a new token: the other workers see it once
+  the transaction is committed, stale entries age out of the LRU.
+"""
+
+from odoo.tools.lru import LRU
+
+
+class VersionedCache:
+    """Bounded worker-local cache invalidated by bumping its version token"""
+
+    def __init__(self, name, size):
+        self.name = name
+        self._entries = LRU(size)
+
+    def token(self, env):
+        """Current token of the cache, to read once for a batch of lookups"""
+        return env['snifx.cache.version'].sudo().get_token(self.name)
+
+    def get(self, env, key, compute, token=None):
+        """
+        Get the value of a key, computed and stored on a miss
+
+        :param key: hashable key (the database is added)
+        :param compute: function without argument returning the value
+        :param token: token of the cache if already read for the batch
+        """
+        if token is None:
+            token = self.token(env)
+        cache_key = (env.cr.dbname, token, key)
+        try:
+            return self._entries[cache_key]
+        except KeyError:
+            value = self._entries[cache_key] = compute()
+            return value
+
+    def invalidate(self, env):
+        """Invalidate every entry, in every worker once committed"""
+        env['snifx.cache.version'].sudo().bump([self.name])
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+Low-overhead tracing for the Snifx Time Off add-ons
+
+Trace points of the hot paths (chain generation, approvals, ...) go through
+a per-subsystem tracer instead of ``_logger.info(f"...")``::
+
+    from odoo.addons.snifx_timeoff_core.tools import get_tracer
+
+    _tracer = get_tracer('approval')
+    _tracer.debug("Level %s approved by %s", level.level, lambda: level.approver_id.name)
+
+* Formatting is lazy (``%s`` arguments) and callable arguments are only
+  called when the trace point is emitted, so a disabled trace point costs a
+  level check and never triggers ORM reads.
+* Each subsystem logs under ``snifx.trace.<subsystem>``; levels are set with
+  the standard Odoo option, e.g. ``--log-handler=snifx.trace.chain:DEBUG``.
+* Sampling keeps a ratio of the debug/info trace points of a subsystem,
+  from the ``snifx_trace_sampling`` server option, e.g.
+  ``snifx_trace_sampling = chain:0.1,approval:0.5``. Warnings and errors
+  are never sampled out.
+"""
+
+import logging
+import random
+
+from odoo.tools import config
+
+LOGGER_PREFIX = 'snifx.trace'
+
+_tracers = {}
+
+
+def _parse_sampling(value):
+    """Parse 'subsystem:ratio,...' into {subsystem: ratio}"""
+    rates = {}
+    for item in (value or '').split(','):
+        subsystem, __, ratio = item.partition(':')
+        try:
+            rates[subsystem.strip()] = min(max(float(ratio), 0.0), 1.0)
+        except ValueError:
+            continue
+    return rates
+
+
+class Tracer(object):
+    """Tracer of one subsystem (see module docstring)"""
+
+    __slots__ = ('subsystem', 'logger', 'sample_rate')
+
+    def __init__(self, subsystem, sample_rate=1.0):
+        self.subsystem = subsystem
+        self.logger = logging.getLogger(f'{LOGGER_PREFIX}.{subsystem}')
+        self.sample_rate = sample_rate
+
+    def is_enabled(self, level=logging.DEBUG):
+        """True if a trace point of this level would be emitted (sampling aside)"""
+        return self.logger.isEnabledFor(level)
+
+    def log(self, level, msg, *args):
+        if not self.logger.isEnabledFor(level):
+            return
+        if level < logging.WARNING and self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return
+        self.logger.log(level, msg, *(arg() if callable(arg) else arg for arg in args))
+
+    def debug(self, msg, *args):
+        self.log(logging.DEBUG, msg, *args)
+
+    def info(self, msg, *args):
+        self.log(logging.INFO, msg, *args)
+
+    def warning(self, msg, *args):
+        self.log(logging.WARNING, msg, *args)
+
+    def error(self, msg, *args):
+        self.log(logging.ERROR, msg, *args)
+
+
+def get_tracer(subsystem):
+    """Return the (shared) tracer of a subsystem"""
+    tracer = _tracers.get(subsystem)
+    if tracer is None:
+        rates = _parse_sampling(config.get('snifx_trace_sampling'))
+        tracer = _tracers[subsystem] = Tracer(subsystem, rates.get(subsystem, 1.0))
+    return tracer
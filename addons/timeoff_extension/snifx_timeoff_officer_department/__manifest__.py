@@ -56,6 +56,7 @@ Tested on: Odoo 18.0 Community Edition
         "base",
         "hr",
         "hr_holidays",
+        "snifx_timeoff_core",
     ],
     "data": [
         # Security
@@ -65,6 +66,7 @@ Tested on: Odoo 18.0 Community Edition
         
         # Data
         "data/balance_menu_and_actions.xml",
+        "data/ir_cron.xml",
         
         # Views
         "views/hr_leave_views.xml",
@@ -1,7 +1,9 @@
 # -*- coding: utf-8 -*-
 
 from . import hr_timeoff_officer_assignment
+from . import hr_timeoff_officer_coverage
 from . import res_users
 from . import hr_employee
+from . import hr_department
 from . import hr_leave
 from . import resource_calendar_leaves
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+from odoo import api, models
+
+
+class HrDepartment(models.Model):
+    _inherit = 'hr.department'
+    
+    # Officer department trees are cached (see hr.timeoff.officer.assignment)
+    # and indexed (see hr.timeoff.officer.coverage); only changes inside an
+    # assigned tree touch them
+    
+    def _get_covering_officer_assignments(self):
+        """
+        Active officer assignments whose tree contains these departments:
+        assignments of the departments or of one of their ancestors
+        """
+        ancestor_ids = {
+            int(department_id)
+            for path in self.sudo().mapped('parent_path')
+            for department_id in (path or '').split('/')
+            if department_id
+        }
+        if not ancestor_ids:
+            return self.env['hr.timeoff.officer.assignment']
+        return self.env['hr.timeoff.officer.assignment'].sudo().search([
+            ('department_id', 'in', list(ancestor_ids)),
+        ])
+    
+    def _update_officer_trees(self, assignments):
+        """Refresh the trees of these assignments after a department change"""
+        if not assignments:
+            return
+        assignments._invalidate_department_trees()
+        self.env['hr.timeoff.officer.coverage'].sudo()._rebuild_coverage(assignments.ids)
+    
+    @api.model_create_multi
+    def create(self, vals_list):
+        departments = super().create(vals_list)
+        children = departments.filtered('parent_id')
+        children._update_officer_trees(children._get_covering_officer_assignments())
+        return departments
+    
+    def write(self, vals):
+        if 'parent_id' not in vals and 'active' not in vals:
+            return super().write(vals)
+        # Trees containing the departments before and after the move
+        assignments = self._get_covering_officer_assignments()
+        result = super().write(vals)
+        self._update_officer_trees(assignments | self._get_covering_officer_assignments())
+        return result
+    
+    def unlink(self):
+        # Coverage rows of the departments go with them (cascade) and their
+        # employees are left without department (set null)
+        assignments = self._get_covering_officer_assignments()
+        employees = self.env['hr.employee'].sudo().with_context(active_test=False).search([
+            ('department_id', 'in', self.ids),
+        ])
+        result = super().unlink()
+        if assignments:
+            assignments._invalidate_department_trees()
+            self.env['hr.leave'].sudo()._refresh_officer_visibility(employee_ids=employees.ids)
+        return result
@@ -6,6 +6,13 @@ from odoo import api, models
 class HrEmployee(models.Model):
     _inherit = 'hr.employee'
     
+    def write(self, vals):
+        result = super(HrEmployee, self).write(vals)
+        # Officers seeing the leaves follow the employee's department
+        if 'department_id' in vals or 'user_id' in vals:
+            self.env['hr.leave'].sudo()._refresh_officer_visibility(employee_ids=self.ids)
+        return result
+    
     @api.model
     def fields_view_get(self, view_id=None, view_type='form', toolbar=False, submenu=False):
         """
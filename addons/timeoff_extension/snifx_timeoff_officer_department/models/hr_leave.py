@@ -13,6 +13,19 @@ class HrLeave(models.Model):
         help='True if current user can approve this leave as Time Off Officer'
     )
     
+    officer_visibility_user_ids = fields.Many2many(
+        'res.users',
+        'hr_leave_officer_visibility_rel',
+        'leave_id',
+        'user_id',
+        string='Visible to Officers',
+        readonly=True,
+        copy=False,
+        help='Officers whose effective assignments cover the employee\'s department '
+             '(the employee excluded). Maintained by the assignments, department '
+             'tree and employee changes; used by the officer record rule.'
+    )
+    
     officer_activity_created = fields.Boolean(
         string='Officer Activity Created',
         default=False,
@@ -20,6 +33,67 @@ class HrLeave(models.Model):
         help='Technical field to track if activity for officers has been created'
     )
     
+    def init(self):
+        super(HrLeave, self).init()
+        # First install: fill the visibility from the existing assignments
+        self._cr.execute("SELECT 1 FROM hr_leave_officer_visibility_rel LIMIT 1")
+        if not self._cr.fetchone():
+            self._refresh_officer_visibility()
+    
+    @api.model
+    def _refresh_officer_visibility(self, leave_ids=None, employee_ids=None, department_ids=None):
+        """
+        Recompute officer_visibility_user_ids of some leaves, in SQL
+        
+        Leaves are selected by id, employee or employee's department (all
+        leaves when no selector is given). Officers come from the coverage
+        index, restricted to effective assignments.
+        
+        :param leave_ids: ids of hr.leave
+        :param employee_ids: ids of hr.employee
+        :param department_ids: ids of hr.department
+        """
+        selectors = {
+            'leave_ids': "l.id = ANY(%(leave_ids)s)",
+            'employee_ids': "l.employee_id = ANY(%(employee_ids)s)",
+            'department_ids': "e.department_id = ANY(%(department_ids)s)",
+        }
+        params = {
+            'leave_ids': list(leave_ids) if leave_ids is not None else None,
+            'employee_ids': list(employee_ids) if employee_ids is not None else None,
+            'department_ids': list(department_ids) if department_ids is not None else None,
+        }
+        selected = [key for key, value in params.items() if value is not None]
+        if selected and not any(params[key] for key in selected):
+            return
+        where = " OR ".join(selectors[key] for key in selected) if selected else "TRUE"
+        
+        self.flush_model(['employee_id'])
+        self.env['hr.employee'].flush_model(['department_id', 'user_id'])
+        self.env['hr.timeoff.officer.assignment'].flush_model(['is_effective'])
+        self._cr.execute(f"""
+            DELETE FROM hr_leave_officer_visibility_rel
+             WHERE leave_id IN (
+                   SELECT l.id
+                     FROM hr_leave l
+                     JOIN hr_employee e ON e.id = l.employee_id
+                    WHERE {where}
+             )
+        """, params)
+        self._cr.execute(f"""
+            INSERT INTO hr_leave_officer_visibility_rel (leave_id, user_id)
+            SELECT DISTINCT l.id, c.user_id
+              FROM hr_leave l
+              JOIN hr_employee e ON e.id = l.employee_id
+              JOIN hr_timeoff_officer_coverage c ON c.department_id = e.department_id
+              JOIN hr_timeoff_officer_assignment a ON a.id = c.assignment_id
+             WHERE a.is_effective
+               AND c.user_id IS DISTINCT FROM e.user_id
+               AND ({where})
+            ON CONFLICT DO NOTHING
+        """, params)
+        self.invalidate_model(['officer_visibility_user_ids'])
+    
     @api.depends('employee_id', 'employee_id.department_id', 'state')
     def _compute_can_approve_as_officer(self):
         """
@@ -72,44 +146,30 @@ class HrLeave(models.Model):
         Note: Uses sudo() to allow activity creation without access restrictions.
         """
         self.ensure_one()
+        return self._get_eligible_officers_by_leave()[self.id]
+    
+    def _get_eligible_officers_by_leave(self):
+        """
+        Get the eligible officers of every leave of the recordset
         
-        if not self.employee_id.department_id:
-            return self.env['res.users']
-        
-        # Use sudo() to access assignment model without permission issues
-        Assignment = self.env['hr.timeoff.officer.assignment'].sudo()
-        
-        # Get all users with the officer group
-        officer_group = self.env.ref('snifx_timeoff_officer_department.group_timeoff_officer_department')
-        all_officers = officer_group.users
-        
-        if not all_officers:
-            return self.env['res.users']
-        
-        # Get employee's department and all parent departments
-        employee_dept = self.employee_id.department_id
-        # Use parent_path for hierarchical check if available, otherwise use child_of
-        relevant_dept_ids = self.env['hr.department'].search([
-            ('id', 'parent_of', employee_dept.id)
-        ]).ids
+        Officers are read from the department coverage index with one
+        query for all the departments of the batch.
         
-        eligible_officers = self.env['res.users']
+        Returns:
+            dict: {leave_id: res.users recordset of eligible officers}
+        """
+        Users = self.env['res.users']
+        officers_by_dept = self.env['hr.timeoff.officer.coverage'].sudo()._get_officers_by_department(
+            set(self.employee_id.department_id.ids), self.env.company.id
+        )
         
-        for officer in all_officers:
+        result = {}
+        for leave in self:
+            officer_ids = officers_by_dept.get(leave.employee_id.department_id.id, set())
             # Skip if officer is the employee themselves
-            if officer.id == self.employee_id.user_id.id:
-                continue
-            
-            # Get departments assigned to this officer (with sudo)
-            assigned_dept_ids = Assignment.get_user_assigned_departments(officer.id)
-            
-            # Check if any assigned department matches (considering hierarchy)
-            if set(assigned_dept_ids) & set(relevant_dept_ids):
-                eligible_officers |= officer
-        
-        return eligible_officers
-    
-        return eligible_officers
+            officer_ids = officer_ids - {leave.employee_id.user_id.id}
+            result[leave.id] = Users.browse(sorted(officer_ids))
+        return result
     
     def _create_officer_activities(self):
         """
@@ -120,81 +180,77 @@ class HrLeave(models.Model):
         1. Leave requires HR Officer approval (validation_type = 'hr' or 'both')
         2. Leave state transitions to require officer approval
         3. Activities haven't been created yet (tracked by officer_activity_created)
+        
+        Works on the whole recordset: activity types are resolved once,
+        existing activities are read with one query and the missing ones
+        are created with a single create().
         """
-        ActivityType = self.env['mail.activity.type']
+        leaves = self.filtered(
+            lambda l: not l.officer_activity_created
+            and l.holiday_status_id.leave_validation_type in ('hr', 'both')
+        )
+        if not leaves:
+            return
         
-        for leave in self:
-            # Skip if activities already created
-            if leave.officer_activity_created:
-                continue
-            
-            # Skip if no HR Officer approval needed
+        # Activity types of hr_holidays: "Time Off Approval" for direct
+        # officer approval, "Time Off Second Approve" for second tier
+        approval_type = self.env.ref('hr_holidays.mail_act_leave_approval', raise_if_not_found=False)
+        second_approval_type = self.env.ref('hr_holidays.mail_act_leave_second_approval', raise_if_not_found=False)
+        activity_types = {
+            'hr': approval_type,
+            # Fallback to the approval type if the second one is not found
+            'both': second_approval_type or approval_type,
+        }
+        leaves = leaves.filtered(lambda l: activity_types[l.holiday_status_id.leave_validation_type])
+        if not leaves:
+            return
+        
+        # Eligible officers of the whole batch (one coverage lookup)
+        eligible_by_leave = leaves._get_eligible_officers_by_leave()
+        
+        # Existing (leave, user, type) activities of the batch, in one query
+        res_model_id = self.env['ir.model']._get_id('hr.leave')
+        existing = {
+            (activity.res_id, activity.user_id.id, activity.activity_type_id.id)
+            for activity in self.env['mail.activity'].sudo().search([
+                ('res_model_id', '=', res_model_id),
+                ('res_id', 'in', leaves.ids),
+                ('activity_type_id', 'in', [t.id for t in activity_types.values() if t]),
+            ])
+        }
+        
+        vals_list = []
+        for leave in leaves:
             validation_type = leave.holiday_status_id.leave_validation_type
-            if validation_type not in ('hr', 'both'):
-                continue
-            
-            # Determine which activity type to use based on approval flow
-            if validation_type == 'hr':
-                # Direct officer approval - use "Time Off Approval"
-                activity_type = ActivityType.search([
-                    ('name', '=', 'Time Off Approval'),
-                    ('res_model', '=', 'hr.leave')
-                ], limit=1)
-            else:  # 'both'
-                # Second tier approval - use "Time Off Second Approve"
-                activity_type = ActivityType.search([
-                    ('name', '=', 'Time Off Second Approve'),
-                    ('res_model', '=', 'hr.leave')
-                ], limit=1)
-            
-            if not activity_type:
-                # Fallback to generic activity type if specific ones not found
-                activity_type = ActivityType.search([
-                    ('name', '=', 'Time Off Approval'),
-                    ('res_model', '=', 'hr.leave')
-                ], limit=1)
-            
-            if not activity_type:
-                continue
-            
-            # Get eligible officers
-            eligible_officers = leave._get_eligible_officer_users()
+            activity_type = activity_types[validation_type]
             
             # Also include users from responsible_ids if set
-            responsible_officers = leave.holiday_status_id.responsible_ids
-            all_notified_officers = eligible_officers | responsible_officers
+            all_notified_officers = eligible_by_leave[leave.id] | leave.holiday_status_id.responsible_ids
+            
+            # Determine summary based on validation type
+            if validation_type == 'hr':
+                summary = _('Time Off Approval for %s') % leave.employee_id.name
+            else:
+                summary = _('Second Approval for %s') % leave.employee_id.name
+            note = _('Please review and approve this %s request.') % leave.holiday_status_id.name
             
-            # Create one activity per officer
+            # One activity per officer, unless it already exists
             for officer in all_notified_officers:
-                # Check if activity already exists for this user
-                existing_activity = self.env['mail.activity'].search([
-                    ('res_id', '=', leave.id),
-                    ('res_model_id', '=', self.env['ir.model']._get_id('hr.leave')),
-                    ('user_id', '=', officer.id),
-                    ('activity_type_id', '=', activity_type.id)
-                ], limit=1)
-                
-                if existing_activity:
+                if (leave.id, officer.id, activity_type.id) in existing:
                     continue
-                
-                # Determine summary based on validation type
-                if validation_type == 'hr':
-                    summary = _('Time Off Approval for %s') % leave.employee_id.name
-                else:
-                    summary = _('Second Approval for %s') % leave.employee_id.name
-                
-                # Create activity
-                self.env['mail.activity'].create({
+                vals_list.append({
                     'activity_type_id': activity_type.id,
                     'res_id': leave.id,
-                    'res_model_id': self.env['ir.model']._get_id('hr.leave'),
+                    'res_model_id': res_model_id,
                     'user_id': officer.id,
                     'summary': summary,
-                    'note': _('Please review and approve this %s request.') % leave.holiday_status_id.name,
+                    'note': note,
                 })
-            
-            # Mark as created to avoid duplicates
-            leave.officer_activity_created = True
+        
+        self.env['mail.activity'].create(vals_list)
+        
+        # Mark as created to avoid duplicates
+        leaves.officer_activity_created = True
     
     def _check_approval_update(self, state):
         """
@@ -279,9 +335,9 @@ class HrLeave(models.Model):
         # This happens when:
         # 1. Manager approves and next step is HR Officer (validation_type = 'both')
         # 2. State changes to 'confirm' waiting for HR Officer approval
-        for leave in self:
-            if leave.state == 'confirm' and leave.holiday_status_id.leave_validation_type == 'both':
-                leave._create_officer_activities()
+        self.filtered(
+            lambda l: l.state == 'confirm' and l.holiday_status_id.leave_validation_type == 'both'
+        )._create_officer_activities()
         
         return result
     
@@ -314,11 +370,12 @@ class HrLeave(models.Model):
         (when validation_type = 'hr')
         """
         leaves = super(HrLeave, self).create(vals_list)
+        self.sudo()._refresh_officer_visibility(leave_ids=leaves.ids)
         
         # Create activities for leaves that require direct HR Officer approval
-        for leave in leaves:
-            if leave.state == 'confirm' and leave.holiday_status_id.leave_validation_type == 'hr':
-                leave._create_officer_activities()
+        leaves.filtered(
+            lambda l: l.state == 'confirm' and l.holiday_status_id.leave_validation_type == 'hr'
+        )._create_officer_activities()
         
         return leaves
     
@@ -329,11 +386,12 @@ class HrLeave(models.Model):
         """
         result = super(HrLeave, self).write(vals)
         
+        if 'employee_id' in vals:
+            self.sudo()._refresh_officer_visibility(leave_ids=self.ids)
+        
         # Check if state changed to 'confirm' (waiting for approval)
         if 'state' in vals and vals['state'] == 'confirm':
-            for leave in self:
-                # Create activities if not already created
-                if leave.holiday_status_id.leave_validation_type in ('hr', 'both'):
-                    leave._create_officer_activities()
+            # Create activities if not already created (whole batch at once)
+            self._create_officer_activities()
         
         return result
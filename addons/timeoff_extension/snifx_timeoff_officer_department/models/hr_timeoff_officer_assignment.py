@@ -3,6 +3,14 @@
 from odoo import api, fields, models, _
 from odoo.exceptions import ValidationError
 
+from odoo.addons.snifx_timeoff_core.tools import VersionedCache
+
+# Assignment fields deciding the effective (user, company, department) membership
+MEMBERSHIP_FIELDS = {'user_id', 'department_id', 'company_id', 'active', 'date_from', 'date_to'}
+
+# Department trees of the officers per (user, company, day)
+DEPARTMENT_TREE_CACHE = VersionedCache('snifx_timeoff_officer_department.department_tree', 1024)
+
 
 class HrTimeoffOfficerAssignment(models.Model):
     _name = 'hr.timeoff.officer.assignment'
@@ -36,12 +44,23 @@ class HrTimeoffOfficerAssignment(models.Model):
     
     date_from = fields.Date(
         string='Valid From',
-        help='Start date of this assignment (optional)'
+        help='Start date of this assignment (optional). Takes effect at the daily '
+             'update of the assignments, shortly after midnight UTC.'
     )
     
     date_to = fields.Date(
         string='Valid To',
-        help='End date of this assignment (optional)'
+        help='End date of this assignment (optional, included). Expires at the daily '
+             'update of the assignments, shortly after midnight UTC.'
+    )
+    
+    is_effective = fields.Boolean(
+        string='Effective',
+        readonly=True,
+        copy=False,
+        index=True,
+        help='Active and valid today. Updated on changes and by a daily scheduled action, '
+             'record rules read the resulting root departments of the officers.'
     )
     
     notes = fields.Text(
@@ -62,6 +81,19 @@ class HrTimeoffOfficerAssignment(models.Model):
         store=True
     )
     
+    def init(self):
+        # Assignments created before the effective flag existed
+        today = fields.Date.today()
+        self._cr.execute("""
+            UPDATE hr_timeoff_officer_assignment
+               SET is_effective = (active
+                                   AND (date_from IS NULL OR date_from <= %(today)s)
+                                   AND (date_to IS NULL OR date_to >= %(today)s))
+             WHERE is_effective IS DISTINCT FROM (active
+                                   AND (date_from IS NULL OR date_from <= %(today)s)
+                                   AND (date_to IS NULL OR date_to >= %(today)s))
+        """, {'today': today})
+    
     @api.depends('user_id', 'department_id', 'active')
     def _compute_display_name(self):
         """Compute display name for the assignment"""
@@ -116,19 +148,41 @@ class HrTimeoffOfficerAssignment(models.Model):
         Get all department IDs assigned to a user (including children)
         This is used by security rules and domain computations
         
+        Results are cached per user, company and day (see
+        _get_assigned_department_ids).
+        
         :param user_id: User ID to check (default: current user)
-        :return: List of department IDs
+        :return: frozenset of department IDs
         """
         if user_id is None:
             user_id = self.env.user.id
         
-        today = fields.Date.today()
+        return self._get_assigned_department_ids(user_id, self.env.company.id, fields.Date.today())
+    
+    @api.model
+    def _get_assigned_department_ids(self, user_id, company_id, today):
+        """
+        Cached department tree of the active assignments of a user
+        
+        Kept in a worker-local LRU (DEPARTMENT_TREE_CACHE), invalidated in
+        every worker when the effective assignments change or when a
+        department inside an assigned tree moves; the date is part of the
+        key so assignment validity follows the calendar.
         
+        :return: frozenset of department IDs (including children)
+        """
+        return DEPARTMENT_TREE_CACHE.get(
+            self.env, (user_id, company_id, today),
+            lambda: self._read_assigned_department_ids(user_id, company_id, today),
+        )
+    
+    @api.model
+    def _read_assigned_department_ids(self, user_id, company_id, today):
         # Get active assignments for the user
-        assignments = self.search([
+        assignments = self.sudo().search([
             ('user_id', '=', user_id),
             ('active', '=', True),
-            ('company_id', '=', self.env.company.id),
+            ('company_id', '=', company_id),
             '|',
             ('date_from', '=', False),
             ('date_from', '<=', today),
@@ -141,14 +195,14 @@ class HrTimeoffOfficerAssignment(models.Model):
         root_dept_ids = assignments.mapped('department_id').ids
         
         if not root_dept_ids:
-            return []
+            return frozenset()
         
         # Get all child departments (recursive)
-        all_dept_ids = self.env['hr.department'].search([
+        all_dept_ids = self.env['hr.department'].sudo().search([
             ('id', 'child_of', root_dept_ids)
         ]).ids
         
-        return all_dept_ids
+        return frozenset(all_dept_ids)
     
     @api.model
     def is_user_officer(self, user_id=None):
@@ -164,7 +218,12 @@ class HrTimeoffOfficerAssignment(models.Model):
     @api.model_create_multi
     def create(self, vals_list):
         """Override create to auto-assign Officer group when creating assignments"""
+        user_ids = {vals['user_id'] for vals in vals_list if vals.get('user_id')}
+        membership = self._get_effective_membership(user_ids)
         records = super().create(vals_list)
+        records._update_effective_state()
+        self._invalidate_if_membership_changed(user_ids, membership)
+        self.env['hr.timeoff.officer.coverage'].sudo()._rebuild_coverage(records.ids)
         
         # Auto-assign Officer with Balance group to users with assignments
         for record in records:
@@ -175,7 +234,17 @@ class HrTimeoffOfficerAssignment(models.Model):
     
     def write(self, vals):
         """Override write to auto-assign/remove Officer group based on assignments"""
+        if not MEMBERSHIP_FIELDS.intersection(vals):
+            return super().write(vals)
+        
+        user_ids = set(self.user_id.ids)
+        if vals.get('user_id'):
+            user_ids.add(vals['user_id'])
+        membership = self._get_effective_membership(user_ids)
         result = super().write(vals)
+        self._update_effective_state()
+        self._invalidate_if_membership_changed(user_ids, membership)
+        self.env['hr.timeoff.officer.coverage'].sudo()._rebuild_coverage(self.ids)
         
         # If active status or user changed, update group membership
         if 'active' in vals or 'user_id' in vals:
@@ -189,8 +258,14 @@ class HrTimeoffOfficerAssignment(models.Model):
         """Override unlink to check if we should remove Officer group"""
         # Store user IDs before deleting records
         user_ids = self.mapped('user_id.id')
+        membership = self._get_effective_membership(user_ids)
+        # Coverage rows go with the assignments (cascade): keep their departments
+        Coverage = self.env['hr.timeoff.officer.coverage'].sudo()
+        department_ids = set(Coverage.search([('assignment_id', 'in', self.ids)]).department_id.ids)
         
         result = super().unlink()
+        self._invalidate_if_membership_changed(user_ids, membership)
+        self.env['hr.leave'].sudo()._refresh_officer_visibility(department_ids=department_ids)
         
         # Check each user and remove group if no more assignments
         for user_id in user_ids:
@@ -200,6 +275,100 @@ class HrTimeoffOfficerAssignment(models.Model):
         
         return result
     
+    def _update_effective_state(self, today=None):
+        """
+        Set is_effective on these assignments for the given day
+        
+        Written only where the value changes, so the stored root
+        departments of the officers are recomputed only for them.
+        
+        :return: assignments whose flag changed
+        """
+        today = today or fields.Date.today()
+        effective = self.filtered(
+            lambda a: a.active
+            and (not a.date_from or a.date_from <= today)
+            and (not a.date_to or a.date_to >= today)
+        )
+        to_enable = effective.filtered(lambda a: not a.is_effective)
+        to_disable = (self - effective).filtered('is_effective')
+        # Bypass the write override: callers compare the membership themselves
+        super(HrTimeoffOfficerAssignment, to_enable).write({'is_effective': True})
+        super(HrTimeoffOfficerAssignment, to_disable).write({'is_effective': False})
+        return to_enable | to_disable
+    
+    @api.model
+    def _get_effective_membership(self, user_ids):
+        """
+        Effective (company, department) pairs of each user
+        
+        :param user_ids: iterable of res.users ids
+        :return: dict {user_id: frozenset of (company_id, department_id)}
+        """
+        user_ids = [user_id for user_id in user_ids if user_id]
+        if not user_ids:
+            return {}
+        self.flush_model(['user_id', 'company_id', 'department_id', 'is_effective'])
+        self._cr.execute("""
+            SELECT user_id, company_id, department_id
+              FROM hr_timeoff_officer_assignment
+             WHERE is_effective AND user_id = ANY(%s)
+        """, [user_ids])
+        membership = {}
+        for user_id, company_id, department_id in self._cr.fetchall():
+            membership.setdefault(user_id, set()).add((company_id, department_id))
+        return {user_id: frozenset(pairs) for user_id, pairs in membership.items()}
+    
+    @api.model
+    def _invalidate_department_trees(self):
+        """Invalidate the cached officer department trees in every worker"""
+        DEPARTMENT_TREE_CACHE.invalidate(self.env)
+    
+    @api.model
+    def _invalidate_if_membership_changed(self, user_ids, membership):
+        """
+        Invalidate the caches following the effective membership of these
+        users, if it differs from the given snapshot
+        
+        The department trees (per user and company) are invalidated on any
+        change. Record rules read the root departments of the officers,
+        whatever the company, so the registry caches (record rule domains,
+        in every worker) are only cleared when those departments change.
+        """
+        new_membership = self._get_effective_membership(user_ids)
+        if new_membership == membership:
+            return
+        self._invalidate_department_trees()
+        
+        def root_departments(membership):
+            return {
+                user_id: {department_id for __, department_id in pairs}
+                for user_id, pairs in membership.items()
+            }
+        if root_departments(new_membership) != root_departments(membership):
+            self.env.registry.clear_cache()
+    
+    @api.model
+    def _cron_update_effective_assignments(self):
+        """
+        Activate assignments whose validity starts today and expire ended ones
+        
+        This is the activation boundary of date-bounded assignments: the
+        scheduled action runs daily at 00:05 server time (UTC), so an
+        assignment starting on a day is effective from that run, and one
+        ending on a day stays effective until the next run. Record rules and
+        officer visibility follow is_effective, not the dates.
+        """
+        assignments = self.with_context(active_test=False).search([
+            '|', ('is_effective', '=', True), ('active', '=', True)
+        ])
+        user_ids = set(assignments.user_id.ids)
+        membership = self._get_effective_membership(user_ids)
+        changed = assignments._update_effective_state()
+        self._invalidate_if_membership_changed(user_ids, membership)
+        if changed:
+            self.env['hr.timeoff.officer.coverage'].sudo()._rebuild_coverage(changed.ids)
+    
     def _ensure_officer_group(self, user):
         """
         Ensure user has Officer group if they have active assignments,
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+
+import logging
+
+from odoo import api, fields, models
+from odoo.tools import create_index
+
+_logger = logging.getLogger(__name__)
+
+
+class HrTimeoffOfficerCoverage(models.Model):
+    """
+    Reverse index of officer assignments: department -> officer users
+    
+    One row per assignment and per department of its tree (the assigned
+    department and all its sub-departments), with the assignment validity
+    copied so "officers of this department today" is a single indexed
+    lookup. Rows are rebuilt by the assignments and by hr.department when
+    the tree changes; the officer visibility of the leaves of the affected
+    departments is refreshed with them (see hr.leave).
+    """
+    _name = 'hr.timeoff.officer.coverage'
+    _description = 'Time Off Officer Department Coverage'
+    _log_access = False
+    _order = 'department_id, user_id'
+    
+    department_id = fields.Many2one(
+        'hr.department',
+        string='Department',
+        required=True,
+        ondelete='cascade'
+    )
+    
+    user_id = fields.Many2one(
+        'res.users',
+        string='Officer',
+        required=True,
+        ondelete='cascade'
+    )
+    
+    assignment_id = fields.Many2one(
+        'hr.timeoff.officer.assignment',
+        string='Assignment',
+        required=True,
+        ondelete='cascade',
+        index=True
+    )
+    
+    company_id = fields.Many2one(
+        'res.company',
+        string='Company',
+        required=True,
+        ondelete='cascade'
+    )
+    
+    date_from = fields.Date(
+        string='Valid From'
+    )
+    
+    date_to = fields.Date(
+        string='Valid To'
+    )
+    
+    def init(self):
+        create_index(
+            self._cr, 'hr_timeoff_officer_coverage_department_index',
+            self._table, ['department_id', 'company_id', 'user_id']
+        )
+        self._cr.execute("SELECT 1 FROM hr_timeoff_officer_coverage LIMIT 1")
+        if not self._cr.fetchone():
+            # hr.leave is initialized later (its visibility table may not
+            # exist yet): its init fills the visibility from these rows
+            self._rebuild_coverage(refresh_visibility=False)
+    
+    @api.model
+    def _rebuild_coverage(self, assignment_ids=None, refresh_visibility=True):
+        """
+        Rebuild the rows of some assignments (all by default)
+        
+        Department trees are expanded with parent_path, in SQL. The leaves
+        of the departments gaining or losing rows get their officer
+        visibility refreshed, the other leaves are left alone.
+        
+        :param assignment_ids: ids of hr.timeoff.officer.assignment or None
+        :param refresh_visibility: False to leave the officer visibility of
+            the leaves to the caller
+        """
+        if assignment_ids is not None and not assignment_ids:
+            return
+        self.env['hr.department'].flush_model(['parent_id', 'parent_path', 'active'])
+        self.env['hr.timeoff.officer.assignment'].flush_model(
+            ['user_id', 'department_id', 'company_id', 'active', 'date_from', 'date_to']
+        )
+        params = {'assignment_ids': list(assignment_ids) if assignment_ids is not None else None}
+        self._cr.execute(f"""
+            DELETE FROM hr_timeoff_officer_coverage
+             WHERE {"assignment_id = ANY(%(assignment_ids)s)" if assignment_ids is not None else "TRUE"}
+         RETURNING department_id
+        """, params)
+        department_ids = {row[0] for row in self._cr.fetchall()}
+        self._cr.execute(f"""
+            INSERT INTO hr_timeoff_officer_coverage
+                   (department_id, user_id, assignment_id, company_id, date_from, date_to)
+            SELECT dept.id, a.user_id, a.id, a.company_id, a.date_from, a.date_to
+              FROM hr_timeoff_officer_assignment a
+              JOIN hr_department root ON root.id = a.department_id
+              JOIN hr_department dept ON dept.parent_path LIKE root.parent_path || '%%'
+             WHERE a.active
+               AND dept.active
+               {"AND a.id = ANY(%(assignment_ids)s)" if assignment_ids is not None else ""}
+         RETURNING department_id
+        """, params)
+        department_ids.update(row[0] for row in self._cr.fetchall())
+        _logger.info(f"Officer coverage rebuilt: {len(department_ids)} department(s)")
+        self.invalidate_model()
+        
+        if refresh_visibility and department_ids:
+            self.env['hr.leave'].sudo()._refresh_officer_visibility(department_ids=department_ids)
+    
+    @api.model
+    def _get_officers_by_department(self, department_ids, company_id, today=None):
+        """
+        Active officers covering each department, in one query
+        
+        Only members of the officer group are returned, like the
+        assignment based lookup.
+        
+        :param department_ids: iterable of hr.department ids
+        :param company_id: company of the assignments
+        :param today: date of validity, today by default
+        :return: dict {department_id: set of res.users ids}
+        """
+        result = {dept_id: set() for dept_id in department_ids if dept_id}
+        if not result:
+            return result
+        today = today or fields.Date.today()
+        officer_group = self.env.ref('snifx_timeoff_officer_department.group_timeoff_officer_department')
+        self._cr.execute("""
+            SELECT DISTINCT c.department_id, c.user_id
+              FROM hr_timeoff_officer_coverage c
+              JOIN res_groups_users_rel rel ON rel.uid = c.user_id AND rel.gid = %s
+             WHERE c.department_id = ANY(%s)
+               AND c.company_id = %s
+               AND (c.date_from IS NULL OR c.date_from <= %s)
+               AND (c.date_to IS NULL OR c.date_to >= %s)
+        """, [officer_group.id, list(result), company_id, today, today])
+        for department_id, user_id in self._cr.fetchall():
+            result[department_id].add(user_id)
+        return result
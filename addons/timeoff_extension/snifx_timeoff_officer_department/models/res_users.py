@@ -57,9 +57,14 @@ class ResUsers(models.Model):
     
     timeoff_officer_root_dept_ids = fields.Many2many(
         'hr.department',
+        'res_users_timeoff_officer_root_dept_rel',
+        'user_id',
+        'department_id',
         compute='_compute_timeoff_officer_root_dept_ids',
+        store=True,
         string='Root Departments Managed',
-        help='Root departments assigned to this officer (used in record rules with child_of)'
+        help='Root departments assigned to this officer (used in record rules with child_of). '
+             'Stored: follows the effective assignments, updated daily.'
     )
     
     timeoff_officer_dept_ids = fields.Many2many(
@@ -76,21 +81,19 @@ class ResUsers(models.Model):
     )
     
     @api.depends('timeoff_officer_assignment_ids', 
-                 'timeoff_officer_assignment_ids.active',
-                 'timeoff_officer_assignment_ids.department_id',
-                 'timeoff_officer_assignment_ids.date_from',
-                 'timeoff_officer_assignment_ids.date_to')
+                 'timeoff_officer_assignment_ids.is_effective',
+                 'timeoff_officer_assignment_ids.department_id')
     def _compute_timeoff_officer_root_dept_ids(self):
-        """Compute ROOT departments assigned to this user as officer"""
-        today = fields.Date.today()
+        """
+        Compute ROOT departments assigned to this user as officer
         
+        Reads the effective flag of the assignments (validity dates are
+        applied by hr.timeoff.officer.assignment and its daily cron), so
+        record rules read precomputed ids.
+        """
         for user in self:
-            # Get active assignments for today
-            active_assignments = user.timeoff_officer_assignment_ids.filtered(
-                lambda a: a.active and
-                (not a.date_from or a.date_from <= today) and
-                (not a.date_to or a.date_to >= today)
-            )
+            # Get effective assignments for today
+            active_assignments = user.timeoff_officer_assignment_ids.filtered('is_effective')
             
             # Get only the root departments (not the children)
             root_depts = active_assignments.mapped('department_id')
@@ -107,7 +110,7 @@ class ResUsers(models.Model):
         
         for user in self:
             dept_ids = Assignment.get_user_assigned_departments(user.id)
-            user.timeoff_officer_dept_ids = [(6, 0, dept_ids)]
+            user.timeoff_officer_dept_ids = [(6, 0, list(dept_ids))]
     
     @api.depends('timeoff_officer_assignment_ids',
                  'timeoff_officer_assignment_ids.active')
@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+
+from . import test_officer_visibility
+from . import test_effective_assignment
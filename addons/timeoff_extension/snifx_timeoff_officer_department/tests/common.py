@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+
+from datetime import date
+
+from odoo.tests import TransactionCase, new_test_user
+
+
+class OfficerDepartmentCase(TransactionCase):
+    """
+    Departments used by the tests, the officer is assigned to Head Office:
+
+        Head Office ── Sales
+        Operations
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.company = cls.env.company
+        cls.officer = new_test_user(
+            cls.env, login='snifx_officer',
+            groups='base.group_user,snifx_timeoff_officer_department.group_timeoff_officer_department',
+            email='snifx_officer@example.com',
+        )
+        cls.user_employee = new_test_user(
+            cls.env, login='snifx_employee', groups='base.group_user', email='snifx_employee@example.com'
+        )
+
+        Department = cls.env['hr.department']
+        cls.head_office = Department.create({'name': 'Snifx Head Office', 'company_id': cls.company.id})
+        cls.sales = Department.create({
+            'name': 'Snifx Sales',
+            'parent_id': cls.head_office.id,
+            'company_id': cls.company.id,
+        })
+        cls.operations = Department.create({'name': 'Snifx Operations', 'company_id': cls.company.id})
+
+        cls.employee = cls.env['hr.employee'].create({
+            'name': 'Snifx Employee',
+            'user_id': cls.user_employee.id,
+            'department_id': cls.sales.id,
+            'company_id': cls.company.id,
+        })
+        cls.leave_type = cls.env['hr.leave.type'].create({
+            'name': 'Snifx Officer Leave',
+            'requires_allocation': 'no',
+            'leave_validation_type': 'hr',
+            'company_id': cls.company.id,
+        })
+
+    def _create_assignment(self, department, **values):
+        return self.env['hr.timeoff.officer.assignment'].create(dict({
+            'user_id': self.officer.id,
+            'department_id': department.id,
+            'company_id': self.company.id,
+        }, **values))
+
+    def _create_leave(self, employee=None, leave_date=date(2030, 1, 7)):
+        return self.env['hr.leave'].create({
+            'employee_id': (employee or self.employee).id,
+            'holiday_status_id': self.leave_type.id,
+            'request_date_from': leave_date,
+            'request_date_to': leave_date,
+        })
+
+    def assertVisible(self, leave, visible=True):
+        leave.invalidate_recordset(['officer_visibility_user_ids'])
+        if visible:
+            self.assertIn(self.officer, leave.officer_visibility_user_ids)
+        else:
+            self.assertNotIn(self.officer, leave.officer_visibility_user_ids)
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+
+from datetime import timedelta
+
+from freezegun import freeze_time
+
+from odoo import fields
+from odoo.tests import tagged
+
+from .common import OfficerDepartmentCase
+
+
+@tagged('post_install', '-at_install')
+class TestEffectiveAssignment(OfficerDepartmentCase):
+
+    def test_future_assignment_effective_after_cron(self):
+        Assignment = self.env['hr.timeoff.officer.assignment']
+        tomorrow = fields.Date.today() + timedelta(days=1)
+        assignment = self._create_assignment(self.head_office, date_from=tomorrow)
+        leave = self._create_leave()
+        self.assertFalse(assignment.is_effective)
+        self.assertNotIn(self.head_office, self.officer.timeoff_officer_root_dept_ids)
+        self.assertVisible(leave, False)
+
+        with freeze_time(tomorrow):
+            Assignment._cron_update_effective_assignments()
+            self.assertTrue(assignment.is_effective)
+            self.assertIn(self.head_office, self.officer.timeoff_officer_root_dept_ids)
+            self.assertIn(self.sales.id, Assignment.get_user_assigned_departments(self.officer.id))
+            self.assertVisible(leave)
+
+    def test_ended_assignment_expired_by_cron(self):
+        Assignment = self.env['hr.timeoff.officer.assignment']
+        today = fields.Date.today()
+        assignment = self._create_assignment(self.head_office, date_to=today)
+        leave = self._create_leave()
+        self.assertTrue(assignment.is_effective)
+        self.assertVisible(leave)
+
+        with freeze_time(today + timedelta(days=1)):
+            Assignment._cron_update_effective_assignments()
+            self.assertFalse(assignment.is_effective)
+            self.assertNotIn(self.head_office, self.officer.timeoff_officer_root_dept_ids)
+            self.assertVisible(leave, False)
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests import tagged
+
+from .common import OfficerDepartmentCase
+
+
+@tagged('post_install', '-at_install')
+class TestOfficerVisibility(OfficerDepartmentCase):
+
+    def _get_officer_department_ids(self):
+        return self.env['hr.timeoff.officer.assignment'].get_user_assigned_departments(self.officer.id)
+
+    def test_department_move(self):
+        assignment = self._create_assignment(self.head_office)
+        leave = self._create_leave()
+        self.assertVisible(leave)
+
+        self.sales.parent_id = self.operations
+        self.assertVisible(leave, False)
+        self.assertNotIn(
+            self.sales,
+            self.env['hr.timeoff.officer.coverage'].search([('assignment_id', '=', assignment.id)]).department_id,
+        )
+        self.assertNotIn(self.sales.id, self._get_officer_department_ids())
+
+        self.sales.parent_id = self.head_office
+        self.assertVisible(leave)
+        self.assertIn(self.sales.id, self._get_officer_department_ids())
+
+    def test_department_move_outside_assigned_trees(self):
+        """Moves outside of the assigned trees leave the coverage untouched"""
+        assignment = self._create_assignment(self.sales)
+        Coverage = self.env['hr.timeoff.officer.coverage']
+        coverage = Coverage.search([('assignment_id', '=', assignment.id)])
+        self.operations.parent_id = self.env['hr.department'].create({'name': 'Snifx Holding'})
+        self.assertEqual(Coverage.search([('assignment_id', '=', assignment.id)]), coverage)
+
+    def test_assignment_changes(self):
+        leave = self._create_leave()
+        self.assertVisible(leave, False)
+        assignment = self._create_assignment(self.head_office)
+        self.assertVisible(leave)
+        assignment.active = False
+        self.assertVisible(leave, False)
+        assignment.write({'active': True, 'department_id': self.operations.id})
+        self.assertVisible(leave, False)
+        assignment.department_id = self.sales
+        self.assertVisible(leave)
+        assignment.unlink()
+        self.assertVisible(leave, False)
+
+    def test_employee_move(self):
+        self._create_assignment(self.head_office)
+        leave = self._create_leave()
+        self.employee.department_id = self.operations
+        self.assertVisible(leave, False)
+        self.employee.department_id = self.sales
+        self.assertVisible(leave)
+
+    def test_department_unlink(self):
+        self._create_assignment(self.head_office)
+        leave = self._create_leave()
+        self.assertVisible(leave)
+        self.sales.unlink()
+        self.assertVisible(leave, False)
+
+    def test_own_leave_not_visible(self):
+        self._create_assignment(self.head_office)
+        self.employee.user_id = self.officer
+        self.assertVisible(self._create_leave(), False)
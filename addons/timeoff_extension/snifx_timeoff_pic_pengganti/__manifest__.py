@@ -4,7 +4,7 @@
  'data': ['security/hr_employee_pic_access.xml',
           'data/mail_template.xml',
           'views/hr_leave_views.xml'],
- 'depends': ['hr_holidays', 'mail'],
+ 'depends': ['hr_holidays', 'mail', 'snifx_timeoff_core'],
  'installable': True,
  'license': 'LGPL-3',
  'name': 'Time Off - PIC Pengganti',
@@ -53,21 +53,27 @@ class HrLeave(models.Model):
                 self.pic_pengganti_id.id
             )
 
+    def _snifx_resolve(self, employee):
+        """Resolve user/partner/emails of an employee (cached per transaction)"""
+        return self.env['snifx.user.resolver'].sudo().resolve_employees(employee.ids).get(employee.id, {})
+
     def _snifx_email_from(self):
         self.ensure_one()
         emp = self.employee_id
-        return emp.work_email or (emp.user_id and emp.user_id.email) or (emp.company_id and emp.company_id.email) or "noreply@example.com"
+        info = self._snifx_resolve(emp)
+        return info.get('work_email') or info.get('email') or (emp.company_id and emp.company_id.email) or "noreply@example.com"
 
     def _snifx_email_to(self):
         self.ensure_one()
         pic = self.pic_pengganti_id
         if not pic:
             return False
-        email = (pic.user_id and pic.user_id.email) or False
+        info = self._snifx_resolve(pic)
+        email = info.get('email') or False
         if not email:
             priv_pid = getattr(pic, 'private_address_id', False) or getattr(pic, 'address_home_id', False)
             email = (priv_pid and priv_pid.email) or False
-        email = email or pic.work_email or False
+        email = email or info.get('work_email') or False
         return email
 
     def _snifx_partner_ids(self):
@@ -75,10 +81,11 @@ class HrLeave(models.Model):
         pic = self.pic_pengganti_id
         if not pic:
             return []
-        partner = (pic.user_id and pic.user_id.partner_id) or False
-        if not partner:
+        partner_id = self._snifx_resolve(pic).get('partner_id') or False
+        if not partner_id:
             partner = getattr(pic, 'private_address_id', False) or getattr(pic, 'address_home_id', False) or False
-        return [partner.id] if partner else []
+            partner_id = partner and partner.id
+        return [partner_id] if partner_id else []
 
     def _snifx_build_body(self, is_reminder=False):
         self.ensure_one()
@@ -122,6 +129,10 @@ class HrLeave(models.Model):
                 rec.message_post(body="(Info) Email PIC {}terbentuk.".format('Reminder ' if is_reminder else ''))
 
     def _snifx_send_pic_mail(self, is_reminder=False):
+        # Resolve every PIC and requester of the batch in one go
+        self.env['snifx.user.resolver'].sudo().resolve_employees(
+            (self.pic_pengganti_id | self.employee_id).ids
+        )
         for rec in self:
             if not (rec.pic_pengganti_id and rec.employee_id):
                 continue
@@ -135,7 +146,8 @@ class HrLeave(models.Model):
                 "partner_ids": [(6, 0, rec._snifx_partner_ids())],
                 "body_html": rec._snifx_build_body(is_reminder=is_reminder),
             }
-            template.sudo().send_mail(rec.id, force_send=True, email_values=email_values)
+            # Sent by the outbox after commit (no SMTP during submit)
+            rec.env['snifx.mail.outbox'].enqueue(template, rec.ids, email_values=email_values)
             rec._snifx_log_activity(email_values=email_values, is_reminder=is_reminder)
 
     def unlink(self):
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the officer record rule on hr.leave
+
+Compares the latency of an officer list page (80 rows + count) with:
+- legacy: employee_id.department_id child_of the officer root departments
+- visibility: officer_visibility_user_ids membership (current rule)
+
+Synthetic leaves are copied from existing ones in SQL, the officer
+visibility is refreshed, the timings are printed and everything is rolled
+back (unless KEEP=1).
+
+Run in an Odoo shell of a database with snifx_timeoff_officer_department
+installed, at least one leave and one effective officer assignment:
+
+    LEAVES=200000 odoo-bin shell -d <db> --no-http < scripts/benchmark_officer_leave_visibility.py
+
+Environment variables:
+    LEAVES         synthetic leaves to add (default 200000)
+    OFFICER_LOGIN  officer to benchmark (default: first effective assignment)
+    REPEAT         measures per variant, the median is printed (default 20)
+    KEEP           1 to commit the synthetic data (default 0)
+"""
+
+import os
+import statistics
+import time
+
+LEAVES = int(os.environ.get('LEAVES', 200000))
+REPEAT = int(os.environ.get('REPEAT', 20))
+KEEP = os.environ.get('KEEP') == '1'
+PAGE_SIZE = 80
+
+cr = env.cr  # noqa: F821 (provided by odoo shell)
+Leave = env['hr.leave'].sudo()  # noqa: F821
+
+# Officer
+Assignment = env['hr.timeoff.officer.assignment'].sudo()  # noqa: F821
+if os.environ.get('OFFICER_LOGIN'):
+    officer = env['res.users'].sudo().search([('login', '=', os.environ['OFFICER_LOGIN'])], limit=1)  # noqa: F821
+else:
+    officer = Assignment.search([('is_effective', '=', True)], limit=1).user_id
+if not officer:
+    raise SystemExit("No officer found: create an effective officer assignment first")
+print(f"Officer: {officer.login} (root departments: {officer.timeoff_officer_root_dept_ids.ids})")
+
+# Synthetic leaves: copies of existing leaves spread over all employees
+cr.execute("SELECT id FROM hr_leave ORDER BY id LIMIT 1")
+row = cr.fetchone()
+if not row:
+    raise SystemExit("No leave to copy: create at least one time off request first")
+template_id = row[0]
+cr.execute("SELECT array_agg(id) FROM hr_employee WHERE active")
+employee_ids = cr.fetchone()[0]
+cr.execute("""
+    SELECT column_name
+      FROM information_schema.columns
+     WHERE table_name = 'hr_leave' AND column_name NOT IN ('id', 'employee_id')
+""")
+columns = [row[0] for row in cr.fetchall()]
+start = time.perf_counter()
+cr.execute(f"""
+    INSERT INTO hr_leave (employee_id, {", ".join(columns)})
+    SELECT (%(employee_ids)s::int[])[1 + (g %% %(employee_count)s)], {", ".join(f"l.{c}" for c in columns)}
+      FROM hr_leave l, generate_series(1, %(count)s) g
+     WHERE l.id = %(template_id)s
+""", {
+    'employee_ids': employee_ids,
+    'employee_count': len(employee_ids),
+    'count': LEAVES,
+    'template_id': template_id,
+})
+print(f"Inserted {LEAVES} leaves in {time.perf_counter() - start:.1f}s")
+
+start = time.perf_counter()
+Leave._refresh_officer_visibility()
+print(f"Officer visibility refreshed in {time.perf_counter() - start:.1f}s")
+cr.execute("ANALYZE hr_leave")
+cr.execute("ANALYZE hr_leave_officer_visibility_rel")
+
+company_ids = officer.company_ids.ids
+variants = {
+    'legacy child_of': [
+        ('employee_company_id', 'in', company_ids),
+        ('employee_id.user_id', '!=', officer.id),
+        ('employee_id.department_id', 'child_of', officer.timeoff_officer_root_dept_ids.ids),
+    ],
+    'visibility m2m': [
+        ('employee_company_id', 'in', company_ids),
+        ('officer_visibility_user_ids', 'in', [officer.id]),
+    ],
+}
+
+
+def measure(domain):
+    timings = []
+    for __ in range(REPEAT):
+        env.invalidate_all()  # noqa: F821
+        start = time.perf_counter()
+        records = Leave.search(domain, limit=PAGE_SIZE)
+        count = Leave.search_count(domain)
+        records.mapped('employee_id.name')
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), count
+
+
+print(f"\nOfficer list page ({PAGE_SIZE} rows + count), median of {REPEAT} runs:")
+for name, domain in variants.items():
+    latency, count = measure(domain)
+    print(f"  {name:<18} {latency:8.1f} ms  ({count} visible leaves)")
+
+if KEEP:
+    cr.commit()
+    print("\nSynthetic leaves kept (KEEP=1)")
+else:
+    cr.rollback()
+    print("\nRolled back")